@@ -0,0 +1,204 @@
+# benchmarks/bench_analytics.py
+
+"""
+NumPy analytics (src/infra/analytics.py) against a pure-Python reference.
+
+Seeds one habit with `--days` days of logs in a temporary database, then
+times both implementations for each storage format. The reference maps
+every log row to Python objects and loops over them, like the per-row
+code the analytics module replaces; both must return the same metrics.
+
+    python -m benchmarks.bench_analytics --days 20000 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from functools import partial
+from pathlib import Path
+from uuid import uuid4
+
+from src.core.entities.habit import Habit, HabitType
+from src.core.entities.habit_analytics import HabitAnalytics
+from src.infra.analytics import compute_analytics, load_daily_series
+from src.infra.migrations import migrate
+from src.infra.storage_format import (
+    STORAGE_FORMATS,
+    StorageFormat,
+    convert_storage,
+    read_storage_format,
+)
+
+AS_OF = date(2025, 1, 1)
+
+
+def numpy_analytics(
+    db: sqlite3.Connection, fmt: StorageFormat, habit: Habit, as_of: date
+) -> HabitAnalytics:
+    return compute_analytics(habit, load_daily_series(db, fmt, habit.id, as_of), as_of)
+
+
+def reference_analytics(
+    db: sqlite3.Connection, fmt: StorageFormat, habit: Habit, as_of: date
+) -> HabitAnalytics:
+    rows = db.execute(
+        """
+        SELECT date, value
+          FROM habit_logs
+         WHERE habit_id = ? AND date <= ?
+      ORDER BY date
+        """,
+        (fmt.encode_uuid(habit.id), fmt.encode_day(as_of)),
+    ).fetchall()
+
+    by_day: dict[date, float] = {}
+    logs_per_day: dict[date, int] = {}
+    for raw_date, value in rows:
+        day = fmt.decode_day(raw_date)
+        by_day[day] = by_day.get(day, 0.0) + value
+        logs_per_day[day] = logs_per_day.get(day, 0) + 1
+
+    days = sorted(by_day)
+    longest = run = 0
+    previous: date | None = None
+    for day in days:
+        run = run + 1 if previous == day - timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+
+    # the current streak stops at a day logged twice (see HabitStats)
+    current = 0
+    for day in reversed(days[len(days) - run :]):
+        current += 1
+        if logs_per_day[day] > 1:
+            break
+
+    def window(first: int, last: int) -> float:
+        start, end = as_of - timedelta(days=last), as_of - timedelta(days=first)
+        return sum(v for d, v in by_day.items() if start <= d <= end)
+
+    goal = habit.goal
+    completion_rate = None
+    if goal is not None:
+        tracked = (as_of - days[0]).days + 1 if days else 0
+        met = sum(1 for v in by_day.values() if v >= goal)
+        completion_rate = met / tracked if tracked else 0.0
+
+    rolling_7d = window(0, 6)
+    return HabitAnalytics(
+        habit_id=habit.id,
+        as_of=as_of,
+        log_count=len(rows),
+        active_days=len(days),
+        total=sum(by_day.values()),
+        rolling_7d=rolling_7d,
+        rolling_30d=window(0, 29),
+        week_over_week=rolling_7d - window(7, 13),
+        longest_streak=longest,
+        current_streak=current,
+        completion_rate=completion_rate,
+    )
+
+
+def _seed(db: sqlite3.Connection, days: int) -> Habit:
+    habit = Habit(
+        id=uuid4(),
+        name="bench",
+        description="benchmark",
+        category="bench",
+        type=HabitType.NUMERIC,
+        goal=5.0,
+        created_at=AS_OF - timedelta(days=days),
+        parent_id=None,
+    )
+    db.execute(
+        "INSERT INTO habits VALUES (?, ?, ?, ?, ?, ?, ?, NULL)",
+        (
+            str(habit.id),
+            habit.name,
+            habit.description,
+            habit.category,
+            habit.type.value,
+            habit.goal,
+            habit.created_at.isoformat(),
+        ),
+    )
+    rng = random.Random(0)
+    db.executemany(
+        "INSERT INTO habit_logs VALUES (?, ?, ?, ?)",
+        (
+            (
+                str(uuid4()),
+                str(habit.id),
+                (AS_OF - timedelta(days=d)).isoformat(),
+                rng.uniform(0, 10),
+            )
+            for d in range(days)
+            # ~20% of the days are skipped, breaking streaks
+            if rng.random() < 0.8
+        ),
+    )
+    db.commit()
+    return habit
+
+
+def _time(
+    run: Callable[[], HabitAnalytics], repeat: int
+) -> tuple[float, HabitAnalytics]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def _same(a: HabitAnalytics, b: HabitAnalytics) -> bool:
+    # float sums differ in the last bits between cumsum and sum()
+    return all(
+        abs(x - y) < 1e-6 if isinstance(x, float) else x == y
+        for x, y in zip(vars(a).values(), vars(b).values(), strict=True)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark habit analytics.")
+    parser.add_argument("--days", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = sqlite3.connect(Path(tmp) / "bench.db")
+        migrate(db)
+        habit = _seed(db, args.days)
+
+        for name in STORAGE_FORMATS:
+            convert_storage(db, STORAGE_FORMATS[name])
+            fmt = read_storage_format(db)
+
+            numpy_s, vectorized = _time(
+                partial(numpy_analytics, db, fmt, habit, AS_OF), args.repeat
+            )
+            python_s, reference = _time(
+                partial(reference_analytics, db, fmt, habit, AS_OF), args.repeat
+            )
+            if not _same(vectorized, reference):
+                raise RuntimeError(f"results differ: {vectorized} != {reference}")
+
+            print(
+                f"{name:>7}: numpy {numpy_s * 1000:7.2f} ms"
+                f"  python {python_s * 1000:7.2f} ms"
+                f"  ({python_s / numpy_s:4.1f}x)"
+            )
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# benchmarks/bench_backends.py
+
+"""
+Throughput of the sync (threadpool) and async (aiosqlite) backends.
+
+Starts one uvicorn server per backend on a fresh database, seeds a few
+habits with logs, then lets `--clients` concurrent clients loop over a
+read-heavy mix (list habits, list logs, stats) plus some log inserts.
+
+    python -m benchmarks.bench_backends --clients 64 --seconds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import httpx
+
+HABITS = 20
+LOGS_PER_HABIT = 200
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _start_server(backend: str, db_path: Path, port: int) -> subprocess.Popen[bytes]:
+    env = {**os.environ, "HABIT_BACKEND": backend, "HABIT_DB_PATH": str(db_path)}
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.app:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+
+
+async def _wait_ready(client: httpx.AsyncClient) -> None:
+    for _ in range(100):
+        try:
+            if (await client.get("/metrics")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def _seed(client: httpx.AsyncClient) -> list[str]:
+    habit_ids = []
+    start = date.today() - timedelta(days=LOGS_PER_HABIT)
+    for i in range(HABITS):
+        resp = await client.post(
+            "/habits",
+            json={
+                "name": f"habit {i}",
+                "description": "benchmark",
+                "category": "bench",
+                "type": "numeric",
+            },
+        )
+        habit_id = resp.json()["id"]
+        logs = [
+            {"date": (start + timedelta(days=d)).isoformat(), "value": 1}
+            for d in range(LOGS_PER_HABIT)
+        ]
+        await client.post(f"/habits/{habit_id}/logs:bulk", json={"logs": logs})
+        habit_ids.append(habit_id)
+    return habit_ids
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    habit_ids: list[str],
+    deadline: float,
+    latencies: list[float],
+) -> None:
+    rng = random.Random()
+    while time.perf_counter() < deadline:
+        habit_id = rng.choice(habit_ids)
+        roll = rng.random()
+        started = time.perf_counter()
+        if roll < 0.3:
+            await client.get("/habits", params={"limit": 50})
+        elif roll < 0.6:
+            await client.get(f"/habits/{habit_id}/logs", params={"limit": 50})
+        elif roll < 0.9:
+            await client.get(f"/habits/{habit_id}/stats")
+        else:
+            await client.post(f"/habits/{habit_id}/logs", json={"value": 1})
+        latencies.append(time.perf_counter() - started)
+
+
+async def _run(backend: str, clients: int, seconds: float) -> None:
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        server = _start_server(backend, Path(tmp) / "bench.db", port)
+        try:
+            limits = httpx.Limits(max_connections=clients)
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30
+            ) as client:
+                await _wait_ready(client)
+                habit_ids = await _seed(client)
+
+                latencies: list[float] = []
+                deadline = time.perf_counter() + seconds
+                await asyncio.gather(
+                    *(
+                        _worker(client, habit_ids, deadline, latencies)
+                        for _ in range(clients)
+                    )
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{backend:>5}: {len(latencies) / seconds:8.1f} req/s"
+        f"  p50 {statistics.median(latencies) * 1000:6.1f} ms"
+        f"  p99 {p99 * 1000:6.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare sync and async backends.")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--backend", choices=["sync", "async"], action="append")
+    args = parser.parse_args()
+
+    for backend in args.backend or ["sync", "async"]:
+        asyncio.run(_run(backend, args.clients, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_serialization.py
+
+"""
+Cost of serializing a page of logs, per 10k logs.
+
+"pydantic" is the previous path of the list routes: one HabitLogResponse
+per log, validated again against `response_model` by FastAPI and dumped
+to JSON. "orjson" is src/api/fast_json.py, which writes the HabitLog
+entities directly. Both must produce the same JSON.
+
+    python -m benchmarks.bench_serialization --logs 10000 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from uuid import uuid4
+
+import orjson
+from pydantic import TypeAdapter
+
+from src.api.fast_json import json_response
+from src.api.models.logs import HabitLogListResponse, HabitLogResponse
+from src.core.entities.habit_log import HabitLog
+
+PER = 10_000
+
+
+def _logs(count: int) -> list[HabitLog]:
+    rng = random.Random(0)
+    habit_id = uuid4()
+    start = date(2020, 1, 1)
+    return [
+        HabitLog(uuid4(), habit_id, start + timedelta(days=i), rng.uniform(0, 10))
+        for i in range(count)
+    ]
+
+
+def pydantic_path(logs: list[HabitLog]) -> bytes:
+    response = HabitLogListResponse(
+        logs=[HabitLogResponse.from_entity(log) for log in logs],
+        next_cursor=None,
+    )
+    # what FastAPI does with the returned model: validate, then dump
+    adapter = TypeAdapter(HabitLogListResponse)
+    validated = adapter.validate_python(response, from_attributes=True)
+    return adapter.dump_json(validated)
+
+
+def orjson_path(logs: list[HabitLog]) -> bytes:
+    return bytes(json_response({"logs": logs, "next_cursor": None}, {}).body)
+
+
+def _time(run: Callable[[], bytes], repeat: int) -> tuple[float, bytes]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark list serialization.")
+    parser.add_argument("--logs", type=int, default=PER)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    logs = _logs(args.logs)
+    scale = PER / args.logs
+
+    before_s, before = _time(lambda: pydantic_path(logs), args.repeat)
+    after_s, after = _time(lambda: orjson_path(logs), args.repeat)
+    if orjson.loads(before) != orjson.loads(after):
+        raise RuntimeError("serialized logs differ")
+
+    print(f"pydantic: {before_s * scale * 1000:7.2f} ms per {PER} logs")
+    print(
+        f"  orjson: {after_s * scale * 1000:7.2f} ms per {PER} logs"
+        f"  ({before_s / after_s:4.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
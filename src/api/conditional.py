@@ -0,0 +1,62 @@
+# src/api/conditional.py
+
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+from src.core.entities.change_version import ChangeVersion
+
+
+def _etag(version: ChangeVersion) -> str:
+    # the timestamp keeps tags apart if the database is ever recreated
+    return f'"{version.version}-{int(version.modified_at.timestamp())}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # weak comparison, as required for If-None-Match
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _unmodified_since(if_modified_since: str, modified_at: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    # HTTP dates have whole seconds: a write in the same second as `since`
+    # may have happened after the client's copy, so only the ETag can tell
+    return modified_at < since
+
+
+def not_modified(
+    request: Request, response: Response, version: ChangeVersion | None
+) -> Response | None:
+    """
+    Set ETag and Last-Modified on `response` from `version`, and return a
+    304 response if the client's copy is still current (If-None-Match,
+    or If-Modified-Since when no ETag was sent: only for changes made in
+    an earlier second). None means "build the
+    response as usual", also when `version` is None (unknown habit).
+    """
+    if version is None:
+        return None
+
+    headers = {
+        "ETag": _etag(version),
+        "Last-Modified": format_datetime(version.modified_at, usegmt=True),
+    }
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        current = _etag_matches(if_none_match, headers["ETag"])
+    elif if_modified_since is not None:
+        current = _unmodified_since(if_modified_since, version.modified_at)
+    else:
+        current = False
+
+    return Response(status_code=304, headers=headers) if current else None
@@ -0,0 +1,32 @@
+# src/api/dependencies.py
+
+from collections.abc import Generator
+
+from fastapi import Depends
+
+from src.core.interface.unit_of_work import UnitOfWork
+from src.infra.unit_of_work import unit_of_work
+
+
+def read_unit_of_work() -> Generator[UnitOfWork]:
+    with unit_of_work() as uow:
+        yield uow
+
+
+def write_unit_of_work() -> Generator[UnitOfWork]:
+    with unit_of_work(write=True) as uow:
+        yield uow
+
+
+def log_write_unit_of_work() -> Generator[UnitOfWork]:
+    # with group commit enabled, the inserts go to the writer thread
+    with unit_of_work(write=True, group_commit=True) as uow:
+        yield uow
+
+
+# Ruff B008: use module-level singletons for Depends defaults.
+# scope="function": commit (or roll back) before the response is sent,
+# so a failed commit is reported and the next request sees the data.
+READ_UOW = Depends(read_unit_of_work, scope="function")
+WRITE_UOW = Depends(write_unit_of_work, scope="function")
+LOG_WRITE_UOW = Depends(log_write_unit_of_work, scope="function")
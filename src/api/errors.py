@@ -0,0 +1,13 @@
+# src/api/errors.py
+
+from typing import NoReturn
+
+from fastapi import HTTPException
+
+
+def raise_http_error(exc: ValueError) -> NoReturn:
+    """Map a service ValueError: "... not found" -> 404, anything else -> 400."""
+    msg = str(exc)
+    if "not found" in msg:
+        raise HTTPException(status_code=404, detail=msg) from exc
+    raise HTTPException(status_code=400, detail=msg) from exc
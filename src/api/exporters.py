@@ -0,0 +1,62 @@
+# src/api/exporters.py
+
+import json
+from collections.abc import Callable, Iterable, Iterator
+from enum import StrEnum
+
+from src.core.entities.habit_log import HabitLog
+
+# lines are sent in batches to keep the number of ASGI messages low
+LINES_PER_CHUNK = 500
+
+
+class ExportFormat(StrEnum):
+    """
+    Supported export formats:
+    - ndjson: one JSON object per line
+    - csv:    header row followed by one row per log
+    """
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        return "application/x-ndjson" if self is ExportFormat.NDJSON else "text/csv"
+
+
+def _ndjson_line(log: HabitLog) -> str:
+    record = {
+        "id": str(log.id),
+        "habit_id": str(log.habit_id),
+        "date": log.date.isoformat(),
+        "value": log.value,
+    }
+    return json.dumps(record) + "\n"
+
+
+def _csv_line(log: HabitLog) -> str:
+    # UUIDs, ISO dates and floats never need CSV quoting
+    return f"{log.id},{log.habit_id},{log.date.isoformat()},{log.value}\n"
+
+
+def _chunked(
+    logs: Iterable[HabitLog],
+    render: Callable[[HabitLog], str],
+    header: str = "",
+) -> Iterator[str]:
+    lines = [header] if header else []
+    for log in logs:
+        lines.append(render(log))
+        if len(lines) >= LINES_PER_CHUNK:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def export_logs(logs: Iterable[HabitLog], export_format: ExportFormat) -> Iterator[str]:
+    """Render logs lazily, so memory use does not depend on history size."""
+    if export_format is ExportFormat.CSV:
+        return _chunked(logs, _csv_line, header="id,habit_id,date,value\n")
+    return _chunked(logs, _ndjson_line)
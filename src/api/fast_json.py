@@ -0,0 +1,28 @@
+# src/api/fast_json.py
+
+"""
+JSON bytes for large list responses, written straight from the entities.
+
+orjson serializes the Habit / HabitLog dataclasses (UUIDs, dates, enums)
+natively, with the same field names and values as HabitResponse /
+HabitLogResponse. Routes that return `json_response` skip building one
+pydantic model per item and FastAPI's validation of the result; they
+keep their `response_model`, which still documents the schema.
+"""
+
+from collections.abc import Mapping
+
+import orjson
+from fastapi import Response
+
+
+def json_response(content: object, headers: Mapping[str, str]) -> Response:
+    """
+    `headers` are those already set on the route's `Response` parameter
+    (e.g. ETag), which FastAPI does not copy onto a returned response.
+    """
+    return Response(
+        orjson.dumps(content),
+        media_type="application/json",
+        headers=dict(headers),
+    )
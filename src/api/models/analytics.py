@@ -0,0 +1,44 @@
+# src/api/models/analytics.py
+
+from __future__ import annotations
+
+from datetime import date
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from src.core.entities.habit_analytics import HabitAnalytics
+
+
+class HabitAnalyticsResponse(BaseModel):
+    """
+    Response model for habit trend metrics.
+    """
+
+    habit_id: UUID
+    as_of: date
+    log_count: int
+    active_days: int
+    total: float
+    rolling_7d: float
+    rolling_30d: float
+    week_over_week: float
+    longest_streak: int
+    current_streak: int
+    completion_rate: float | None
+
+    @classmethod
+    def from_entity(cls, analytics: HabitAnalytics) -> HabitAnalyticsResponse:
+        return cls(
+            habit_id=analytics.habit_id,
+            as_of=analytics.as_of,
+            log_count=analytics.log_count,
+            active_days=analytics.active_days,
+            total=analytics.total,
+            rolling_7d=analytics.rolling_7d,
+            rolling_30d=analytics.rolling_30d,
+            week_over_week=analytics.week_over_week,
+            longest_streak=analytics.longest_streak,
+            current_streak=analytics.current_streak,
+            completion_rate=analytics.completion_rate,
+        )
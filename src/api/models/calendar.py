@@ -0,0 +1,61 @@
+# src/api/models/calendar.py
+
+from __future__ import annotations
+
+import base64
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from src.core.entities.habit import HabitType
+from src.core.entities.habit_calendar import HabitCalendar
+
+
+def _pack_bits(flags: list[bool]) -> str:
+    packed = bytearray((len(flags) + 7) // 8)
+    for day, flag in enumerate(flags):
+        if flag:
+            packed[day // 8] |= 1 << (day % 8)
+    return base64.b64encode(packed).decode()
+
+
+def _compact(total: float) -> int | float:
+    # "8" instead of "8.0" for the common whole-number totals
+    return int(total) if total.is_integer() else total
+
+
+class HabitCalendarResponse(BaseModel):
+    """
+    One year of a habit, one entry per day starting on January 1st.
+    Boolean habits get `bitmap`, numeric habits get `values`.
+    """
+
+    habit_id: UUID
+    year: int
+    type: HabitType
+    days: int
+    bitmap: str | None = Field(
+        default=None,
+        description=(
+            "Base64 of one bit per day, set if the habit was done; "
+            "January 1st is the lowest bit of the first byte."
+        ),
+    )
+    values: list[int | float] | None = Field(
+        default=None,
+        description="Total of each day's logs, 0 for days without logs.",
+    )
+
+    @classmethod
+    def from_entity(cls, calendar: HabitCalendar) -> HabitCalendarResponse:
+        response = cls(
+            habit_id=calendar.habit_id,
+            year=calendar.year,
+            type=calendar.type,
+            days=len(calendar.totals),
+        )
+        if calendar.type == HabitType.BOOLEAN:
+            response.bitmap = _pack_bits(calendar.done)
+        else:
+            response.values = [_compact(total) for total in calendar.totals]
+        return response
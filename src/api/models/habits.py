@@ -5,7 +5,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
-from src.core.entities.habit import HabitType
+from src.core.entities.habit import Habit, HabitType
+from src.core.entities.habit_tree import HabitTree
 
 
 class ErrorResponse(BaseModel):
@@ -75,6 +76,19 @@ class HabitResponse(BaseModel):
     created_at: date
     parent_id: UUID | None
 
+    @classmethod
+    def from_entity(cls, habit: Habit) -> "HabitResponse":
+        return cls(
+            id=habit.id,
+            name=habit.name,
+            description=habit.description,
+            category=habit.category,
+            type=habit.type,
+            goal=habit.goal,
+            created_at=habit.created_at,
+            parent_id=habit.parent_id,
+        )
+
 
 class HabitListResponse(BaseModel):
     """
@@ -82,3 +96,30 @@ class HabitListResponse(BaseModel):
     """
 
     habits: list[HabitResponse]
+    next_cursor: str | None = Field(
+        default=None,
+        description="Pass as `cursor` to fetch the next page; null on the last page.",
+    )
+
+
+class HabitSearchResponse(BaseModel):
+    """
+    Response for a habit search, best match first.
+    """
+
+    habits: list[HabitResponse]
+
+
+class HabitTreeResponse(HabitResponse):
+    """
+    Habit with its sub-habits, nested down to the requested depth.
+    """
+
+    children: list["HabitTreeResponse"] = Field(default_factory=list)
+
+    @classmethod
+    def from_tree(cls, tree: HabitTree) -> "HabitTreeResponse":
+        return cls(
+            **HabitResponse.from_entity(tree.habit).model_dump(),
+            children=[cls.from_tree(child) for child in tree.children],
+        )
@@ -7,6 +7,9 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from src.core.entities.habit_log import HabitLog
+from src.core.entities.log_rollup import LogRollup, RollupBucket
+
 
 class HabitLogCreate(BaseModel):
     """
@@ -41,6 +44,15 @@ class HabitLogResponse(BaseModel):
     date: dt.date
     value: float
 
+    @classmethod
+    def from_entity(cls, log: HabitLog) -> HabitLogResponse:
+        return cls(
+            id=log.id,
+            habit_id=log.habit_id,
+            date=log.date,
+            value=log.value,
+        )
+
 
 class HabitLogListResponse(BaseModel):
     """
@@ -48,3 +60,73 @@ class HabitLogListResponse(BaseModel):
     """
 
     logs: list[HabitLogResponse]
+    next_cursor: str | None = Field(
+        default=None,
+        description="Pass as `cursor` to fetch the next page; null on the last page.",
+    )
+
+
+class HabitLogRollupResponse(BaseModel):
+    """
+    Logs of one day, week or month, aggregated.
+    """
+
+    bucket: RollupBucket
+    start: dt.date = Field(..., description="First day of the bucket.")
+    total: float
+    log_count: int
+    min_value: float
+    max_value: float
+
+    @classmethod
+    def from_entity(cls, rollup: LogRollup) -> HabitLogRollupResponse:
+        return cls(
+            bucket=rollup.bucket,
+            start=rollup.start,
+            total=rollup.total,
+            log_count=rollup.log_count,
+            min_value=rollup.min_value,
+            max_value=rollup.max_value,
+        )
+
+
+class HabitLogRollupListResponse(BaseModel):
+    """
+    Response wrapper for logs listed with `bucket`.
+    """
+
+    habit_id: UUID
+    rollups: list[HabitLogRollupResponse]
+    next_cursor: str | None = Field(
+        default=None,
+        description="Pass as `cursor` to fetch the next page; null on the last page.",
+    )
+
+
+class HabitLogBulkCreate(BaseModel):
+    """
+    Request body for creating many logs for a habit at once.
+    """
+
+    logs: list[HabitLogCreate] = Field(
+        ...,
+        description="Log entries, stored in a single transaction.",
+    )
+
+
+class HabitLogBulkError(BaseModel):
+    """
+    Entry of a bulk request that was rejected.
+    """
+
+    index: int = Field(..., description="Position of the entry in the request.")
+    message: str
+
+
+class HabitLogBulkResponse(BaseModel):
+    """
+    Result of a bulk log request.
+    """
+
+    created: list[HabitLogResponse]
+    errors: list[HabitLogBulkError]
@@ -0,0 +1,82 @@
+# src/api/models/metrics.py
+
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class PoolStatsResponse(BaseModel):
+    """
+    Connection pool counters.
+    """
+
+    size: int
+    open: int
+    idle: int
+    hits: int
+    misses: int
+    waits: int
+    timeouts: int
+
+
+class CacheStatsResponse(BaseModel):
+    """
+    Habit cache counters.
+    """
+
+    size: int
+    max_size: int
+    ttl: float
+    version: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+
+class GroupCommitStatsResponse(BaseModel):
+    """
+    Group-commit writer counters.
+    """
+
+    batches: int
+    writes: int
+    logs: int
+    failed: int
+
+
+class CalendarCacheStatsResponse(BaseModel):
+    """
+    Calendar cache counters.
+    """
+
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class ShardStatsResponse(BaseModel):
+    """
+    Tenant database counters.
+    """
+
+    open: int
+    opened: int
+    evictions: int
+
+
+class MetricsResponse(BaseModel):
+    """
+    Runtime metrics of the service.
+    """
+
+    db_pool: PoolStatsResponse
+    db_read_pool: PoolStatsResponse
+    async_db_pool: PoolStatsResponse | None = None
+    habit_cache: CacheStatsResponse | None = None
+    calendar_cache: CalendarCacheStatsResponse | None = None
+    group_commit: GroupCommitStatsResponse | None = None
+    shards: ShardStatsResponse
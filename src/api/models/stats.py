@@ -2,10 +2,18 @@
 
 from __future__ import annotations
 
+from enum import StrEnum
 from uuid import UUID
 
 from pydantic import BaseModel
 
+from src.core.entities.habit_stats import HabitStats, SubtreeStats
+
+
+class StatsScope(StrEnum):
+    HABIT = "habit"
+    SUBTREE = "subtree"
+
 
 class HabitStatsResponse(BaseModel):
     """
@@ -16,3 +24,44 @@ class HabitStatsResponse(BaseModel):
     total: float
     current_streak: int
     average: float
+
+    @classmethod
+    def from_entity(cls, stats: HabitStats) -> HabitStatsResponse:
+        return cls(
+            habit_id=stats.habit_id,
+            total=stats.total,
+            current_streak=stats.current_streak,
+            average=stats.average,
+        )
+
+
+class HabitStatsListResponse(BaseModel):
+    """
+    Response model for statistics of several habits.
+    """
+
+    stats: list[HabitStatsResponse]
+
+
+class SubtreeStatsResponse(BaseModel):
+    """
+    Response model for the combined statistics of a habit and its sub-habits.
+    """
+
+    habit_id: UUID
+    total: float
+    average: float
+    any_streak: int
+    all_streak: int
+    habits: list[HabitStatsResponse]
+
+    @classmethod
+    def from_entity(cls, stats: SubtreeStats) -> SubtreeStatsResponse:
+        return cls(
+            habit_id=stats.habit_id,
+            total=stats.total,
+            average=stats.average,
+            any_streak=stats.any_streak,
+            all_streak=stats.all_streak,
+            habits=[HabitStatsResponse.from_entity(s) for s in stats.habits],
+        )
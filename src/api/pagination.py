@@ -0,0 +1,96 @@
+# src/api/pagination.py
+
+import base64
+import json
+from datetime import date
+from uuid import UUID
+
+from fastapi import HTTPException, Query
+
+from src.core.interface.repositories import HabitPageKey, LogPageKey, RollupPageKey
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1_000
+
+# Ruff B008: use module-level singletons for Query defaults
+LIMIT_QUERY = Query(
+    DEFAULT_PAGE_SIZE,
+    ge=1,
+    le=MAX_PAGE_SIZE,
+    description="Maximum number of items per page.",
+)
+CURSOR_QUERY = Query(
+    None,
+    description="Opaque `next_cursor` value from the previous page.",
+)
+
+
+def _encode(parts: list[str]) -> str:
+    raw = json.dumps(parts, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor: str, size: int) -> list[str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        parts = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+    if (
+        not isinstance(parts, list)
+        or len(parts) != size
+        or not all(isinstance(p, str) for p in parts)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return parts
+
+
+def encode_habit_cursor(key: HabitPageKey | None) -> str | None:
+    if key is None:
+        return None
+    created_at, name, habit_id = key
+    return _encode([created_at.isoformat(), name, str(habit_id)])
+
+
+def decode_habit_cursor(cursor: str | None) -> HabitPageKey | None:
+    if cursor is None:
+        return None
+    created_at, name, habit_id = _decode(cursor, 3)
+    try:
+        return date.fromisoformat(created_at), name, UUID(habit_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def encode_log_cursor(key: LogPageKey | None) -> str | None:
+    if key is None:
+        return None
+    log_date, log_id = key
+    return _encode([log_date.isoformat(), str(log_id)])
+
+
+def decode_log_cursor(cursor: str | None) -> LogPageKey | None:
+    if cursor is None:
+        return None
+    log_date, log_id = _decode(cursor, 2)
+    try:
+        return date.fromisoformat(log_date), UUID(log_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def encode_rollup_cursor(key: RollupPageKey | None) -> str | None:
+    if key is None:
+        return None
+    return _encode([key.isoformat()])
+
+
+def decode_rollup_cursor(cursor: str | None) -> RollupPageKey | None:
+    if cursor is None:
+        return None
+    (bucket_start,) = _decode(cursor, 1)
+    try:
+        return date.fromisoformat(bucket_start)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
@@ -0,0 +1,194 @@
+# src/api/routes/async_habit_logs_route.py
+
+from datetime import date
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from src.api.conditional import not_modified
+from src.api.errors import raise_http_error
+from src.api.fast_json import json_response
+from src.api.models.calendar import HabitCalendarResponse
+from src.api.models.habits import ErrorResponse
+from src.api.models.logs import (
+    HabitLogBulkCreate,
+    HabitLogBulkError,
+    HabitLogBulkResponse,
+    HabitLogCreate,
+    HabitLogListResponse,
+    HabitLogResponse,
+    HabitLogRollupListResponse,
+    HabitLogRollupResponse,
+)
+from src.api.pagination import (
+    CURSOR_QUERY,
+    LIMIT_QUERY,
+    decode_log_cursor,
+    decode_rollup_cursor,
+    encode_log_cursor,
+    encode_rollup_cursor,
+)
+from src.api.routes.habit_logs_route import (
+    BUCKET_QUERY,
+    END_DATE_QUERY,
+    START_DATE_QUERY,
+    YEAR_QUERY,
+)
+from src.core.entities.habit_calendar import HabitCalendar
+from src.core.entities.log_rollup import RollupBucket
+from src.core.services.habit_log_service import AsyncHabitLogService
+from src.infra.calendar_cache import get_calendar_cache
+from src.infra.config import get_settings
+from src.infra.repositories.change_repository import AsyncSQLiteChangeRepository
+from src.infra.repositories.group_commit_log_repository import (
+    create_async_log_repository,
+)
+from src.infra.repositories.habit_repository import AsyncSQLiteHabitRepository
+
+# same endpoints as habit_logs_route, served on the event loop
+router = APIRouter(prefix="/habits", tags=["habit-logs"])
+
+habit_repository = AsyncSQLiteHabitRepository()
+habit_log_repository = create_async_log_repository()
+habit_log_service = AsyncHabitLogService(
+    habit_log_repository,
+    habit_repository,
+    max_batch_size=get_settings().max_bulk_logs,
+)
+change_repository = AsyncSQLiteChangeRepository()
+
+
+@router.post(
+    "/{habit_id}/logs",
+    response_model=HabitLogResponse,
+    responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}},
+)
+async def add_log(habit_id: UUID, body: HabitLogCreate) -> HabitLogResponse:
+    try:
+        log = await habit_log_service.add_log(
+            habit_id=habit_id,
+            log_date=body.date,
+            value=body.value,
+        )
+    except ValueError as exc:
+        raise_http_error(exc)
+
+    return HabitLogResponse.from_entity(log)
+
+
+@router.post(
+    "/{habit_id}/logs:bulk",
+    response_model=HabitLogBulkResponse,
+    responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}},
+)
+async def add_logs_bulk(
+    habit_id: UUID, body: HabitLogBulkCreate
+) -> HabitLogBulkResponse:
+    try:
+        result = await habit_log_service.add_logs(
+            habit_id=habit_id,
+            entries=[(entry.date, entry.value) for entry in body.logs],
+        )
+    except ValueError as exc:
+        raise_http_error(exc)
+
+    return HabitLogBulkResponse(
+        created=[HabitLogResponse.from_entity(log) for log in result.created],
+        errors=[
+            HabitLogBulkError(index=error.index, message=error.message)
+            for error in result.errors
+        ],
+    )
+
+
+async def _list_rollups(
+    habit_id: UUID,
+    bucket: RollupBucket,
+    limit: int,
+    cursor: str | None,
+    start: date | None,
+    end: date | None,
+) -> HabitLogRollupListResponse:
+    after = decode_rollup_cursor(cursor)
+    try:
+        page = await habit_log_service.list_rollups_page(
+            habit_id, bucket, limit, after, start, end
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    return HabitLogRollupListResponse(
+        habit_id=habit_id,
+        rollups=[HabitLogRollupResponse.from_entity(r) for r in page.items],
+        next_cursor=encode_rollup_cursor(page.next_key),
+    )
+
+
+@router.get(
+    "/{habit_id}/logs",
+    response_model=HabitLogListResponse | HabitLogRollupListResponse,
+    responses={304: {"description": "Not Modified"}, 404: {"model": ErrorResponse}},
+)
+async def list_logs(
+    request: Request,
+    response: Response,
+    habit_id: UUID,
+    start: date | None = START_DATE_QUERY,
+    end: date | None = END_DATE_QUERY,
+    bucket: RollupBucket | None = BUCKET_QUERY,
+    limit: int = LIMIT_QUERY,
+    cursor: str | None = CURSOR_QUERY,
+) -> HabitLogListResponse | HabitLogRollupListResponse | Response:
+    version = await change_repository.get_habit_version(habit_id)
+    unchanged = not_modified(request, response, version)
+    if unchanged is not None:
+        return unchanged
+
+    if bucket is not None:
+        return await _list_rollups(habit_id, bucket, limit, cursor, start, end)
+
+    after = decode_log_cursor(cursor)
+    try:
+        page = await habit_log_service.list_logs_page(
+            habit_id, limit, after, start, end
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    # same JSON as HabitLogListResponse, without a model per log
+    return json_response(
+        {"logs": page.items, "next_cursor": encode_log_cursor(page.next_key)},
+        response.headers,
+    )
+
+
+@router.get(
+    "/{habit_id}/calendar",
+    response_model=HabitCalendarResponse,
+    response_model_exclude_none=True,
+    responses={304: {"description": "Not Modified"}, 404: {"model": ErrorResponse}},
+)
+async def get_calendar(
+    request: Request,
+    response: Response,
+    habit_id: UUID,
+    year: int = YEAR_QUERY,
+) -> HabitCalendarResponse | Response:
+    version = await change_repository.get_habit_version(habit_id)
+    unchanged = not_modified(request, response, version)
+    if unchanged is not None:
+        return unchanged
+
+    cache = get_calendar_cache()
+    calendar: HabitCalendar | None = None
+    if cache is not None and version is not None:
+        calendar = cache.get(habit_id, year, version)
+    if calendar is None:
+        try:
+            calendar = await habit_log_service.get_calendar(habit_id, year)
+        except ValueError as exc:
+            raise HTTPException(status_code=404, detail=str(exc)) from exc
+        if cache is not None and version is not None:
+            cache.put(calendar, version)
+
+    return HabitCalendarResponse.from_entity(calendar)
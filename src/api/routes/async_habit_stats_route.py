@@ -0,0 +1,76 @@
+# src/api/routes/async_habit_stats_route.py
+
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from src.api.conditional import not_modified
+from src.api.models.habits import ErrorResponse
+from src.api.models.stats import (
+    HabitStatsListResponse,
+    HabitStatsResponse,
+    StatsScope,
+    SubtreeStatsResponse,
+)
+from src.api.routes.habit_stats_route import HABIT_IDS_QUERY, SCOPE_QUERY
+from src.core.services.habit_stats_service import AsyncHabitStatsService
+from src.infra.config import get_settings
+from src.infra.repositories.change_repository import AsyncSQLiteChangeRepository
+from src.infra.repositories.habit_repository import AsyncSQLiteHabitRepository
+from src.infra.repositories.habit_stats_repository import (
+    create_async_stats_repository,
+)
+
+# same endpoints as habit_stats_route, served on the event loop
+router = APIRouter(prefix="/habits", tags=["habit-stats"])
+
+habit_repository = AsyncSQLiteHabitRepository()
+habit_stats_repository = create_async_stats_repository(get_settings().stats_backend)
+habit_stats_service = AsyncHabitStatsService(habit_stats_repository, habit_repository)
+change_repository = AsyncSQLiteChangeRepository()
+
+
+@router.get(
+    "/stats",
+    response_model=HabitStatsListResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_stats_many(
+    ids: list[UUID] | None = HABIT_IDS_QUERY,
+) -> HabitStatsListResponse:
+    try:
+        stats = await habit_stats_service.get_stats_many(ids)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    return HabitStatsListResponse(
+        stats=[HabitStatsResponse.from_entity(s) for s in stats]
+    )
+
+
+@router.get(
+    "/{habit_id}/stats",
+    response_model=HabitStatsResponse | SubtreeStatsResponse,
+    responses={304: {"description": "Not Modified"}, 404: {"model": ErrorResponse}},
+)
+async def get_stats(
+    request: Request,
+    response: Response,
+    habit_id: UUID,
+    scope: StatsScope = SCOPE_QUERY,
+) -> HabitStatsResponse | SubtreeStatsResponse | Response:
+    if scope == StatsScope.HABIT:
+        version = await change_repository.get_habit_version(habit_id)
+        unchanged = not_modified(request, response, version)
+        if unchanged is not None:
+            return unchanged
+
+    try:
+        if scope == StatsScope.SUBTREE:
+            subtree = await habit_stats_service.get_subtree_stats(habit_id)
+            return SubtreeStatsResponse.from_entity(subtree)
+        stats = await habit_stats_service.get_stats(habit_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    return HabitStatsResponse.from_entity(stats)
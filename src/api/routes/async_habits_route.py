@@ -0,0 +1,188 @@
+# src/api/routes/async_habits_route.py
+
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from src.api.conditional import not_modified
+from src.api.errors import raise_http_error
+from src.api.fast_json import json_response
+from src.api.models.habits import (
+    ErrorResponse,
+    HabitCreate,
+    HabitListResponse,
+    HabitResponse,
+    HabitSearchResponse,
+    HabitTreeResponse,
+    HabitUpdate,
+)
+from src.api.pagination import (
+    CURSOR_QUERY,
+    LIMIT_QUERY,
+    decode_habit_cursor,
+    encode_habit_cursor,
+)
+from src.api.routes.habits_route import (
+    HABIT_FILTER,
+    MAX_DEPTH_QUERY,
+    SEARCH_QUERY,
+)
+from src.core.entities.habit_filter import HabitFilter
+from src.core.services.habit_service import AsyncHabitService
+from src.infra.repositories.change_repository import AsyncSQLiteChangeRepository
+from src.infra.repositories.habit_repository import AsyncSQLiteHabitRepository
+
+# same endpoints as habits_route, served on the event loop (HABIT_BACKEND=async)
+router = APIRouter(prefix="/habits", tags=["habits"])
+
+habit_repository = AsyncSQLiteHabitRepository()
+habit_service = AsyncHabitService(habit_repository)
+change_repository = AsyncSQLiteChangeRepository()
+
+
+@router.post(
+    "",
+    response_model=HabitResponse,
+    responses={400: {"model": ErrorResponse}},
+)
+async def create_habit(body: HabitCreate) -> HabitResponse:
+    try:
+        habit = await habit_service.create_habit(
+            name=body.name,
+            description=body.description,
+            category=body.category,
+            type_=body.type,
+            goal=body.goal,
+            parent_id=body.parent_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return HabitResponse.from_entity(habit)
+
+
+@router.get(
+    "",
+    response_model=HabitListResponse,
+    responses={304: {"description": "Not Modified"}},
+)
+async def list_habits(
+    request: Request,
+    response: Response,
+    limit: int = LIMIT_QUERY,
+    cursor: str | None = CURSOR_QUERY,
+    filters: HabitFilter = HABIT_FILTER,
+) -> HabitListResponse | Response:
+    version = await change_repository.get_habits_version()
+    unchanged = not_modified(request, response, version)
+    if unchanged is not None:
+        return unchanged
+
+    page = await habit_service.list_habits_page(
+        limit, decode_habit_cursor(cursor), filters
+    )
+    # same JSON as HabitListResponse, without a model per habit
+    return json_response(
+        {"habits": page.items, "next_cursor": encode_habit_cursor(page.next_key)},
+        response.headers,
+    )
+
+
+# before /{habit_id}, which would take "search" for an id
+@router.get(
+    "/search",
+    response_model=HabitSearchResponse,
+)
+async def search_habits(
+    q: str = SEARCH_QUERY,
+    limit: int = LIMIT_QUERY,
+) -> HabitSearchResponse | Response:
+    habits = await habit_service.search_habits(q, limit)
+    return json_response({"habits": habits}, {})
+
+
+@router.get(
+    "/{habit_id}",
+    response_model=HabitResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_habit(habit_id: UUID) -> HabitResponse:
+    try:
+        habit = await habit_service.get_habit(habit_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    return HabitResponse.from_entity(habit)
+
+
+@router.put(
+    "/{habit_id}",
+    response_model=HabitResponse,
+    responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}},
+)
+async def update_habit(habit_id: UUID, body: HabitUpdate) -> HabitResponse:
+    try:
+        habit = await habit_service.update_habit(
+            habit_id=habit_id,
+            name=body.name,
+            description=body.description,
+            category=body.category,
+            goal=body.goal,
+            parent_id=body.parent_id,
+        )
+    except ValueError as exc:
+        # unknown habit or parent -> 404, reparenting into a loop -> 400
+        raise_http_error(exc)
+
+    return HabitResponse.from_entity(habit)
+
+
+@router.delete(
+    "/{habit_id}",
+    status_code=200,
+    responses={404: {"model": ErrorResponse}},
+)
+async def delete_habit(habit_id: UUID) -> dict[str, str]:
+    try:
+        await habit_service.delete_habit(habit_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    return {}
+
+
+@router.post(
+    "/{habit_id}/subhabits",
+    response_model=HabitResponse,
+    responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}},
+)
+async def create_subhabit(habit_id: UUID, body: HabitCreate) -> HabitResponse:
+    try:
+        habit = await habit_service.create_subhabit(
+            parent_id=habit_id,
+            name=body.name,
+            description=body.description,
+            category=body.category,
+            type_=body.type,
+            goal=body.goal,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    return HabitResponse.from_entity(habit)
+
+
+@router.get(
+    "/{habit_id}/tree",
+    response_model=HabitTreeResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_habit_tree(
+    habit_id: UUID, max_depth: int | None = MAX_DEPTH_QUERY
+) -> HabitTreeResponse:
+    try:
+        tree = await habit_service.get_tree(habit_id, max_depth)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    return HabitTreeResponse.from_tree(tree)
@@ -0,0 +1,43 @@
+# src/api/routes/habit_analytics_route.py
+
+from datetime import date
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query
+
+from src.api.dependencies import READ_UOW
+from src.api.models.analytics import HabitAnalyticsResponse
+from src.api.models.habits import ErrorResponse
+from src.core.interface.unit_of_work import UnitOfWork
+from src.core.services.habit_analytics_service import HabitAnalyticsService
+
+router = APIRouter(prefix="/habits", tags=["habit-analytics"])
+
+
+# Ruff B008: use module-level singletons for Query defaults
+AS_OF_QUERY = Query(
+    None,
+    description="Last day included in the metrics (default: today).",
+)
+
+
+def _service(uow: UnitOfWork) -> HabitAnalyticsService:
+    return HabitAnalyticsService(uow.analytics, uow.habits)
+
+
+@router.get(
+    "/{habit_id}/analytics",
+    response_model=HabitAnalyticsResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+def get_analytics(
+    habit_id: UUID,
+    as_of: date | None = AS_OF_QUERY,
+    uow: UnitOfWork = READ_UOW,
+) -> HabitAnalyticsResponse:
+    try:
+        analytics = _service(uow).get_analytics(habit_id, as_of)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    return HabitAnalyticsResponse.from_entity(analytics)
@@ -0,0 +1,58 @@
+# src/api/routes/habit_log_export_route.py
+
+from datetime import date
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from src.api.dependencies import READ_UOW
+from src.api.exporters import ExportFormat, export_logs
+from src.api.models.habits import ErrorResponse
+from src.api.routes.habit_logs_route import (
+    END_DATE_QUERY,
+    START_DATE_QUERY,
+    log_service,
+)
+from src.core.interface.unit_of_work import UnitOfWork
+
+# shared by both backends: the export streams from a sync cursor in the
+# threadpool, so it never holds an async connection for the whole download.
+# The unit of work only covers the existence check; the rows are read on a
+# connection of their own while the response is sent.
+router = APIRouter(prefix="/habits", tags=["habit-logs"])
+
+# Ruff B008: use module-level singletons for Query defaults
+EXPORT_FORMAT_QUERY = Query(
+    ExportFormat.NDJSON,
+    alias="format",
+    description="ndjson (one JSON object per line) or csv.",
+)
+
+
+@router.get(
+    "/{habit_id}/logs/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"application/x-ndjson": {}, "text/csv": {}}},
+        404: {"model": ErrorResponse},
+    },
+)
+def export_habit_logs(
+    habit_id: UUID,
+    export_format: ExportFormat = EXPORT_FORMAT_QUERY,
+    start: date | None = START_DATE_QUERY,
+    end: date | None = END_DATE_QUERY,
+    uow: UnitOfWork = READ_UOW,
+) -> StreamingResponse:
+    try:
+        logs = log_service(uow).export_logs(habit_id, start, end)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    filename = f"habit-{habit_id}-logs.{export_format.value}"
+    return StreamingResponse(
+        export_logs(logs, export_format),
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
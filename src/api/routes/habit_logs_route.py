@@ -3,20 +3,42 @@
 from datetime import date
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
+from src.api.conditional import not_modified
+from src.api.dependencies import LOG_WRITE_UOW, READ_UOW
+from src.api.errors import raise_http_error
+from src.api.fast_json import json_response
+from src.api.models.calendar import HabitCalendarResponse
 from src.api.models.habits import ErrorResponse
-from src.api.models.logs import HabitLogCreate, HabitLogListResponse, HabitLogResponse
+from src.api.models.logs import (
+    HabitLogBulkCreate,
+    HabitLogBulkError,
+    HabitLogBulkResponse,
+    HabitLogCreate,
+    HabitLogListResponse,
+    HabitLogResponse,
+    HabitLogRollupListResponse,
+    HabitLogRollupResponse,
+)
+from src.api.pagination import (
+    CURSOR_QUERY,
+    LIMIT_QUERY,
+    decode_log_cursor,
+    decode_rollup_cursor,
+    encode_log_cursor,
+    encode_rollup_cursor,
+)
+from src.core.entities.habit_calendar import HabitCalendar
+from src.core.entities.log_rollup import RollupBucket
+from src.core.interface.unit_of_work import UnitOfWork
 from src.core.services.habit_log_service import HabitLogService
-from src.infra.repositories.habit_log_repository import SQLiteHabitLogRepository
-from src.infra.repositories.habit_repository import SQLiteHabitRepository
+from src.infra.calendar_cache import get_calendar_cache
+from src.infra.config import get_settings
 
 # THIS must exist for app.py:
 router = APIRouter(prefix="/habits", tags=["habit-logs"])
 
-habit_repository = SQLiteHabitRepository()
-habit_log_repository = SQLiteHabitLogRepository()
-habit_log_service = HabitLogService(habit_log_repository, habit_repository)
 
 # Ruff B008: use module-level singletons for Query defaults
 START_DATE_QUERY = Query(
@@ -27,6 +49,22 @@ END_DATE_QUERY = Query(
     None,
     description="Optional end date (inclusive).",
 )
+BUCKET_QUERY = Query(
+    None,
+    description=(
+        "Aggregate the logs per day, week (from Monday) or month instead of "
+        "listing them; answered from precomputed rollups."
+    ),
+)
+YEAR_QUERY = Query(..., ge=1, le=9999, description="Calendar year.")
+
+
+def log_service(uow: UnitOfWork) -> HabitLogService:
+    return HabitLogService(
+        uow.logs,
+        uow.habits,
+        max_batch_size=get_settings().max_bulk_logs,
+    )
 
 
 @router.post(
@@ -34,50 +72,140 @@ END_DATE_QUERY = Query(
     response_model=HabitLogResponse,
     responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}},
 )
-def add_log(habit_id: UUID, body: HabitLogCreate) -> HabitLogResponse:
+def add_log(
+    habit_id: UUID,
+    body: HabitLogCreate,
+    uow: UnitOfWork = LOG_WRITE_UOW,
+) -> HabitLogResponse:
     try:
-        log = habit_log_service.add_log(
+        log = log_service(uow).add_log(
             habit_id=habit_id,
             log_date=body.date,
             value=body.value,
         )
     except ValueError as exc:
-        msg = str(exc)
-        if "not found" in msg:
-            raise HTTPException(status_code=404, detail=msg) from exc
-        raise HTTPException(status_code=400, detail=msg) from exc
-
-    return HabitLogResponse(
-        id=log.id,
-        habit_id=log.habit_id,
-        date=log.date,
-        value=log.value,
+        raise_http_error(exc)
+
+    return HabitLogResponse.from_entity(log)
+
+
+@router.post(
+    "/{habit_id}/logs:bulk",
+    response_model=HabitLogBulkResponse,
+    responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}},
+)
+def add_logs_bulk(
+    habit_id: UUID,
+    body: HabitLogBulkCreate,
+    uow: UnitOfWork = LOG_WRITE_UOW,
+) -> HabitLogBulkResponse:
+    try:
+        result = log_service(uow).add_logs(
+            habit_id=habit_id,
+            entries=[(entry.date, entry.value) for entry in body.logs],
+        )
+    except ValueError as exc:
+        raise_http_error(exc)
+
+    return HabitLogBulkResponse(
+        created=[HabitLogResponse.from_entity(log) for log in result.created],
+        errors=[
+            HabitLogBulkError(index=error.index, message=error.message)
+            for error in result.errors
+        ],
+    )
+
+
+def _list_rollups(
+    uow: UnitOfWork,
+    habit_id: UUID,
+    bucket: RollupBucket,
+    limit: int,
+    cursor: str | None,
+    start: date | None,
+    end: date | None,
+) -> HabitLogRollupListResponse:
+    after = decode_rollup_cursor(cursor)
+    try:
+        page = log_service(uow).list_rollups_page(
+            habit_id, bucket, limit, after, start, end
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    return HabitLogRollupListResponse(
+        habit_id=habit_id,
+        rollups=[HabitLogRollupResponse.from_entity(r) for r in page.items],
+        next_cursor=encode_rollup_cursor(page.next_key),
     )
 
 
 @router.get(
     "/{habit_id}/logs",
-    response_model=HabitLogListResponse,
-    responses={404: {"model": ErrorResponse}},
+    response_model=HabitLogListResponse | HabitLogRollupListResponse,
+    responses={304: {"description": "Not Modified"}, 404: {"model": ErrorResponse}},
 )
 def list_logs(
+    request: Request,
+    response: Response,
     habit_id: UUID,
     start: date | None = START_DATE_QUERY,
     end: date | None = END_DATE_QUERY,
-) -> HabitLogListResponse:
+    bucket: RollupBucket | None = BUCKET_QUERY,
+    limit: int = LIMIT_QUERY,
+    cursor: str | None = CURSOR_QUERY,
+    uow: UnitOfWork = READ_UOW,
+) -> HabitLogListResponse | HabitLogRollupListResponse | Response:
+    version = uow.changes.get_habit_version(habit_id)
+    unchanged = not_modified(request, response, version)
+    if unchanged is not None:
+        return unchanged
+
+    if bucket is not None:
+        return _list_rollups(uow, habit_id, bucket, limit, cursor, start, end)
+
+    after = decode_log_cursor(cursor)
     try:
-        logs = habit_log_service.list_logs(habit_id, start, end)
+        page = log_service(uow).list_logs_page(habit_id, limit, after, start, end)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
-    return HabitLogListResponse(
-        logs=[
-            HabitLogResponse(
-                id=log.id,
-                habit_id=log.habit_id,
-                date=log.date,
-                value=log.value,
-            )
-            for log in logs
-        ]
+    # same JSON as HabitLogListResponse, without a model per log
+    return json_response(
+        {"logs": page.items, "next_cursor": encode_log_cursor(page.next_key)},
+        response.headers,
     )
+
+
+@router.get(
+    "/{habit_id}/calendar",
+    response_model=HabitCalendarResponse,
+    response_model_exclude_none=True,
+    responses={304: {"description": "Not Modified"}, 404: {"model": ErrorResponse}},
+)
+def get_calendar(
+    request: Request,
+    response: Response,
+    habit_id: UUID,
+    year: int = YEAR_QUERY,
+    uow: UnitOfWork = READ_UOW,
+) -> HabitCalendarResponse | Response:
+    version = uow.changes.get_habit_version(habit_id)
+    unchanged = not_modified(request, response, version)
+    if unchanged is not None:
+        return unchanged
+
+    # valid while the habit's version is unchanged, see calendar_cache
+    cache = get_calendar_cache()
+    calendar: HabitCalendar | None = None
+    if cache is not None and version is not None:
+        calendar = cache.get(habit_id, year, version)
+    if calendar is None:
+        try:
+            calendar = log_service(uow).get_calendar(habit_id, year)
+        except ValueError as exc:
+            raise HTTPException(status_code=404, detail=str(exc)) from exc
+        if cache is not None and version is not None:
+            cache.put(calendar, version)
+
+    return HabitCalendarResponse.from_entity(calendar)
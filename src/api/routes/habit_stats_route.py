@@ -2,37 +2,88 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
+from src.api.conditional import not_modified
+from src.api.dependencies import READ_UOW
 from src.api.models.habits import ErrorResponse
-from src.api.models.stats import HabitStatsResponse
+from src.api.models.stats import (
+    HabitStatsListResponse,
+    HabitStatsResponse,
+    StatsScope,
+    SubtreeStatsResponse,
+)
+from src.core.interface.unit_of_work import UnitOfWork
 from src.core.services.habit_stats_service import HabitStatsService
-from src.infra.repositories.habit_repository import SQLiteHabitRepository
-from src.infra.repositories.habit_stats_repository import SQLiteHabitStatsRepository
 
 # THIS is what app.py imports
 router = APIRouter(prefix="/habits", tags=["habit-stats"])
 
-habit_repository = SQLiteHabitRepository()
-habit_stats_repository = SQLiteHabitStatsRepository()
-habit_stats_service = HabitStatsService(habit_stats_repository, habit_repository)
+
+# Ruff B008: use module-level singletons for Query defaults
+HABIT_IDS_QUERY = Query(
+    None,
+    description="Habits to include (repeat the parameter); omit for all habits.",
+)
+SCOPE_QUERY = Query(
+    StatsScope.HABIT,
+    description=(
+        "'subtree' combines the habit with all of its sub-habits, "
+        "with routine streaks and a per-habit breakdown."
+    ),
+)
+
+
+def _service(uow: UnitOfWork) -> HabitStatsService:
+    return HabitStatsService(uow.stats, uow.habits)
 
 
 @router.get(
-    "/{habit_id}/stats",
-    response_model=HabitStatsResponse,
+    "/stats",
+    response_model=HabitStatsListResponse,
     responses={404: {"model": ErrorResponse}},
 )
-def get_stats(habit_id: UUID) -> HabitStatsResponse:
+def get_stats_many(
+    ids: list[UUID] | None = HABIT_IDS_QUERY,
+    uow: UnitOfWork = READ_UOW,
+) -> HabitStatsListResponse:
     try:
-        stats = habit_stats_service.get_stats(habit_id)
+        stats = _service(uow).get_stats_many(ids)
     except ValueError as exc:
-        # B904: chain the original exception
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
-    return HabitStatsResponse(
-        habit_id=stats.habit_id,
-        total=stats.total,
-        current_streak=stats.current_streak,
-        average=stats.average,
+    return HabitStatsListResponse(
+        stats=[HabitStatsResponse.from_entity(s) for s in stats]
     )
+
+
+@router.get(
+    "/{habit_id}/stats",
+    response_model=HabitStatsResponse | SubtreeStatsResponse,
+    responses={304: {"description": "Not Modified"}, 404: {"model": ErrorResponse}},
+)
+def get_stats(
+    request: Request,
+    response: Response,
+    habit_id: UUID,
+    scope: StatsScope = SCOPE_QUERY,
+    uow: UnitOfWork = READ_UOW,
+) -> HabitStatsResponse | SubtreeStatsResponse | Response:
+    # a habit's counter does not cover its sub-habits' logs
+    if scope == StatsScope.HABIT:
+        version = uow.changes.get_habit_version(habit_id)
+        unchanged = not_modified(request, response, version)
+        if unchanged is not None:
+            return unchanged
+
+    service = _service(uow)
+    try:
+        if scope == StatsScope.SUBTREE:
+            subtree = service.get_subtree_stats(habit_id)
+            return SubtreeStatsResponse.from_entity(subtree)
+        stats = service.get_stats(habit_id)
+    except ValueError as exc:
+        # B904: chain the original exception
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    return HabitStatsResponse.from_entity(stats)
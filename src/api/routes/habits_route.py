@@ -2,23 +2,70 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
+from src.api.conditional import not_modified
+from src.api.dependencies import READ_UOW, WRITE_UOW
+from src.api.errors import raise_http_error
+from src.api.fast_json import json_response
 from src.api.models.habits import (
     ErrorResponse,
     HabitCreate,
     HabitListResponse,
     HabitResponse,
+    HabitSearchResponse,
+    HabitTreeResponse,
     HabitUpdate,
 )
+from src.api.pagination import (
+    CURSOR_QUERY,
+    LIMIT_QUERY,
+    decode_habit_cursor,
+    encode_habit_cursor,
+)
+from src.core.entities.habit import HabitType
+from src.core.entities.habit_filter import HabitFilter
+from src.core.interface.unit_of_work import UnitOfWork
 from src.core.services.habit_service import HabitService
-from src.infra.repositories.habit_repository import SQLiteHabitRepository
 
 # THIS is what app.py imports
 router = APIRouter(prefix="/habits", tags=["habits"])
 
-habit_repository = SQLiteHabitRepository()
-habit_service = HabitService(habit_repository)
+
+# Ruff B008: use module-level singletons for Query defaults
+MAX_DEPTH_QUERY = Query(
+    None,
+    ge=0,
+    description="Levels of sub-habits to include (0 = the habit only); omit for all.",
+)
+CATEGORY_QUERY = Query(None, description="Only habits of this category.")
+TYPE_QUERY = Query(None, alias="type", description="Only habits of this type.")
+PARENT_ID_QUERY = Query(None, description="Only direct sub-habits of this habit.")
+HAS_GOAL_QUERY = Query(None, description="Only habits with (true) or without a goal.")
+SEARCH_QUERY = Query(
+    ...,
+    min_length=1,
+    description="Words to find in habit names and descriptions; "
+    "the last one may be a prefix.",
+)
+
+
+def habit_filter(
+    category: str | None = CATEGORY_QUERY,
+    type_: HabitType | None = TYPE_QUERY,
+    parent_id: UUID | None = PARENT_ID_QUERY,
+    has_goal: bool | None = HAS_GOAL_QUERY,
+) -> HabitFilter:
+    return HabitFilter(
+        category=category, type=type_, parent_id=parent_id, has_goal=has_goal
+    )
+
+
+HABIT_FILTER = Depends(habit_filter)
+
+
+def _service(uow: UnitOfWork) -> HabitService:
+    return HabitService(uow.habits)
 
 
 @router.post(
@@ -26,9 +73,9 @@ habit_service = HabitService(habit_repository)
     response_model=HabitResponse,
     responses={400: {"model": ErrorResponse}},
 )
-def create_habit(body: HabitCreate) -> HabitResponse:
+def create_habit(body: HabitCreate, uow: UnitOfWork = WRITE_UOW) -> HabitResponse:
     try:
-        habit = habit_service.create_habit(
+        habit = _service(uow).create_habit(
             name=body.name,
             description=body.description,
             category=body.category,
@@ -39,72 +86,74 @@ def create_habit(body: HabitCreate) -> HabitResponse:
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    return HabitResponse(
-        id=habit.id,
-        name=habit.name,
-        description=habit.description,
-        category=habit.category,
-        type=habit.type,
-        goal=habit.goal,
-        created_at=habit.created_at,
-        parent_id=habit.parent_id,
-    )
+    return HabitResponse.from_entity(habit)
 
 
 @router.get(
     "",
     response_model=HabitListResponse,
+    responses={304: {"description": "Not Modified"}},
 )
-def list_habits() -> HabitListResponse:
-    habits = habit_service.list_habits()
-    return HabitListResponse(
-        habits=[
-            HabitResponse(
-                id=h.id,
-                name=h.name,
-                description=h.description,
-                category=h.category,
-                type=h.type,
-                goal=h.goal,
-                created_at=h.created_at,
-                parent_id=h.parent_id,
-            )
-            for h in habits
-        ]
+def list_habits(
+    request: Request,
+    response: Response,
+    limit: int = LIMIT_QUERY,
+    cursor: str | None = CURSOR_QUERY,
+    filters: HabitFilter = HABIT_FILTER,
+    uow: UnitOfWork = READ_UOW,
+) -> HabitListResponse | Response:
+    unchanged = not_modified(request, response, uow.changes.get_habits_version())
+    if unchanged is not None:
+        return unchanged
+
+    page = _service(uow).list_habits_page(limit, decode_habit_cursor(cursor), filters)
+    # same JSON as HabitListResponse, without a model per habit
+    return json_response(
+        {"habits": page.items, "next_cursor": encode_habit_cursor(page.next_key)},
+        response.headers,
     )
 
 
+# before /{habit_id}, which would take "search" for an id
+@router.get(
+    "/search",
+    response_model=HabitSearchResponse,
+)
+def search_habits(
+    q: str = SEARCH_QUERY,
+    limit: int = LIMIT_QUERY,
+    uow: UnitOfWork = READ_UOW,
+) -> HabitSearchResponse | Response:
+    habits = _service(uow).search_habits(q, limit)
+    return json_response({"habits": habits}, {})
+
+
 @router.get(
     "/{habit_id}",
     response_model=HabitResponse,
     responses={404: {"model": ErrorResponse}},
 )
-def get_habit(habit_id: UUID) -> HabitResponse:
+def get_habit(habit_id: UUID, uow: UnitOfWork = READ_UOW) -> HabitResponse:
     try:
-        habit = habit_service.get_habit(habit_id)
+        habit = _service(uow).get_habit(habit_id)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
-    return HabitResponse(
-        id=habit.id,
-        name=habit.name,
-        description=habit.description,
-        category=habit.category,
-        type=habit.type,
-        goal=habit.goal,
-        created_at=habit.created_at,
-        parent_id=habit.parent_id,
-    )
+    return HabitResponse.from_entity(habit)
 
 
 @router.put(
     "/{habit_id}",
     response_model=HabitResponse,
-    responses={404: {"model": ErrorResponse}},
+    responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}},
 )
-def update_habit(habit_id: UUID, body: HabitUpdate) -> HabitResponse:
+def update_habit(
+    habit_id: UUID,
+    body: HabitUpdate,
+    uow: UnitOfWork = WRITE_UOW,
+) -> HabitResponse:
     try:
-        habit = habit_service.update_habit(
+        habit = _service(uow).update_habit(
             habit_id=habit_id,
             name=body.name,
             description=body.description,
@@ -113,18 +162,10 @@ def update_habit(habit_id: UUID, body: HabitUpdate) -> HabitResponse:
             parent_id=body.parent_id,
         )
     except ValueError as exc:
-        raise HTTPException(status_code=404, detail=str(exc)) from exc
+        # unknown habit or parent -> 404, reparenting into a loop -> 400
+        raise_http_error(exc)
 
-    return HabitResponse(
-        id=habit.id,
-        name=habit.name,
-        description=habit.description,
-        category=habit.category,
-        type=habit.type,
-        goal=habit.goal,
-        created_at=habit.created_at,
-        parent_id=habit.parent_id,
-    )
+    return HabitResponse.from_entity(habit)
 
 
 @router.delete(
@@ -132,9 +173,9 @@ def update_habit(habit_id: UUID, body: HabitUpdate) -> HabitResponse:
     status_code=200,
     responses={404: {"model": ErrorResponse}},
 )
-def delete_habit(habit_id: UUID) -> dict[str, str]:
+def delete_habit(habit_id: UUID, uow: UnitOfWork = WRITE_UOW) -> dict[str, str]:
     try:
-        habit_service.delete_habit(habit_id)
+        _service(uow).delete_habit(habit_id)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
@@ -146,9 +187,13 @@ def delete_habit(habit_id: UUID) -> dict[str, str]:
     response_model=HabitResponse,
     responses={404: {"model": ErrorResponse}, 400: {"model": ErrorResponse}},
 )
-def create_subhabit(habit_id: UUID, body: HabitCreate) -> HabitResponse:
+def create_subhabit(
+    habit_id: UUID,
+    body: HabitCreate,
+    uow: UnitOfWork = WRITE_UOW,
+) -> HabitResponse:
     try:
-        habit = habit_service.create_subhabit(
+        habit = _service(uow).create_subhabit(
             parent_id=habit_id,
             name=body.name,
             description=body.description,
@@ -159,13 +204,22 @@ def create_subhabit(habit_id: UUID, body: HabitCreate) -> HabitResponse:
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
-    return HabitResponse(
-        id=habit.id,
-        name=habit.name,
-        description=habit.description,
-        category=habit.category,
-        type=habit.type,
-        goal=habit.goal,
-        created_at=habit.created_at,
-        parent_id=habit.parent_id,
-    )
+    return HabitResponse.from_entity(habit)
+
+
+@router.get(
+    "/{habit_id}/tree",
+    response_model=HabitTreeResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+def get_habit_tree(
+    habit_id: UUID,
+    max_depth: int | None = MAX_DEPTH_QUERY,
+    uow: UnitOfWork = READ_UOW,
+) -> HabitTreeResponse:
+    try:
+        tree = _service(uow).get_tree(habit_id, max_depth)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    return HabitTreeResponse.from_tree(tree)
@@ -0,0 +1,51 @@
+# src/api/routes/metrics_route.py
+
+from dataclasses import asdict
+
+from fastapi import APIRouter
+
+from src.api.models.metrics import (
+    CacheStatsResponse,
+    CalendarCacheStatsResponse,
+    GroupCommitStatsResponse,
+    MetricsResponse,
+    PoolStatsResponse,
+    ShardStatsResponse,
+)
+from src.infra.async_database import async_pool_stats
+from src.infra.calendar_cache import calendar_cache_stats
+from src.infra.database import pool_stats, shard_stats
+from src.infra.group_commit import group_commit_stats
+from src.infra.repositories.cached_habit_repository import habit_cache_stats
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get(
+    "",
+    response_model=MetricsResponse,
+)
+def get_metrics() -> MetricsResponse:
+    async_stats = async_pool_stats()
+    cache_stats = habit_cache_stats()
+    calendar_stats = calendar_cache_stats()
+    commit_stats = group_commit_stats()
+    return MetricsResponse(
+        db_pool=PoolStatsResponse(**asdict(pool_stats())),
+        db_read_pool=PoolStatsResponse(**asdict(pool_stats(read_only=True))),
+        async_db_pool=(
+            PoolStatsResponse(**asdict(async_stats)) if async_stats else None
+        ),
+        habit_cache=(
+            CacheStatsResponse(**asdict(cache_stats)) if cache_stats else None
+        ),
+        calendar_cache=(
+            CalendarCacheStatsResponse(**asdict(calendar_stats))
+            if calendar_stats
+            else None
+        ),
+        group_commit=(
+            GroupCommitStatsResponse(**asdict(commit_stats)) if commit_stats else None
+        ),
+        shards=ShardStatsResponse(**asdict(shard_stats())),
+    )
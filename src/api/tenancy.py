@@ -0,0 +1,48 @@
+# src/api/tenancy.py
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.infra.config import get_settings
+from src.infra.database import shard_exists
+from src.infra.tenancy import is_valid_tenant, use_tenant
+
+# requests that never create a tenant's database
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class TenantMiddleware:
+    """
+    Serve each request from the database of the tenant named in the
+    HABIT_TENANT_HEADER header (see src/infra/tenancy.py).
+
+    A plain ASGI middleware, so the tenant is set in the context the
+    endpoint, its dependencies and its threadpool calls all inherit.
+
+    A tenant's database is created by its first write. Reads of a tenant
+    without one are answered with 404 and create no file, so made-up
+    tenant ids cannot fill the disk (or the shard cache) with databases.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        header = get_settings().tenant_header
+        if scope["type"] != "http" or not header:
+            await self.app(scope, receive, send)
+            return
+
+        tenant = Headers(scope=scope).get(header)
+        if tenant is not None and not is_valid_tenant(tenant):
+            response = JSONResponse({"detail": "Invalid tenant id"}, status_code=400)
+            await response(scope, receive, send)
+            return
+        if scope["method"] in READ_METHODS and not shard_exists(tenant):
+            response = JSONResponse({"detail": "Unknown tenant"}, status_code=404)
+            await response(scope, receive, send)
+            return
+
+        with use_tenant(tenant):
+            await self.app(scope, receive, send)
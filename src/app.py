@@ -1,24 +1,73 @@
 # src/app.py
 
-from fastapi import FastAPI
+from fastapi import APIRouter, FastAPI
 
-from src.api.routes.habit_logs_route import router as habit_logs_router
-from src.api.routes.habit_stats_route import router as habit_stats_router
-from src.api.routes.habits_route import router as habits_router
-from src.infra.database import init_db
-
-app = FastAPI(
-    title="Smart Habit Tracker API",
-    version="1.0.0",
+from src.api.routes import (
+    async_habit_logs_route,
+    async_habit_stats_route,
+    async_habits_route,
+    habit_analytics_route,
+    habit_log_export_route,
+    habit_logs_route,
+    habit_stats_route,
+    habits_route,
+    metrics_route,
 )
+from src.api.tenancy import TenantMiddleware
+from src.infra.async_database import close_async_db
+from src.infra.config import get_settings
+from src.infra.database import close_db, init_db
+from src.infra.group_commit import close_group_commit_writer
+
+# stats first: GET /habits/stats must not be captured by GET /habits/{habit_id}
+ROUTERS: dict[str, list[APIRouter]] = {
+    "sync": [
+        habit_stats_route.router,
+        habits_route.router,
+        habit_logs_route.router,
+    ],
+    # aiosqlite on the event loop instead of sqlite3 in the threadpool
+    "async": [
+        async_habit_stats_route.router,
+        async_habits_route.router,
+        async_habit_logs_route.router,
+    ],
+}
+
+
+def create_app(backend: str) -> FastAPI:
+    """Build the API with the given database backend ("sync" or "async")."""
+    if backend not in ROUTERS:
+        raise ValueError(f"Unknown backend {backend!r}")
+
+    app = FastAPI(
+        title="Smart Habit Tracker API",
+        version="1.0.0",
+    )
+
+    @app.on_event("startup")
+    def startup() -> None:
+        """Apply migrations, unless src/main.py already did before starting workers."""
+        if not get_settings().db_ready:
+            init_db()
+
+    @app.on_event("shutdown")
+    async def shutdown() -> None:
+        # queued log inserts are committed before the pools close
+        close_group_commit_writer()
+        await close_async_db()
+        close_db()
 
+    app.add_middleware(TenantMiddleware)
 
-@app.on_event("startup")
-def startup() -> None:
-    """Create tables if they don't exist (habits, habit_logs)."""
-    init_db()
+    for router in ROUTERS[backend]:
+        app.include_router(router)
+    # export streams from a sync cursor in both modes; analytics is
+    # CPU-bound NumPy work, which belongs in the threadpool either way
+    app.include_router(habit_log_export_route.router)
+    app.include_router(habit_analytics_route.router)
+    app.include_router(metrics_route.router)
+    return app
 
 
-app.include_router(habits_router)
-app.include_router(habit_logs_router)
-app.include_router(habit_stats_router)
+app = create_app(get_settings().backend)
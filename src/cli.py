@@ -0,0 +1,86 @@
+# src/cli.py
+
+import sqlite3
+from uuid import UUID
+
+import typer
+
+from src.infra.database import DB_PATH, close_db, get_db, init_db
+from src.infra.materialized_stats import rebuild_stats
+from src.infra.rollups import rebuild_rollups
+from src.infra.storage_format import (
+    STORAGE_FORMATS,
+    convert_storage,
+    get_storage_format,
+)
+
+app = typer.Typer(help="Maintenance commands for the Habit Tracker database.")
+
+
+@app.command()
+def migrate() -> None:
+    """Apply pending schema migrations."""
+    init_db()
+    typer.echo("Database schema is up to date.")
+
+
+@app.command("rebuild-stats")
+def rebuild_stats_command(
+    habit_id: str | None = typer.Option(
+        None,
+        help="Only rebuild this habit (default: all habits).",
+    ),
+) -> None:
+    """Recompute the materialized habit_stats table from habit_logs."""
+    init_db()
+    with get_db() as db:
+        count = rebuild_stats(db, UUID(habit_id) if habit_id else None)
+        db.commit()
+    typer.echo(f"Rebuilt stats for {count} habit(s).")
+
+
+@app.command("rebuild-rollups")
+def rebuild_rollups_command(
+    habit_id: str | None = typer.Option(
+        None,
+        help="Only rebuild this habit (default: all habits).",
+    ),
+) -> None:
+    """Recompute the day/week/month habit_log_rollups from habit_logs."""
+    init_db()
+    with get_db() as db:
+        count = rebuild_rollups(db, UUID(habit_id) if habit_id else None)
+        db.commit()
+    typer.echo(f"Rebuilt {count} rollup(s).")
+
+
+@app.command("convert-storage")
+def convert_storage_command(
+    target: str = typer.Argument(
+        ...,
+        help=f"Storage format: {' | '.join(STORAGE_FORMATS)}.",
+    ),
+    vacuum: bool = typer.Option(
+        False,
+        help="Run VACUUM afterwards to return the freed pages to the OS.",
+    ),
+) -> None:
+    """Rewrite ids and dates into another storage format."""
+    fmt = get_storage_format(target)
+    init_db()
+    close_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        changed = convert_storage(conn, fmt)
+        if changed and vacuum:
+            conn.execute("VACUUM;")
+    finally:
+        conn.close()
+    if changed:
+        typer.echo(f"Converted the database to the {fmt.name} format.")
+    else:
+        typer.echo(f"Database already uses the {fmt.name} format.")
+
+
+if __name__ == "__main__":
+    app()
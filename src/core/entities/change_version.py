@@ -0,0 +1,16 @@
+# src/core/entities/change_version.py
+
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class ChangeVersion:
+    """
+    Change counter of a habit (or of the habit list).
+    - version:     bumped by every write that changes what is read
+    - modified_at: time of that write (UTC, millisecond precision)
+    """
+
+    version: int
+    modified_at: datetime
@@ -12,6 +12,7 @@ class HabitType(str, Enum):
     - boolean: done / not done (store 0 or 1 in logs)
     - numeric: quantity (pages, minutes, glasses, etc.)
     """
+
     BOOLEAN = "boolean"
     NUMERIC = "numeric"
 
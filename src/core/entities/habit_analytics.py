@@ -0,0 +1,31 @@
+# src/core/entities/habit_analytics.py
+
+from dataclasses import dataclass
+from datetime import date
+from uuid import UUID
+
+
+@dataclass
+class HabitAnalytics:
+    """
+    Trend metrics for a single habit, over the logs up to `as_of`.
+    - rolling_7d / rolling_30d: sum of values in the last 7 / 30 days
+    - week_over_week: rolling_7d minus the sum of the 7 days before
+    - longest_streak / current_streak: runs of consecutive days with logs;
+      the current one ends at the latest log and, as in HabitStats, stops
+      at the latest day with more than one log (the longest one does not)
+    - completion_rate: share of days since the first log whose total
+      reached the goal (1 for boolean habits); None without a goal
+    """
+
+    habit_id: UUID
+    as_of: date
+    log_count: int
+    active_days: int
+    total: float
+    rolling_7d: float
+    rolling_30d: float
+    week_over_week: float
+    longest_streak: int
+    current_streak: int
+    completion_rate: float | None
@@ -0,0 +1,24 @@
+# src/core/entities/habit_calendar.py
+
+from dataclasses import dataclass
+from uuid import UUID
+
+from src.core.entities.habit import HabitType
+
+
+@dataclass(frozen=True)
+class HabitCalendar:
+    """
+    One year of a habit's logs, one entry per day starting on January 1st.
+    - totals: sum of the day's logs, 0.0 for days without logs
+    """
+
+    habit_id: UUID
+    type: HabitType
+    year: int
+    totals: list[float]
+
+    @property
+    def done(self) -> list[bool]:
+        """Per day: was the (boolean) habit done."""
+        return [total > 0 for total in self.totals]
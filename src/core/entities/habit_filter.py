@@ -0,0 +1,22 @@
+# src/core/entities/habit_filter.py
+
+from dataclasses import dataclass
+from uuid import UUID
+
+from src.core.entities.habit import HabitType
+
+
+@dataclass(frozen=True)
+class HabitFilter:
+    """
+    Conditions a habit listing is narrowed by; None means "any".
+    - category:  habits of this category (exact match)
+    - type:      boolean or numeric habits
+    - parent_id: direct sub-habits of this habit
+    - has_goal:  habits with (True) or without (False) a goal
+    """
+
+    category: str | None = None
+    type: HabitType | None = None
+    parent_id: UUID | None = None
+    has_goal: bool | None = None
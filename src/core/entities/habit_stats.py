@@ -17,3 +17,23 @@ class HabitStats:
     total: float
     current_streak: int
     average: float
+
+
+@dataclass
+class SubtreeStats:
+    """
+    Statistics of a routine: a habit together with all of its sub-habits.
+    - total / average: over the logs of every habit in the subtree
+    - any_streak: consecutive days on which at least one sub-habit was logged
+    - all_streak: consecutive days on which every sub-habit was logged
+      Both count back from the latest such day; a habit without sub-habits
+      is its routine's only member.
+    - habits: per-habit breakdown, including the habit itself
+    """
+
+    habit_id: UUID
+    total: float
+    average: float
+    any_streak: int
+    all_streak: int
+    habits: list[HabitStats]
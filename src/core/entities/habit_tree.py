@@ -0,0 +1,17 @@
+# src/core/entities/habit_tree.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from src.core.entities.habit import Habit
+
+
+@dataclass
+class HabitTree:
+    """
+    A habit with its sub-habits, recursively (a routine).
+    """
+
+    habit: Habit
+    children: list[HabitTree] = field(default_factory=list)
@@ -0,0 +1,42 @@
+# src/core/entities/log_rollup.py
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from enum import StrEnum
+from uuid import UUID
+
+
+class RollupBucket(StrEnum):
+    """
+    Resolution of a rollup:
+    - day:   one calendar day
+    - week:  ISO week, starting on Monday
+    - month: calendar month
+    """
+
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+    def start_of(self, day: date) -> date:
+        """First day of the bucket containing `day`."""
+        if self is RollupBucket.WEEK:
+            return day - timedelta(days=day.weekday())
+        if self is RollupBucket.MONTH:
+            return day.replace(day=1)
+        return day
+
+
+@dataclass
+class LogRollup:
+    """
+    Aggregate of a habit's logs within one bucket starting at `start`.
+    """
+
+    habit_id: UUID
+    bucket: RollupBucket
+    start: date
+    total: float
+    log_count: int
+    min_value: float
+    max_value: float
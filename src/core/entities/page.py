@@ -0,0 +1,30 @@
+# src/core/entities/page.py
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass
+class Page[T, K]:
+    """
+    One page of a keyset-paginated listing.
+    - items:    entities of this page, in listing order
+    - next_key: sort key of the last item if more items follow, else None
+    """
+
+    items: list[T]
+    next_key: K | None
+
+    @classmethod
+    def from_overfetch(
+        cls,
+        rows: list[T],
+        limit: int,
+        key: Callable[[T], K],
+    ) -> Page[T, K]:
+        """Build a page from `limit + 1` fetched rows; the extra row means more."""
+        if len(rows) <= limit:
+            return cls(items=rows, next_key=None)
+        return cls(items=rows[:limit], next_key=key(rows[limit - 1]))
@@ -0,0 +1,115 @@
+# src/core/interface/async_repositories.py
+
+from abc import ABC, abstractmethod
+from datetime import date
+from uuid import UUID
+
+from src.core.entities.change_version import ChangeVersion
+from src.core.entities.habit import Habit
+from src.core.entities.habit_filter import HabitFilter
+from src.core.entities.habit_log import HabitLog
+from src.core.entities.habit_stats import HabitStats, SubtreeStats
+from src.core.entities.log_rollup import LogRollup, RollupBucket
+from src.core.interface.repositories import HabitPageKey, LogPageKey, RollupPageKey
+
+
+class AsyncHabitRepository(ABC):
+    """
+    Async abstraction for persisting and retrieving Habit entities.
+    """
+
+    @abstractmethod
+    async def create(self, habit: Habit) -> None: ...
+
+    @abstractmethod
+    async def get_by_id(self, habit_id: UUID) -> Habit | None: ...
+
+    @abstractmethod
+    async def get_all(self) -> list[Habit]: ...
+
+    @abstractmethod
+    async def get_page(
+        self,
+        limit: int,
+        after: HabitPageKey | None = None,
+        filters: HabitFilter | None = None,
+    ) -> list[Habit]: ...
+
+    @abstractmethod
+    async def search(self, text: str, limit: int) -> list[Habit]: ...
+
+    @abstractmethod
+    async def update(self, habit: Habit) -> None: ...
+
+    @abstractmethod
+    async def delete(self, habit_id: UUID) -> None: ...
+
+    @abstractmethod
+    async def get_subtree(
+        self, habit_id: UUID, max_depth: int | None = None
+    ) -> list[Habit]: ...
+
+    @abstractmethod
+    async def is_descendant(self, habit_id: UUID, ancestor_id: UUID) -> bool: ...
+
+
+class AsyncHabitLogRepository(ABC):
+    """
+    Async abstraction for persisting and retrieving HabitLog entries.
+    """
+
+    @abstractmethod
+    async def create(self, log: HabitLog) -> None: ...
+
+    @abstractmethod
+    async def create_many(self, logs: list[HabitLog]) -> None: ...
+
+    @abstractmethod
+    async def list_page(
+        self,
+        habit_id: UUID,
+        limit: int,
+        after: LogPageKey | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> list[HabitLog]: ...
+
+    @abstractmethod
+    async def list_rollups(
+        self,
+        habit_id: UUID,
+        bucket: RollupBucket,
+        limit: int,
+        after: RollupPageKey | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> list[LogRollup]: ...
+
+
+class AsyncHabitStatsRepository(ABC):
+    """
+    Async abstraction for computing or retrieving statistics for a habit.
+    """
+
+    @abstractmethod
+    async def get_stats(self, habit_id: UUID) -> HabitStats: ...
+
+    @abstractmethod
+    async def get_stats_many(
+        self, habit_ids: list[UUID] | None = None
+    ) -> list[HabitStats]: ...
+
+    @abstractmethod
+    async def get_subtree_stats(self, habit_id: UUID) -> SubtreeStats: ...
+
+
+class AsyncChangeRepository(ABC):
+    """
+    Async abstraction for reading the change counters.
+    """
+
+    @abstractmethod
+    async def get_habit_version(self, habit_id: UUID) -> ChangeVersion | None: ...
+
+    @abstractmethod
+    async def get_habits_version(self) -> ChangeVersion: ...
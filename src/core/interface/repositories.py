@@ -1,12 +1,22 @@
 # src/core/interface/repositories.py
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from datetime import date
 from uuid import UUID
 
+from src.core.entities.change_version import ChangeVersion
 from src.core.entities.habit import Habit
+from src.core.entities.habit_analytics import HabitAnalytics
+from src.core.entities.habit_filter import HabitFilter
 from src.core.entities.habit_log import HabitLog
-from src.core.entities.habit_stats import HabitStats
+from src.core.entities.habit_stats import HabitStats, SubtreeStats
+from src.core.entities.log_rollup import LogRollup, RollupBucket
+
+# keyset pagination: sort key of the last item already returned
+HabitPageKey = tuple[date, str, UUID]  # (created_at, name, id)
+LogPageKey = tuple[date, UUID]  # (date, id)
+RollupPageKey = date  # bucket start
 
 
 class HabitRepository(ABC):
@@ -15,23 +25,49 @@ class HabitRepository(ABC):
     """
 
     @abstractmethod
-    def create(self, habit: Habit) -> None:
-        ...
+    def create(self, habit: Habit) -> None: ...
+
+    @abstractmethod
+    def get_by_id(self, habit_id: UUID) -> Habit | None: ...
 
     @abstractmethod
-    def get_by_id(self, habit_id: UUID) -> Habit | None:
+    def get_all(self) -> list[Habit]: ...
+
+    @abstractmethod
+    def get_page(
+        self,
+        limit: int,
+        after: HabitPageKey | None = None,
+        filters: HabitFilter | None = None,
+    ) -> list[Habit]:
+        """
+        Up to `limit` habits matching `filters`, ordered by
+        (created_at, name, id) after `after`.
+        """
         ...
 
     @abstractmethod
-    def get_all(self) -> list[Habit]:
+    def search(self, text: str, limit: int) -> list[Habit]:
+        """Up to `limit` habits whose name or description match `text`, best first."""
         ...
 
     @abstractmethod
-    def update(self, habit: Habit) -> None:
+    def update(self, habit: Habit) -> None: ...
+
+    @abstractmethod
+    def delete(self, habit_id: UUID) -> None: ...
+
+    @abstractmethod
+    def get_subtree(self, habit_id: UUID, max_depth: int | None = None) -> list[Habit]:
+        """
+        The habit and its descendants down to `max_depth` levels below it,
+        parents before children. Empty if the habit does not exist.
+        """
         ...
 
     @abstractmethod
-    def delete(self, habit_id: UUID) -> None:
+    def is_descendant(self, habit_id: UUID, ancestor_id: UUID) -> bool:
+        """True if `habit_id` is `ancestor_id` or lies below it."""
         ...
 
 
@@ -41,7 +77,11 @@ class HabitLogRepository(ABC):
     """
 
     @abstractmethod
-    def create(self, log: HabitLog) -> None:
+    def create(self, log: HabitLog) -> None: ...
+
+    @abstractmethod
+    def create_many(self, logs: list[HabitLog]) -> None:
+        """Persist all logs in a single transaction."""
         ...
 
     @abstractmethod
@@ -50,7 +90,45 @@ class HabitLogRepository(ABC):
         habit_id: UUID,
         start: date | None = None,
         end: date | None = None,
+    ) -> list[HabitLog]: ...
+
+    @abstractmethod
+    def list_page(
+        self,
+        habit_id: UUID,
+        limit: int,
+        after: LogPageKey | None = None,
+        start: date | None = None,
+        end: date | None = None,
     ) -> list[HabitLog]:
+        """Up to `limit` logs ordered by (date, id) after `after`."""
+        ...
+
+    @abstractmethod
+    def iter_for_habit(
+        self,
+        habit_id: UUID,
+        start: date | None = None,
+        end: date | None = None,
+        chunk_size: int = 500,
+    ) -> Iterator[HabitLog]:
+        """Like list_for_habit, but streams rows in chunks of `chunk_size`."""
+        ...
+
+    @abstractmethod
+    def list_rollups(
+        self,
+        habit_id: UUID,
+        bucket: RollupBucket,
+        limit: int,
+        after: RollupPageKey | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> list[LogRollup]:
+        """
+        Up to `limit` buckets ordered by start date after `after`; buckets
+        overlapping [start, end] qualify. Buckets without logs are omitted.
+        """
         ...
 
 
@@ -60,5 +138,48 @@ class HabitStatsRepository(ABC):
     """
 
     @abstractmethod
-    def get_stats(self, habit_id: UUID) -> HabitStats:
+    def get_stats(self, habit_id: UUID) -> HabitStats: ...
+
+    @abstractmethod
+    def get_stats_many(self, habit_ids: list[UUID] | None = None) -> list[HabitStats]:
+        """
+        Stats for the given habits (all habits if None).
+        Unknown ids are skipped.
+        """
+        ...
+
+    @abstractmethod
+    def get_subtree_stats(self, habit_id: UUID) -> SubtreeStats:
+        """
+        Combined stats of the habit and all of its sub-habits.
+        """
+        ...
+
+
+class HabitAnalyticsRepository(ABC):
+    """
+    Abstraction for computing trend metrics over a habit's logs.
+    """
+
+    @abstractmethod
+    def get_analytics(self, habit: Habit, as_of: date) -> HabitAnalytics:
+        """Metrics over the logs of `habit` dated on or before `as_of`."""
+        ...
+
+
+class ChangeRepository(ABC):
+    """
+    Abstraction for reading the change counters that every write bumps.
+    """
+
+    @abstractmethod
+    def get_habit_version(self, habit_id: UUID) -> ChangeVersion | None:
+        """
+        Bumped when the habit or its logs change; None for unknown habits.
+        """
+        ...
+
+    @abstractmethod
+    def get_habits_version(self) -> ChangeVersion:
+        """Bumped when any habit is created, updated or deleted."""
         ...
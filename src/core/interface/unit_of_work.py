@@ -0,0 +1,49 @@
+# src/core/interface/unit_of_work.py
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from types import TracebackType
+
+from src.core.interface.repositories import (
+    ChangeRepository,
+    HabitAnalyticsRepository,
+    HabitLogRepository,
+    HabitRepository,
+    HabitStatsRepository,
+)
+
+
+class UnitOfWork(ABC):
+    """
+    One transaction shared by every repository it hands out.
+
+    Used as a context manager: leaving the block commits, unless it is
+    left through an exception, which rolls everything back.
+    """
+
+    habits: HabitRepository
+    logs: HabitLogRepository
+    stats: HabitStatsRepository
+    analytics: HabitAnalyticsRepository
+    changes: ChangeRepository
+
+    def __enter__(self) -> UnitOfWork:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    @abstractmethod
+    def commit(self) -> None: ...
+
+    @abstractmethod
+    def rollback(self) -> None: ...
@@ -0,0 +1,31 @@
+# src/core/services/habit_analytics_service.py
+
+from datetime import date
+from uuid import UUID
+
+from src.core.entities.habit_analytics import HabitAnalytics
+from src.core.interface.repositories import HabitAnalyticsRepository, HabitRepository
+
+
+class HabitAnalyticsService:
+    """
+    Application service for trend metrics of a habit.
+    """
+
+    def __init__(
+        self,
+        analytics_repository: HabitAnalyticsRepository,
+        habit_repository: HabitRepository,
+    ) -> None:
+        self._analytics_repository = analytics_repository
+        self._habit_repository = habit_repository
+
+    def get_analytics(
+        self, habit_id: UUID, as_of: date | None = None
+    ) -> HabitAnalytics:
+        # goal and type of the habit decide the completion rate
+        habit = self._habit_repository.get_by_id(habit_id)
+        if habit is None:
+            raise ValueError("Habit not found")
+
+        return self._analytics_repository.get_analytics(habit, as_of or date.today())
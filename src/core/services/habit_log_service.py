@@ -1,11 +1,108 @@
 # src/core/services/habit_log_service.py
 
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from datetime import date
 from uuid import UUID, uuid4
 
-from src.core.entities.habit import HabitType
+from src.core.entities.habit import Habit, HabitType
+from src.core.entities.habit_calendar import HabitCalendar
 from src.core.entities.habit_log import HabitLog
-from src.core.interface.repositories import HabitLogRepository, HabitRepository
+from src.core.entities.log_rollup import LogRollup, RollupBucket
+from src.core.entities.page import Page
+from src.core.interface.async_repositories import (
+    AsyncHabitLogRepository,
+    AsyncHabitRepository,
+)
+from src.core.interface.repositories import (
+    HabitLogRepository,
+    HabitRepository,
+    LogPageKey,
+    RollupPageKey,
+)
+
+
+@dataclass
+class HabitLogError:
+    """
+    Rejected entry of a bulk request; `index` is its position in the batch.
+    """
+
+    index: int
+    message: str
+
+
+@dataclass
+class HabitLogBatchResult:
+    """
+    Outcome of a bulk request: stored logs and rejected entries.
+    """
+
+    created: list[HabitLog] = field(default_factory=list)
+    errors: list[HabitLogError] = field(default_factory=list)
+
+
+def _ensure_found(habit: Habit | None) -> Habit:
+    if habit is None:
+        raise ValueError("Habit not found")
+    return habit
+
+
+def _validate_value(habit: Habit, value: float) -> None:
+    # type-specific validation
+    if habit.type == HabitType.BOOLEAN and value not in (0.0, 1.0):
+        raise ValueError("Boolean habits must have value 0 or 1")
+
+
+def _new_log(habit: Habit, log_date: date, value: float) -> HabitLog:
+    _validate_value(habit, value)
+    return HabitLog(
+        id=uuid4(),
+        habit_id=habit.id,
+        date=log_date,
+        value=value,
+    )
+
+
+def _check_batch_size(entries: list[tuple[date, float]], max_batch_size: int) -> None:
+    if len(entries) > max_batch_size:
+        raise ValueError(f"Batch exceeds the limit of {max_batch_size} logs")
+
+
+def _build_batch(
+    habit: Habit, entries: list[tuple[date, float]]
+) -> HabitLogBatchResult:
+    result = HabitLogBatchResult()
+    for index, (log_date, value) in enumerate(entries):
+        try:
+            result.created.append(_new_log(habit, log_date, value))
+        except ValueError as exc:
+            result.errors.append(HabitLogError(index=index, message=str(exc)))
+    return result
+
+
+def _page_key(log: HabitLog) -> LogPageKey:
+    return log.date, log.id
+
+
+def _rollup_page_key(rollup: LogRollup) -> RollupPageKey:
+    return rollup.start
+
+
+def _year_range(year: int) -> tuple[date, date]:
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+# a leap year has 366 daily rollups at most
+DAYS_PER_YEAR = 366
+
+
+def _build_calendar(habit: Habit, year: int, days: list[LogRollup]) -> HabitCalendar:
+    first, last = _year_range(year)
+    totals = [0.0] * ((last - first).days + 1)
+    for rollup in days:
+        totals[(rollup.start - first).days] = rollup.total
+    return HabitCalendar(habit_id=habit.id, type=habit.type, year=year, totals=totals)
 
 
 class HabitLogService:
@@ -17,9 +114,11 @@ class HabitLogService:
         self,
         log_repository: HabitLogRepository,
         habit_repository: HabitRepository,
+        max_batch_size: int = 1_000,
     ) -> None:
         self._log_repository = log_repository
         self._habit_repository = habit_repository
+        self._max_batch_size = max_batch_size
 
     def add_log(
         self,
@@ -27,33 +126,163 @@ class HabitLogService:
         log_date: date,
         value: float,
     ) -> HabitLog:
-        # ensure habit exists
-        habit = self._habit_repository.get_by_id(habit_id)
-        if habit is None:
-            raise ValueError("Habit not found")
-
-        # type-specific validation
-        if habit.type == HabitType.BOOLEAN and value not in (0.0, 1.0):
-            raise ValueError("Boolean habits must have value 0 or 1")
-
-        log = HabitLog(
-            id=uuid4(),
-            habit_id=habit_id,
-            date=log_date,
-            value=value,
-        )
+        log = _new_log(self._get_habit(habit_id), log_date, value)
         self._log_repository.create(log)
         return log
 
+    def add_logs(
+        self,
+        habit_id: UUID,
+        entries: list[tuple[date, float]],
+    ) -> HabitLogBatchResult:
+        """
+        Store every valid (date, value) entry in one transaction.
+        Invalid entries are reported instead of failing the whole batch.
+        """
+        _check_batch_size(entries, self._max_batch_size)
+
+        # the habit is looked up once for the whole batch
+        result = _build_batch(self._get_habit(habit_id), entries)
+        if result.created:
+            self._log_repository.create_many(result.created)
+        return result
+
     def list_logs(
         self,
         habit_id: UUID,
         start: date | None = None,
         end: date | None = None,
     ) -> list[HabitLog]:
-        # ensure habit exists
-        habit = self._habit_repository.get_by_id(habit_id)
-        if habit is None:
-            raise ValueError("Habit not found")
-
+        self._get_habit(habit_id)
         return self._log_repository.list_for_habit(habit_id, start, end)
+
+    def list_logs_page(
+        self,
+        habit_id: UUID,
+        limit: int,
+        after: LogPageKey | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> Page[HabitLog, LogPageKey]:
+        self._get_habit(habit_id)
+        logs = self._log_repository.list_page(habit_id, limit + 1, after, start, end)
+        return Page.from_overfetch(logs, limit, _page_key)
+
+    def list_rollups_page(
+        self,
+        habit_id: UUID,
+        bucket: RollupBucket,
+        limit: int,
+        after: RollupPageKey | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> Page[LogRollup, RollupPageKey]:
+        """Logs summed per day, week or month, from the rollup table."""
+        self._get_habit(habit_id)
+        rollups = self._log_repository.list_rollups(
+            habit_id, bucket, limit + 1, after, start, end
+        )
+        return Page.from_overfetch(rollups, limit, _rollup_page_key)
+
+    def get_calendar(self, habit_id: UUID, year: int) -> HabitCalendar:
+        """
+        The habit's daily totals for `year`, read from the daily rollups
+        in one range scan instead of from every log.
+        """
+        habit = self._get_habit(habit_id)
+        first, last = _year_range(year)
+        days = self._log_repository.list_rollups(
+            habit_id, RollupBucket.DAY, DAYS_PER_YEAR, start=first, end=last
+        )
+        return _build_calendar(habit, year, days)
+
+    def export_logs(
+        self,
+        habit_id: UUID,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> Iterator[HabitLog]:
+        # checked eagerly, before the caller starts consuming the stream
+        self._get_habit(habit_id)
+        return self._log_repository.iter_for_habit(habit_id, start, end)
+
+    def _get_habit(self, habit_id: UUID) -> Habit:
+        return _ensure_found(self._habit_repository.get_by_id(habit_id))
+
+
+class AsyncHabitLogService:
+    """
+    HabitLogService counterpart for async repositories.
+    """
+
+    def __init__(
+        self,
+        log_repository: AsyncHabitLogRepository,
+        habit_repository: AsyncHabitRepository,
+        max_batch_size: int = 1_000,
+    ) -> None:
+        self._log_repository = log_repository
+        self._habit_repository = habit_repository
+        self._max_batch_size = max_batch_size
+
+    async def add_log(
+        self,
+        habit_id: UUID,
+        log_date: date,
+        value: float,
+    ) -> HabitLog:
+        log = _new_log(await self._get_habit(habit_id), log_date, value)
+        await self._log_repository.create(log)
+        return log
+
+    async def add_logs(
+        self,
+        habit_id: UUID,
+        entries: list[tuple[date, float]],
+    ) -> HabitLogBatchResult:
+        _check_batch_size(entries, self._max_batch_size)
+
+        result = _build_batch(await self._get_habit(habit_id), entries)
+        if result.created:
+            await self._log_repository.create_many(result.created)
+        return result
+
+    async def list_logs_page(
+        self,
+        habit_id: UUID,
+        limit: int,
+        after: LogPageKey | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> Page[HabitLog, LogPageKey]:
+        await self._get_habit(habit_id)
+        logs = await self._log_repository.list_page(
+            habit_id, limit + 1, after, start, end
+        )
+        return Page.from_overfetch(logs, limit, _page_key)
+
+    async def list_rollups_page(
+        self,
+        habit_id: UUID,
+        bucket: RollupBucket,
+        limit: int,
+        after: RollupPageKey | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> Page[LogRollup, RollupPageKey]:
+        await self._get_habit(habit_id)
+        rollups = await self._log_repository.list_rollups(
+            habit_id, bucket, limit + 1, after, start, end
+        )
+        return Page.from_overfetch(rollups, limit, _rollup_page_key)
+
+    async def get_calendar(self, habit_id: UUID, year: int) -> HabitCalendar:
+        habit = await self._get_habit(habit_id)
+        first, last = _year_range(year)
+        days = await self._log_repository.list_rollups(
+            habit_id, RollupBucket.DAY, DAYS_PER_YEAR, start=first, end=last
+        )
+        return _build_calendar(habit, year, days)
+
+    async def _get_habit(self, habit_id: UUID) -> Habit:
+        return _ensure_found(await self._habit_repository.get_by_id(habit_id))
@@ -4,7 +4,77 @@ from datetime import date
 from uuid import UUID, uuid4
 
 from src.core.entities.habit import Habit, HabitType
-from src.core.interface.repositories import HabitRepository
+from src.core.entities.habit_filter import HabitFilter
+from src.core.entities.habit_tree import HabitTree
+from src.core.entities.page import Page
+from src.core.interface.async_repositories import AsyncHabitRepository
+from src.core.interface.repositories import HabitPageKey, HabitRepository
+
+
+def _new_habit(
+    name: str,
+    description: str,
+    category: str,
+    type_: HabitType,
+    goal: float | None,
+    parent_id: UUID | None,
+) -> Habit:
+    return Habit(
+        id=uuid4(),
+        name=name,
+        description=description,
+        category=category,
+        type=type_,
+        goal=goal,
+        created_at=date.today(),
+        parent_id=parent_id,
+    )
+
+
+def _apply_update(
+    habit: Habit,
+    name: str | None,
+    description: str | None,
+    category: str | None,
+    goal: float | None,
+    parent_id: UUID | None,
+) -> None:
+    if name is not None:
+        habit.name = name
+    if description is not None:
+        habit.description = description
+    if category is not None:
+        habit.category = category
+    if goal is not None:
+        habit.goal = goal
+    if parent_id is not None:
+        habit.parent_id = parent_id
+
+
+def _page_key(habit: Habit) -> HabitPageKey:
+    return habit.created_at, habit.name, habit.id
+
+
+def _ensure_not_below_itself(is_descendant: bool) -> None:
+    # the new parent lies in the habit's own subtree: that would be a loop
+    if is_descendant:
+        raise ValueError("Habit cannot be moved below itself")
+
+
+def _ensure_parent_found(parent: Habit | None) -> None:
+    if parent is None:
+        raise ValueError("Parent habit not found")
+
+
+def _build_tree(subtree: list[Habit]) -> HabitTree:
+    """Nest a parents-first subtree listing under its first habit."""
+    if not subtree:
+        raise ValueError("Habit not found")
+    # keyed by UUID | None so that parent_id can index it directly
+    nodes: dict[UUID | None, HabitTree] = {h.id: HabitTree(h) for h in subtree}
+    for habit in subtree[1:]:
+        nodes[habit.parent_id].children.append(nodes[habit.id])
+    return nodes[subtree[0].id]
 
 
 class HabitService:
@@ -24,16 +94,7 @@ class HabitService:
         goal: float | None,
         parent_id: UUID | None = None,
     ) -> Habit:
-        habit = Habit(
-            id=uuid4(),
-            name=name,
-            description=description,
-            category=category,
-            type=type_,
-            goal=goal,
-            created_at=date.today(),
-            parent_id=parent_id,
-        )
+        habit = _new_habit(name, description, category, type_, goal, parent_id)
         self._habit_repository.create(habit)
         return habit
 
@@ -46,6 +107,19 @@ class HabitService:
     def list_habits(self) -> list[Habit]:
         return self._habit_repository.get_all()
 
+    def list_habits_page(
+        self,
+        limit: int,
+        after: HabitPageKey | None = None,
+        filters: HabitFilter | None = None,
+    ) -> Page[Habit, HabitPageKey]:
+        habits = self._habit_repository.get_page(limit + 1, after, filters)
+        return Page.from_overfetch(habits, limit, _page_key)
+
+    def search_habits(self, text: str, limit: int) -> list[Habit]:
+        """Habits whose name or description match `text`, best match first."""
+        return self._habit_repository.search(text, limit)
+
     def update_habit(
         self,
         habit_id: UUID,
@@ -56,21 +130,16 @@ class HabitService:
         parent_id: UUID | None = None,
     ) -> Habit:
         habit = self.get_habit(habit_id)
-
-        if name is not None:
-            habit.name = name
-        if description is not None:
-            habit.description = description
-        if category is not None:
-            habit.category = category
-        if goal is not None:
-            habit.goal = goal
-        if parent_id is not None:
-            habit.parent_id = parent_id
-
+        if parent_id is not None and parent_id != habit.parent_id:
+            self._check_new_parent(habit_id, parent_id)
+        _apply_update(habit, name, description, category, goal, parent_id)
         self._habit_repository.update(habit)
         return habit
 
+    def get_tree(self, habit_id: UUID, max_depth: int | None = None) -> HabitTree:
+        """The habit's routine: itself and its sub-habits, nested."""
+        return _build_tree(self._habit_repository.get_subtree(habit_id, max_depth))
+
     def delete_habit(self, habit_id: UUID) -> None:
         # ensure it exists first
         self.get_habit(habit_id)
@@ -96,3 +165,98 @@ class HabitService:
             goal=goal,
             parent_id=parent_id,
         )
+
+    def _check_new_parent(self, habit_id: UUID, parent_id: UUID) -> None:
+        _ensure_parent_found(self._habit_repository.get_by_id(parent_id))
+        _ensure_not_below_itself(
+            self._habit_repository.is_descendant(parent_id, habit_id)
+        )
+
+
+class AsyncHabitService:
+    """
+    HabitService counterpart for async repositories.
+    """
+
+    def __init__(self, habit_repository: AsyncHabitRepository) -> None:
+        self._habit_repository = habit_repository
+
+    async def create_habit(
+        self,
+        name: str,
+        description: str,
+        category: str,
+        type_: HabitType,
+        goal: float | None,
+        parent_id: UUID | None = None,
+    ) -> Habit:
+        habit = _new_habit(name, description, category, type_, goal, parent_id)
+        await self._habit_repository.create(habit)
+        return habit
+
+    async def get_habit(self, habit_id: UUID) -> Habit:
+        habit = await self._habit_repository.get_by_id(habit_id)
+        if habit is None:
+            raise ValueError("Habit not found")
+        return habit
+
+    async def list_habits_page(
+        self,
+        limit: int,
+        after: HabitPageKey | None = None,
+        filters: HabitFilter | None = None,
+    ) -> Page[Habit, HabitPageKey]:
+        habits = await self._habit_repository.get_page(limit + 1, after, filters)
+        return Page.from_overfetch(habits, limit, _page_key)
+
+    async def search_habits(self, text: str, limit: int) -> list[Habit]:
+        return await self._habit_repository.search(text, limit)
+
+    async def update_habit(
+        self,
+        habit_id: UUID,
+        name: str | None = None,
+        description: str | None = None,
+        category: str | None = None,
+        goal: float | None = None,
+        parent_id: UUID | None = None,
+    ) -> Habit:
+        habit = await self.get_habit(habit_id)
+        if parent_id is not None and parent_id != habit.parent_id:
+            await self._check_new_parent(habit_id, parent_id)
+        _apply_update(habit, name, description, category, goal, parent_id)
+        await self._habit_repository.update(habit)
+        return habit
+
+    async def get_tree(self, habit_id: UUID, max_depth: int | None = None) -> HabitTree:
+        subtree = await self._habit_repository.get_subtree(habit_id, max_depth)
+        return _build_tree(subtree)
+
+    async def delete_habit(self, habit_id: UUID) -> None:
+        await self.get_habit(habit_id)
+        await self._habit_repository.delete(habit_id)
+
+    async def create_subhabit(
+        self,
+        parent_id: UUID,
+        name: str,
+        description: str,
+        category: str,
+        type_: HabitType,
+        goal: float | None,
+    ) -> Habit:
+        await self.get_habit(parent_id)
+        return await self.create_habit(
+            name=name,
+            description=description,
+            category=category,
+            type_=type_,
+            goal=goal,
+            parent_id=parent_id,
+        )
+
+    async def _check_new_parent(self, habit_id: UUID, parent_id: UUID) -> None:
+        _ensure_parent_found(await self._habit_repository.get_by_id(parent_id))
+        _ensure_not_below_itself(
+            await self._habit_repository.is_descendant(parent_id, habit_id)
+        )
@@ -2,10 +2,24 @@
 
 from uuid import UUID
 
-from src.core.entities.habit_stats import HabitStats
+from src.core.entities.habit_stats import HabitStats, SubtreeStats
+from src.core.interface.async_repositories import (
+    AsyncHabitRepository,
+    AsyncHabitStatsRepository,
+)
 from src.core.interface.repositories import HabitRepository, HabitStatsRepository
 
 
+def _ensure_all_found(
+    habit_ids: list[UUID] | None,
+    stats: list[HabitStats],
+) -> list[HabitStats]:
+    # every requested habit must exist
+    if habit_ids is not None and len(stats) < len(set(habit_ids)):
+        raise ValueError("Habit not found")
+    return stats
+
+
 class HabitStatsService:
     """
     Application service for fetching statistics for a habit.
@@ -26,3 +40,42 @@ class HabitStatsService:
             raise ValueError("Habit not found")
 
         return self._stats_repository.get_stats(habit_id)
+
+    def get_subtree_stats(self, habit_id: UUID) -> SubtreeStats:
+        if self._habit_repository.get_by_id(habit_id) is None:
+            raise ValueError("Habit not found")
+        return self._stats_repository.get_subtree_stats(habit_id)
+
+    def get_stats_many(self, habit_ids: list[UUID] | None = None) -> list[HabitStats]:
+        stats = self._stats_repository.get_stats_many(habit_ids)
+        return _ensure_all_found(habit_ids, stats)
+
+
+class AsyncHabitStatsService:
+    """
+    HabitStatsService counterpart for async repositories.
+    """
+
+    def __init__(
+        self,
+        stats_repository: AsyncHabitStatsRepository,
+        habit_repository: AsyncHabitRepository,
+    ) -> None:
+        self._stats_repository = stats_repository
+        self._habit_repository = habit_repository
+
+    async def get_stats(self, habit_id: UUID) -> HabitStats:
+        if await self._habit_repository.get_by_id(habit_id) is None:
+            raise ValueError("Habit not found")
+        return await self._stats_repository.get_stats(habit_id)
+
+    async def get_subtree_stats(self, habit_id: UUID) -> SubtreeStats:
+        if await self._habit_repository.get_by_id(habit_id) is None:
+            raise ValueError("Habit not found")
+        return await self._stats_repository.get_subtree_stats(habit_id)
+
+    async def get_stats_many(
+        self, habit_ids: list[UUID] | None = None
+    ) -> list[HabitStats]:
+        stats = await self._stats_repository.get_stats_many(habit_ids)
+        return _ensure_all_found(habit_ids, stats)
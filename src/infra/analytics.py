@@ -0,0 +1,133 @@
+# src/infra/analytics.py
+
+"""
+Vectorized analytics over a habit's daily series.
+
+The logs are grouped per day inside SQLite and read from the cursor into
+contiguous NumPy arrays (days as int64 day numbers, totals as float64),
+so every metric is a handful of array operations instead of a Python
+loop over the rows.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import date
+from uuid import UUID
+
+import numpy as np
+import numpy.typing as npt
+
+from src.core.entities.habit import Habit, HabitType
+from src.core.entities.habit_analytics import HabitAnalytics
+from src.infra.storage_format import StorageFormat, epoch_day
+
+# one row per day, oldest first, answered from idx_habit_logs_page
+SELECT_DAILY_SERIES = """
+    SELECT {day_number} AS day,
+           SUM(value) AS total,
+           COUNT(*) AS log_count
+      FROM habit_logs
+     WHERE habit_id = ? AND date <= ?
+  GROUP BY date
+  ORDER BY date
+"""
+
+_ROW_DTYPE = np.dtype([("day", np.int64), ("total", np.float64), ("count", np.int64)])
+
+
+@dataclass(frozen=True)
+class DailySeries:
+    """Days with logs (ascending, unique), their summed values and log counts."""
+
+    days: npt.NDArray[np.int64]
+    totals: npt.NDArray[np.float64]
+    counts: npt.NDArray[np.int64]
+
+
+def load_daily_series(
+    db: sqlite3.Connection,
+    fmt: StorageFormat,
+    habit_id: UUID,
+    as_of: date,
+) -> DailySeries:
+    cursor = db.cursor()
+    # plain tuples: np.fromiter cannot unpack sqlite3.Row
+    cursor.row_factory = None
+    cursor.execute(
+        SELECT_DAILY_SERIES.format(day_number=fmt.day_number("date")),
+        (fmt.encode_uuid(habit_id), fmt.encode_day(as_of)),
+    )
+    try:
+        rows = np.fromiter(cursor, dtype=_ROW_DTYPE)
+    finally:
+        cursor.close()
+    return DailySeries(
+        days=np.ascontiguousarray(rows["day"]),
+        totals=np.ascontiguousarray(rows["total"]),
+        counts=np.ascontiguousarray(rows["count"]),
+    )
+
+
+def _goal(habit: Habit) -> float | None:
+    if habit.goal is not None:
+        return habit.goal
+    return 1.0 if habit.type == HabitType.BOOLEAN else None
+
+
+def _streaks(
+    days: npt.NDArray[np.int64], counts: npt.NDArray[np.int64]
+) -> tuple[int, int]:
+    """
+    (longest, current) runs of consecutive days. As in HabitStats, the
+    current run is cut at its latest day with more than one log.
+    """
+    if days.size == 0:
+        return 0, 0
+    # a run ends wherever the next day is not the day after
+    breaks = np.flatnonzero(np.diff(days) != 1)
+    starts = np.concatenate(([0], breaks + 1))
+    ends = np.concatenate((breaks, [days.size - 1]))
+    lengths = ends - starts + 1
+    current = int(lengths[-1])
+    repeated = np.flatnonzero(counts[starts[-1] :] > 1)
+    if repeated.size:
+        current -= int(repeated[-1])
+    return int(lengths.max()), current
+
+
+def compute_analytics(habit: Habit, series: DailySeries, as_of: date) -> HabitAnalytics:
+    days, totals = series.days, series.totals
+    today = epoch_day(as_of)
+
+    # cumulative[i] is the sum of the first i days, so the sum of the days
+    # in [start, as_of] is cumulative[-1] - cumulative[first index >= start]
+    cumulative = np.concatenate(([0.0], np.cumsum(totals)))
+    week, fortnight, month = np.searchsorted(days, [today - 6, today - 13, today - 29])
+    total = float(cumulative[-1])
+    rolling_7d = total - float(cumulative[week])
+    previous_7d = float(cumulative[week] - cumulative[fortnight])
+
+    longest, current = _streaks(days, series.counts)
+
+    goal = _goal(habit)
+    completion_rate: float | None = None
+    if goal is not None:
+        tracked_days = today - int(days[0]) + 1 if days.size else 0
+        met = int(np.count_nonzero(totals >= goal))
+        completion_rate = met / tracked_days if tracked_days else 0.0
+
+    return HabitAnalytics(
+        habit_id=habit.id,
+        as_of=as_of,
+        log_count=int(series.counts.sum()),
+        active_days=int(days.size),
+        total=total,
+        rolling_7d=rolling_7d,
+        rolling_30d=total - float(cumulative[month]),
+        week_over_week=rolling_7d - previous_7d,
+        longest_streak=longest,
+        current_streak=current,
+        completion_rate=completion_rate,
+    )
@@ -0,0 +1,112 @@
+# src/infra/async_database.py
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import aiosqlite
+
+from src.infra.config import get_settings
+from src.infra.database import open_shard
+from src.infra.pool import AsyncConnectionPool, PoolClosedError, PoolStats
+from src.infra.pragmas import get_pragma_profile
+from src.infra.tenancy import current_tenant
+
+# open pools by tenant (None: the default database), least recently used first
+_pools: OrderedDict[str | None, AsyncConnectionPool] = OrderedDict()
+_pool_lock = threading.Lock()
+
+
+async def _get_async_connection(path: Path) -> aiosqlite.Connection:
+    conn = await aiosqlite.connect(path)
+    conn.row_factory = sqlite3.Row
+    # same per-connection setup as the sync backend
+    await conn.execute("PRAGMA foreign_keys = ON;")
+    for statement in get_pragma_profile(get_settings().db_profile).statements():
+        await conn.execute(statement)
+    return conn
+
+
+def _forget_pool() -> None:
+    # see database._forget_pool; the child opens its own connections
+    global _pools, _pool_lock
+    _pools = OrderedDict()
+    _pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_pool)
+
+
+def _add_pool(
+    tenant: str | None, path: Path
+) -> tuple[AsyncConnectionPool, list[AsyncConnectionPool]]:
+    """Pool of `tenant` (opened unless another task did), and evicted pools."""
+    with _pool_lock:
+        pool = _pools.get(tenant)
+        if pool is not None:
+            return pool, []
+        settings = get_settings()
+        pool = _pools[tenant] = AsyncConnectionPool(
+            lambda: _get_async_connection(path),
+            size=settings.db_pool_size,
+            timeout=settings.db_pool_timeout,
+        )
+        # same bound as the sync shards; the default pool is never evicted
+        limit = max(settings.shard_cache_size, 1)
+        tenants = [key for key in _pools if key is not None]
+        return pool, [_pools.pop(key) for key in tenants[: len(tenants) - limit]]
+
+
+async def _get_pool() -> AsyncConnectionPool:
+    tenant = current_tenant()
+    with _pool_lock:
+        pool = _pools.get(tenant)
+        if pool is not None:
+            _pools.move_to_end(tenant)
+            return pool
+
+    # a new shard's schema is created in a thread, off the event loop
+    path = await asyncio.to_thread(open_shard, tenant)
+    pool, evicted = _add_pool(tenant, path)
+    for old in evicted:
+        await old.close()
+    return pool
+
+
+@asynccontextmanager
+async def get_async_db() -> AsyncGenerator[aiosqlite.Connection]:
+    """Borrow a pooled connection to the current tenant's database."""
+    while True:
+        pool = await _get_pool()
+        try:
+            conn = await pool.acquire()
+        except PoolClosedError:
+            # the pool was evicted in between: open it again
+            continue
+        break
+    try:
+        yield conn
+    finally:
+        await pool.release(conn)
+
+
+def async_pool_stats() -> PoolStats | None:
+    """Counters of the current tenant's aiosqlite pool, None until used."""
+    with _pool_lock:
+        pool = _pools.get(current_tenant())
+        return pool.stats() if pool is not None else None
+
+
+async def close_async_db() -> None:
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        await pool.close()
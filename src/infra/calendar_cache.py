@@ -0,0 +1,104 @@
+# src/infra/calendar_cache.py
+
+"""
+Cache of habit calendars (GET /habits/{id}/calendar), one per habit-year.
+
+Entries are not invalidated by the write paths. Each one records the
+habit's change version (see change_repository) it was built from, and
+is only served to a request that read the same version: any new log or
+habit update bumps the version, whichever process or tenant wrote it.
+The version's modified_at is compared too, as in the ETags of
+src/api/conditional.py: the counter starts again at 1 when a database
+is recreated (or a shard file replaced).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from uuid import UUID
+
+from src.core.entities.change_version import ChangeVersion
+from src.core.entities.habit_calendar import HabitCalendar
+from src.infra.config import get_settings
+from src.infra.tenancy import current_tenant
+
+
+@dataclass
+class CalendarCacheStats:
+    """
+    Counters of the calendar cache.
+    - hits:      calendars served from memory
+    - misses:    calendars that were missing or built from an older version
+    - evictions: entries dropped to stay within max_size
+    """
+
+    size: int
+    max_size: int
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+_Key = tuple[str | None, UUID, int]  # (tenant, habit_id, year)
+
+
+class CalendarCache:
+    """Bounded LRU of calendars by (tenant, habit, year), with their version."""
+
+    def __init__(self, max_size: int = 1_024) -> None:
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[_Key, tuple[ChangeVersion, HabitCalendar]] = (
+            OrderedDict()
+        )
+        self._stats = CalendarCacheStats(size=0, max_size=max_size)
+
+    def get(
+        self, habit_id: UUID, year: int, version: ChangeVersion
+    ) -> HabitCalendar | None:
+        key = (current_tenant(), habit_id, year)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry[1]
+
+    def put(self, calendar: HabitCalendar, version: ChangeVersion) -> None:
+        key = (current_tenant(), calendar.habit_id, calendar.year)
+        with self._lock:
+            self._entries[key] = (version, calendar)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def stats(self) -> CalendarCacheStats:
+        with self._lock:
+            return replace(self._stats, size=len(self._entries))
+
+
+@lru_cache(maxsize=1)
+def get_calendar_cache() -> CalendarCache | None:
+    """
+    Cache shared by all requests of this process.
+    HABIT_CALENDAR_CACHE_SIZE=0 disables it.
+    """
+    size = get_settings().calendar_cache_size
+    return CalendarCache(max_size=size) if size > 0 else None
+
+
+# a forked worker starts with an empty cache (and an unheld lock)
+os.register_at_fork(after_in_child=get_calendar_cache.cache_clear)
+
+
+def calendar_cache_stats() -> CalendarCacheStats | None:
+    """Counters of the shared calendar cache, None if it is disabled."""
+    cache = get_calendar_cache()
+    return cache.stats() if cache is not None else None
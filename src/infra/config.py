@@ -0,0 +1,104 @@
+# src/infra/config.py
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    return int(raw) if raw else default
+
+
+def _env_str(name: str, default: str) -> str:
+    return os.environ.get(name) or default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.environ.get(name)
+    return raw.lower() in ("1", "true", "yes") if raw else default
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.environ.get(name)
+    return float(raw) if raw else default
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Runtime configuration, read from HABIT_* environment variables.
+
+    src/main.py overrides one of them: with more than one worker it sets
+    HABIT_CACHE_SIZE=0 for the workers (and refuses to start if
+    HABIT_CACHE_SIZE was set above 0).
+    """
+
+    backend: str = "sync"  # "sync" | "async" (aiosqlite) route implementation
+    host: str = "127.0.0.1"
+    port: int = 8000
+    workers: int = 1  # uvicorn worker processes, see src/main.py
+    loop: str = "auto"  # "auto" | "asyncio" | "uvloop"
+    http: str = "auto"  # "auto" | "h11" | "httptools"
+    shutdown_timeout: int = 30  # seconds in-flight requests get on shutdown
+    db_ready: bool = False  # set by src/main.py once it has run init_db
+    db_path: str = ""  # empty: pos.db in the project root
+    tenant_header: str = ""  # e.g. "X-Tenant-ID"; empty: one database for all
+    shard_dir: str = ""  # tenant databases; empty: shards/ in the project root
+    shard_cache_size: int = 64  # tenant databases kept open per process
+    db_pool_size: int = 5  # read-write connections, writers queue for these
+    db_read_pool_size: int = 10  # read-only connections of the read routes
+    db_pool_timeout: float = 5.0  # seconds to wait for a free connection
+    db_profile: str = "balanced"  # see src/infra/pragmas.py
+    storage_format: str = ""  # "text" | "compact"; empty keeps the database's
+    stats_backend: str = "materialized"  # "materialized" | "computed"
+    max_bulk_logs: int = 1_000  # per POST /habits/{id}/logs:bulk request
+    habit_cache_size: int = 4_096  # cached habits per process, 0 disables
+    habit_cache_ttl: float = 60.0  # seconds a cached habit stays valid
+    calendar_cache_size: int = 1_024  # cached habit-year calendars, 0 disables
+    group_commit_size: int = 0  # logs per group commit, 0 disables it
+    group_commit_delay: float = 0.002  # seconds a group commit waits to fill up
+
+    @classmethod
+    def from_env(cls) -> Settings:
+        return cls(
+            backend=_env_str("HABIT_BACKEND", cls.backend),
+            host=_env_str("HABIT_HOST", cls.host),
+            port=_env_int("HABIT_PORT", cls.port),
+            workers=_env_int("HABIT_WORKERS", cls.workers),
+            loop=_env_str("HABIT_LOOP", cls.loop),
+            http=_env_str("HABIT_HTTP", cls.http),
+            shutdown_timeout=_env_int("HABIT_SHUTDOWN_TIMEOUT", cls.shutdown_timeout),
+            db_ready=_env_bool("HABIT_DB_READY", cls.db_ready),
+            db_path=_env_str("HABIT_DB_PATH", cls.db_path),
+            tenant_header=_env_str("HABIT_TENANT_HEADER", cls.tenant_header),
+            shard_dir=_env_str("HABIT_SHARD_DIR", cls.shard_dir),
+            shard_cache_size=_env_int("HABIT_SHARD_CACHE_SIZE", cls.shard_cache_size),
+            db_pool_size=_env_int("HABIT_DB_POOL_SIZE", cls.db_pool_size),
+            db_read_pool_size=_env_int(
+                "HABIT_DB_READ_POOL_SIZE", cls.db_read_pool_size
+            ),
+            db_pool_timeout=_env_float("HABIT_DB_POOL_TIMEOUT", cls.db_pool_timeout),
+            db_profile=_env_str("HABIT_DB_PROFILE", cls.db_profile),
+            storage_format=_env_str("HABIT_STORAGE_FORMAT", cls.storage_format),
+            stats_backend=_env_str("HABIT_STATS_BACKEND", cls.stats_backend),
+            max_bulk_logs=_env_int("HABIT_MAX_BULK_LOGS", cls.max_bulk_logs),
+            habit_cache_size=_env_int("HABIT_CACHE_SIZE", cls.habit_cache_size),
+            habit_cache_ttl=_env_float("HABIT_CACHE_TTL", cls.habit_cache_ttl),
+            calendar_cache_size=_env_int(
+                "HABIT_CALENDAR_CACHE_SIZE", cls.calendar_cache_size
+            ),
+            group_commit_size=_env_int(
+                "HABIT_GROUP_COMMIT_SIZE", cls.group_commit_size
+            ),
+            group_commit_delay=_env_float(
+                "HABIT_GROUP_COMMIT_DELAY", cls.group_commit_delay
+            ),
+        )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings.from_env()
@@ -2,76 +2,272 @@
 
 from __future__ import annotations
 
+import os
 import sqlite3
+import threading
+from collections import OrderedDict
 from collections.abc import Generator
 from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from pathlib import Path
 
+from src.infra.config import get_settings
+from src.infra.migrations import migrate
+from src.infra.pool import ConnectionPool, PoolClosedError, PoolStats
+from src.infra.pragmas import get_pragma_profile
+from src.infra.storage_format import (
+    StorageFormat,
+    convert_storage,
+    get_storage_format,
+    read_storage_format,
+)
+from src.infra.tenancy import current_tenant
+
 # Project root = folder that contains src/, tests/, pos.db, pyproject.toml, etc.
 BASE_DIR = Path(__file__).resolve().parents[2]
 
-# Our SQLite DB file in project root
-DB_PATH = BASE_DIR / "pos.db"
+# Our SQLite DB file in project root (HABIT_DB_PATH overrides it)
+DB_PATH = Path(get_settings().db_path or BASE_DIR / "pos.db")
+
+
+def shard_path(tenant: str | None) -> Path:
+    """Database file of `tenant`; DB_PATH for the default database."""
+    if tenant is None:
+        return DB_PATH
+    return Path(get_settings().shard_dir or BASE_DIR / "shards") / f"{tenant}.db"
+
+
+@dataclass
+class ShardStats:
+    """
+    Counters of the tenant databases (shards) of this process.
+    - open:      shards with open connection pools
+    - opened:    times a shard was opened, again after an eviction
+    - evictions: least recently used shards closed to stay within
+                 HABIT_SHARD_CACHE_SIZE
+    """
+
+    open: int = 0
+    opened: int = 0
+    evictions: int = 0
+
+
+class _Shard:
+    """
+    One database file: its read-write and read-only pools, and its storage
+    format. A tenant shard's schema is created (or migrated) the first time
+    it is opened by this process.
+    """
+
+    def __init__(self, path: Path, ready: bool) -> None:
+        self.path = path
+        self._ready = ready
+        self._format: StorageFormat | None = None
+        # read-write pool (False) and read-only pool (True)
+        self._pools: dict[bool, ConnectionPool] = {}
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def prepare(self) -> None:
+        with self._lock:
+            if self._ready:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = _get_connection(self.path)
+            try:
+                self._format = _prepare(conn)
+            finally:
+                conn.close()
+            self._ready = True
 
+    def pool(self, read_only: bool) -> ConnectionPool:
+        with self._lock:
+            if self._closed:
+                raise PoolClosedError("Database shard is closed")
+            pool = self._pools.get(read_only)
+            if pool is None:
+                settings = get_settings()
+                path = self.path
+                pool = self._pools[read_only] = ConnectionPool(
+                    lambda: _get_connection(path, read_only),
+                    size=settings.db_read_pool_size
+                    if read_only
+                    else settings.db_pool_size,
+                    timeout=settings.db_pool_timeout,
+                )
+            return pool
 
-def _get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+    def storage_format(self) -> StorageFormat:
+        if self._format is None:
+            pool = self.pool(read_only=True)
+            conn = pool.acquire()
+            try:
+                self._format = read_storage_format(conn)
+            finally:
+                pool.release(conn)
+        return self._format
+
+    def set_storage_format(self, fmt: StorageFormat) -> None:
+        self._format = fmt
+
+    def close(self) -> None:
+        """Close idle connections; busy ones are closed when released."""
+        with self._lock:
+            self._closed = True
+            for pool in self._pools.values():
+                pool.close()
+            self._pools.clear()
+
+
+# open databases by tenant (None: the default one), least recently used first
+_shards: OrderedDict[str | None, _Shard] = OrderedDict()
+_shard_lock = threading.Lock()
+_shard_stats = ShardStats()
+
+
+def _get_connection(path: Path, read_only: bool = False) -> sqlite3.Connection:
+    # pooled connections are handed to whichever worker thread acquires them
+    if read_only:
+        conn = sqlite3.connect(
+            f"{path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+        )
+    else:
+        conn = sqlite3.connect(path, check_same_thread=False)
     conn.row_factory = sqlite3.Row
     # enable foreign key support
     conn.execute("PRAGMA foreign_keys = ON;")
+    get_pragma_profile(get_settings().db_profile).apply(conn, read_only)
+    if read_only:
+        # also refuses writes to temp tables, which mode=ro allows
+        conn.execute("PRAGMA query_only = ON;")
     return conn
 
 
+def _forget_pool() -> None:
+    # after fork(): the parent's connections must not be used (or closed)
+    # by the child, and its lock may have been held by another thread
+    global _shards, _shard_lock, _shard_stats
+    _shards = OrderedDict()
+    _shard_lock = threading.Lock()
+    _shard_stats = ShardStats()
+
+
+os.register_at_fork(after_in_child=_forget_pool)
+
+
+def _evict_shards() -> list[_Shard]:
+    # caller holds _shard_lock; the default database is never evicted
+    limit = max(get_settings().shard_cache_size, 1)
+    tenants = [tenant for tenant in _shards if tenant is not None]
+    evicted = [_shards.pop(tenant) for tenant in tenants[: len(tenants) - limit]]
+    _shard_stats.evictions += len(evicted)
+    return evicted
+
+
+def _get_shard(tenant: str | None) -> _Shard:
+    with _shard_lock:
+        shard = _shards.get(tenant)
+        if shard is not None:
+            _shards.move_to_end(tenant)
+            evicted = []
+        else:
+            # the default database is prepared by init_db at startup
+            shard = _shards[tenant] = _Shard(shard_path(tenant), tenant is None)
+            if tenant is not None:
+                _shard_stats.opened += 1
+            evicted = _evict_shards()
+    for old in evicted:
+        old.close()
+    # outside _shard_lock: creating one shard's schema blocks no other tenant
+    shard.prepare()
+    return shard
+
+
+def shard_exists(tenant: str | None) -> bool:
+    """Whether `tenant`'s database has been created (the default one always is)."""
+    return tenant is None or shard_path(tenant).exists()
+
+
+def open_shard(tenant: str | None) -> Path:
+    """Database file of `tenant`, with its schema created if it is new."""
+    return _get_shard(tenant).path
+
+
+def connect(tenant: str | None) -> sqlite3.Connection:
+    """
+    A read-write connection to `tenant`'s database outside the pools, for
+    a long-lived owner that must not wait for a pooled one. The caller
+    closes it.
+    """
+    return _get_connection(open_shard(tenant))
+
+
 @contextmanager
-def get_db() -> Generator[sqlite3.Connection]:
-    conn = _get_connection()
+def get_db(read_only: bool = False) -> Generator[sqlite3.Connection]:
+    """
+    Borrow a pooled connection to the current tenant's database (see
+    src/infra/tenancy.py). `read_only=True` takes it from a separate pool
+    of `mode=ro` / `query_only` connections, so long reads never occupy
+    one of the (few) read-write connections.
+    """
+    while True:
+        try:
+            pool = _get_shard(current_tenant()).pool(read_only)
+            conn = pool.acquire()
+        except PoolClosedError:
+            # the shard was evicted in between: open it again
+            continue
+        break
     try:
         yield conn
     finally:
-        conn.close()
+        pool.release(conn)
+
+
+def storage_format() -> StorageFormat:
+    """Storage format of the current tenant's database, read once."""
+    return _get_shard(current_tenant()).storage_format()
+
+
+def pool_stats(read_only: bool = False) -> PoolStats:
+    return _get_shard(current_tenant()).pool(read_only).stats()
+
+
+def shard_stats() -> ShardStats:
+    with _shard_lock:
+        open_shards = sum(tenant is not None for tenant in _shards)
+        return replace(_shard_stats, open=open_shards)
+
+
+def close_db() -> None:
+    """
+    Close all pooled connections (of every database and both pools).
+    The next `get_db()` call starts a fresh pool.
+    """
+    with _shard_lock:
+        shards = list(_shards.values())
+        _shards.clear()
+    for shard in shards:
+        shard.close()
+
+
+def _prepare(conn: sqlite3.Connection) -> StorageFormat:
+    migrate(conn)
+    target = get_settings().storage_format
+    if target:
+        convert_storage(conn, get_storage_format(target))
+    return read_storage_format(conn)
 
 
 def init_db() -> None:
     """
     Initialize database schema for the Habit Tracker.
-    Creates tables if they do not exist.
+    Applies all pending migrations (see src/infra/migrations.py), then
+    converts the storage format if HABIT_STORAGE_FORMAT asks for another.
     """
-    conn = _get_connection()
+    conn = _get_connection(DB_PATH)
     try:
-        cursor = conn.cursor()
-
-        # main habits table
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS habits (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                description TEXT NOT NULL,
-                category TEXT NOT NULL,
-                type TEXT NOT NULL,          -- 'boolean' | 'numeric'
-                goal REAL,                   -- optional target value
-                created_at TEXT NOT NULL,    -- ISO date string
-                parent_id TEXT,              -- nullable, references habits(id)
-                FOREIGN KEY (parent_id) REFERENCES habits(id)
-                    ON DELETE CASCADE
-            );
-            """
-        )
-
-        # logs table
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS habit_logs (
-                id TEXT PRIMARY KEY,
-                habit_id TEXT NOT NULL,
-                date TEXT NOT NULL,          -- ISO date string
-                value REAL NOT NULL,
-                FOREIGN KEY (habit_id) REFERENCES habits(id)
-                    ON DELETE CASCADE
-            );
-            """
-        )
-
-        conn.commit()
+        fmt = _prepare(conn)
     finally:
         conn.close()
+    _get_shard(None).set_storage_format(fmt)
@@ -0,0 +1,236 @@
+# src/infra/group_commit.py
+
+"""
+Group commit for log inserts.
+
+With HABIT_GROUP_COMMIT_SIZE > 0, log inserts are not committed by the
+request that makes them. They are queued for one writer thread, which
+collects them for up to HABIT_GROUP_COMMIT_DELAY seconds (or until the
+batch holds HABIT_GROUP_COMMIT_SIZE logs) and writes the whole batch in
+one transaction, so a burst of inserts waits for one fsync instead of
+queueing on SQLite's write lock one commit at a time.
+
+Each insert runs in its own SAVEPOINT: a failing one is rolled back and
+reported to its request alone. Callers are only told about the outcome
+after the batch has committed. Inserts of different tenants (see
+src/infra/tenancy.py) are committed to their own shards, one transaction
+per shard.
+
+The requests waiting for a batch hold no connection (see
+GroupCommitUnitOfWork in src/infra/unit_of_work.py), and the writer
+thread owns one connection per shard outside the pools, so a batch is
+never limited by, or waiting for, the pool size.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
+from functools import lru_cache
+
+from src.core.entities.habit_log import HabitLog
+from src.infra.config import get_settings
+from src.infra.database import connect, storage_format
+from src.infra.repositories.habit_log_repository import insert_logs
+from src.infra.tenancy import current_tenant, use_tenant
+
+
+@dataclass
+class GroupCommitStats:
+    """
+    Counters of the group-commit writer.
+    - batches: transactions committed (or rolled back)
+    - writes:  insert calls served, one per request
+    - logs:    logs written
+    - failed:  insert calls that were reported as failed
+    """
+
+    batches: int = 0
+    writes: int = 0
+    logs: int = 0
+    failed: int = 0
+
+
+@dataclass(frozen=True)
+class _Write:
+    logs: list[HabitLog]
+    tenant: str | None
+    done: Future[None]
+
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """
+    Owns the writer thread (started on the first write) and its queue.
+    `submit` returns a Future that is resolved once the logs' batch has
+    committed; `write` waits for it.
+    """
+
+    def __init__(self, max_size: int = 256, max_delay: float = 0.002) -> None:
+        self._max_size = max_size
+        self._max_delay = max_delay
+        self._queue: queue.Queue[_Write | object] = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stats = GroupCommitStats()
+        # the writer thread's own connections by tenant, only it uses them
+        self._connections: OrderedDict[str | None, sqlite3.Connection] = OrderedDict()
+
+    def submit(self, logs: list[HabitLog]) -> Future[None]:
+        # the writer thread does not share the request's context
+        write = _Write(logs=logs, tenant=current_tenant(), done=Future())
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="group-commit", daemon=True
+                )
+                self._thread.start()
+            self._queue.put(write)
+        return write.done
+
+    def write(self, logs: list[HabitLog]) -> None:
+        self.submit(logs).result()
+
+    def close(self) -> None:
+        """Write what is queued, then stop the thread (restarts on demand)."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            thread.join()
+
+    def stats(self) -> GroupCommitStats:
+        with self._lock:
+            return replace(self._stats)
+
+    def _run(self) -> None:
+        try:
+            self._serve()
+        finally:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+
+    def _serve(self) -> None:
+        while True:
+            first = self._queue.get()
+            if not isinstance(first, _Write):
+                return
+            batch, stop = self._collect(first)
+            shards: dict[str | None, list[_Write]] = {}
+            for write in batch:
+                shards.setdefault(write.tenant, []).append(write)
+            for tenant, writes in shards.items():
+                with use_tenant(tenant):
+                    self._commit(writes)
+            if stop:
+                return
+
+    def _collect(self, first: _Write) -> tuple[list[_Write], bool]:
+        """The batch starting at `first`, and whether close() was called."""
+        batch = [first]
+        size = len(first.logs)
+        deadline = time.monotonic() + self._max_delay
+        while size < self._max_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if not isinstance(item, _Write):
+                return batch, True
+            batch.append(item)
+            size += len(item.logs)
+        return batch, False
+
+    def _connection(self, tenant: str | None) -> sqlite3.Connection:
+        conn = self._connections.get(tenant)
+        if conn is not None:
+            self._connections.move_to_end(tenant)
+            return conn
+        conn = self._connections[tenant] = connect(tenant)
+        # as many as the open shards, plus the default database
+        limit = max(get_settings().shard_cache_size, 1) + 1
+        while len(self._connections) > limit:
+            _, old = self._connections.popitem(last=False)
+            old.close()
+        return conn
+
+    def _commit(self, batch: list[_Write]) -> None:
+        written: list[_Write] = []
+        failed: list[tuple[_Write, BaseException]] = []
+        try:
+            db = self._connection(current_tenant())
+            fmt = storage_format()
+            db.execute("BEGIN IMMEDIATE;")
+            try:
+                for write in batch:
+                    db.execute("SAVEPOINT group_write;")
+                    try:
+                        insert_logs(db, fmt, write.logs)
+                    except sqlite3.Error as exc:
+                        db.execute("ROLLBACK TO group_write;")
+                        failed.append((write, exc))
+                    else:
+                        written.append(write)
+                    db.execute("RELEASE group_write;")
+                db.commit()
+            except BaseException:
+                db.rollback()
+                raise
+        except Exception as exc:
+            # nothing of this batch was committed
+            failed = [(write, exc) for write in batch]
+            written = []
+
+        with self._lock:
+            self._stats.batches += 1
+            self._stats.writes += len(batch)
+            self._stats.logs += sum(len(write.logs) for write in written)
+            self._stats.failed += len(failed)
+        for write in written:
+            write.done.set_result(None)
+        for write, error in failed:
+            write.done.set_exception(error)
+
+
+@lru_cache(maxsize=1)
+def get_group_commit_writer() -> GroupCommitWriter | None:
+    """
+    Writer shared by all requests of this process.
+    HABIT_GROUP_COMMIT_SIZE=0 (the default) disables group commit.
+    """
+    settings = get_settings()
+    if settings.group_commit_size <= 0:
+        return None
+    return GroupCommitWriter(
+        max_size=settings.group_commit_size,
+        max_delay=settings.group_commit_delay,
+    )
+
+
+# the writer thread does not survive fork(); the child starts its own
+os.register_at_fork(after_in_child=get_group_commit_writer.cache_clear)
+
+
+def group_commit_stats() -> GroupCommitStats | None:
+    """Counters of the shared writer, None if group commit is disabled."""
+    writer = get_group_commit_writer()
+    return writer.stats() if writer is not None else None
+
+
+def close_group_commit_writer() -> None:
+    writer = get_group_commit_writer()
+    if writer is not None:
+        writer.close()
@@ -0,0 +1,300 @@
+# src/infra/materialized_stats.py
+
+"""
+Maintenance of the `habit_stats` table.
+
+One row per habit that has logs:
+- total / log_count: running sum and number of logs
+- last_date:         most recent log date
+- current_streak:    consecutive days ending at last_date (see HabitStats)
+
+`record_log` / `record_batch` (and their `_async` variants for aiosqlite)
+must run in the same transaction as the INSERT of the logs, after the rows
+have been inserted. Ids and dates are encoded with the database's
+StorageFormat.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import date, timedelta
+from uuid import UUID
+
+import aiosqlite
+
+from src.infra.storage_format import StorageFormat, read_storage_format
+
+SELECT_STATS_STATE = """
+    SELECT last_date, current_streak
+      FROM habit_stats
+     WHERE habit_id = ?
+"""
+
+# newest first, served backwards from the (habit_id, date, ...) index
+SELECT_DATES_DESC = """
+    SELECT date
+      FROM habit_logs
+     WHERE habit_id = ? AND date <= ?
+  ORDER BY date DESC
+"""
+
+UPSERT_STATS = """
+    INSERT INTO habit_stats (
+        habit_id,
+        total,
+        log_count,
+        last_date,
+        current_streak
+    )
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (habit_id) DO UPDATE
+       SET total = total + excluded.total,
+           log_count = log_count + excluded.log_count,
+           last_date = excluded.last_date,
+           current_streak = excluded.current_streak
+"""
+
+StatsState = tuple[date, int]  # (last_date, current_streak)
+
+
+class StreakWalker:
+    """
+    Count consecutive days backwards from `last_date`.
+    Stops at the first gap or at a second log on an already counted day,
+    so it reads at most `streak + 1` rows from the (habit_id, date) index.
+    """
+
+    def __init__(self, last_date: date, fmt: StorageFormat) -> None:
+        self.streak = 0
+        self._expected = last_date
+        self._fmt = fmt
+
+    def feed(self, day: object) -> bool:
+        """Consume the next (older) log date; False once the streak ended."""
+        if day != self._fmt.encode_day(self._expected):
+            return False
+        self.streak += 1
+        self._expected -= timedelta(days=1)
+        return True
+
+
+def _to_state(row: sqlite3.Row | None, fmt: StorageFormat) -> StatsState | None:
+    return None if row is None else (fmt.decode_day(row[0]), row[1])
+
+
+def _next_streak(state: StatsState | None, log_date: date) -> int | None:
+    """Streak after adding one log; None if it has to be walked again."""
+    if state is None:
+        return 1
+
+    last_date, streak = state
+    first_day = last_date - timedelta(days=streak - 1)
+
+    # new latest day: extends the streak or starts a new one
+    if log_date > last_date:
+        return streak + 1 if log_date == last_date + timedelta(days=1) else 1
+
+    # second log on a day inside the streak cuts it at that day
+    if log_date >= first_day:
+        return (last_date - log_date).days + 1
+
+    # backfilled day right before the streak may join it with older days
+    if log_date == first_day - timedelta(days=1):
+        return None
+
+    # older backfills cannot reach the streak
+    return streak
+
+
+def _last_date(state: StatsState | None, entries: list[tuple[date, float]]) -> date:
+    last_date = max(log_date for log_date, _ in entries)
+    return last_date if state is None else max(last_date, state[0])
+
+
+def _upsert_params(
+    fmt: StorageFormat,
+    habit_id: UUID,
+    entries: list[tuple[date, float]],
+    last_date: date,
+    streak: int,
+) -> tuple[object, float, int, object, int]:
+    return (
+        fmt.encode_uuid(habit_id),
+        sum(value for _, value in entries),
+        len(entries),
+        fmt.encode_day(last_date),
+        streak,
+    )
+
+
+def _walk_params(
+    fmt: StorageFormat, habit_id: UUID, last_date: date
+) -> tuple[object, object]:
+    return fmt.encode_uuid(habit_id), fmt.encode_day(last_date)
+
+
+def walk_streak(
+    db: sqlite3.Connection,
+    fmt: StorageFormat,
+    habit_id: UUID,
+    last_date: date,
+) -> int:
+    walker = StreakWalker(last_date, fmt)
+    cursor = db.execute(SELECT_DATES_DESC, _walk_params(fmt, habit_id, last_date))
+    for (day,) in cursor:
+        if not walker.feed(day):
+            break
+    cursor.close()
+    return walker.streak
+
+
+def _fetch_state(
+    db: sqlite3.Connection, fmt: StorageFormat, habit_id: UUID
+) -> StatsState | None:
+    row = db.execute(SELECT_STATS_STATE, (fmt.encode_uuid(habit_id),)).fetchone()
+    return _to_state(row, fmt)
+
+
+def record_log(
+    db: sqlite3.Connection,
+    fmt: StorageFormat,
+    habit_id: UUID,
+    log_date: date,
+    value: float,
+) -> None:
+    state = _fetch_state(db, fmt, habit_id)
+    entries = [(log_date, value)]
+    last_date = _last_date(state, entries)
+
+    streak = _next_streak(state, log_date)
+    if streak is None:
+        streak = walk_streak(db, fmt, habit_id, last_date)
+
+    db.execute(UPSERT_STATS, _upsert_params(fmt, habit_id, entries, last_date, streak))
+
+
+def record_batch(
+    db: sqlite3.Connection,
+    fmt: StorageFormat,
+    habit_id: UUID,
+    entries: list[tuple[date, float]],
+) -> None:
+    """
+    Apply many new logs of one habit at once.
+    The streak is re-walked from the new latest day instead of replaying
+    every log, so the cost is bounded by the streak length.
+    """
+    if not entries:
+        return
+
+    state = _fetch_state(db, fmt, habit_id)
+    last_date = _last_date(state, entries)
+    streak = walk_streak(db, fmt, habit_id, last_date)
+    db.execute(UPSERT_STATS, _upsert_params(fmt, habit_id, entries, last_date, streak))
+
+
+async def walk_streak_async(
+    db: aiosqlite.Connection,
+    fmt: StorageFormat,
+    habit_id: UUID,
+    last_date: date,
+) -> int:
+    walker = StreakWalker(last_date, fmt)
+    async with db.execute(
+        SELECT_DATES_DESC, _walk_params(fmt, habit_id, last_date)
+    ) as cursor:
+        async for (day,) in cursor:
+            if not walker.feed(day):
+                break
+    return walker.streak
+
+
+async def _fetch_state_async(
+    db: aiosqlite.Connection, fmt: StorageFormat, habit_id: UUID
+) -> StatsState | None:
+    params = (fmt.encode_uuid(habit_id),)
+    async with db.execute(SELECT_STATS_STATE, params) as cursor:
+        return _to_state(await cursor.fetchone(), fmt)
+
+
+async def record_log_async(
+    db: aiosqlite.Connection,
+    fmt: StorageFormat,
+    habit_id: UUID,
+    log_date: date,
+    value: float,
+) -> None:
+    state = await _fetch_state_async(db, fmt, habit_id)
+    entries = [(log_date, value)]
+    last_date = _last_date(state, entries)
+
+    streak = _next_streak(state, log_date)
+    if streak is None:
+        streak = await walk_streak_async(db, fmt, habit_id, last_date)
+
+    await db.execute(
+        UPSERT_STATS, _upsert_params(fmt, habit_id, entries, last_date, streak)
+    )
+
+
+async def record_batch_async(
+    db: aiosqlite.Connection,
+    fmt: StorageFormat,
+    habit_id: UUID,
+    entries: list[tuple[date, float]],
+) -> None:
+    if not entries:
+        return
+
+    state = await _fetch_state_async(db, fmt, habit_id)
+    last_date = _last_date(state, entries)
+    streak = await walk_streak_async(db, fmt, habit_id, last_date)
+    await db.execute(
+        UPSERT_STATS, _upsert_params(fmt, habit_id, entries, last_date, streak)
+    )
+
+
+def rebuild_stats(db: sqlite3.Connection, habit_id: UUID | None = None) -> int:
+    """
+    Recompute `habit_stats` from `habit_logs` for one habit (or all).
+    Returns the number of habits with stats.
+    """
+    fmt = read_storage_format(db)
+    where = "WHERE habit_id = ?" if habit_id is not None else ""
+    params = (fmt.encode_uuid(habit_id),) if habit_id is not None else ()
+
+    db.execute(f"DELETE FROM habit_stats {where}", params)
+    db.execute(
+        f"""
+        INSERT INTO habit_stats (
+            habit_id,
+            total,
+            log_count,
+            last_date,
+            current_streak
+        )
+        SELECT habit_id, SUM(value), COUNT(*), MAX(date), 0
+          FROM habit_logs
+          {where}
+      GROUP BY habit_id
+        """,
+        params,
+    )
+
+    rows = db.execute(
+        f"SELECT habit_id, last_date FROM habit_stats {where}", params
+    ).fetchall()
+    for stats_habit_id, last_date in rows:
+        db.execute(
+            "UPDATE habit_stats SET current_streak = ? WHERE habit_id = ?",
+            (
+                walk_streak(
+                    db,
+                    fmt,
+                    fmt.decode_uuid(stats_habit_id),
+                    fmt.decode_day(last_date),
+                ),
+                stats_habit_id,
+            ),
+        )
+    return len(rows)
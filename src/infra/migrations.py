@@ -0,0 +1,542 @@
+# src/infra/migrations.py
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from src.infra.materialized_stats import rebuild_stats
+from src.infra.rollups import rebuild_rollups
+from src.infra.storage_format import read_storage_format
+
+MigrationStep = Callable[[sqlite3.Connection], None]
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    Single, ordered schema change.
+    `version` numbers are recorded in `schema_migrations` once applied.
+    """
+
+    version: int
+    name: str
+    apply: MigrationStep
+
+
+def _sql(*statements: str) -> MigrationStep:
+    def run(conn: sqlite3.Connection) -> None:
+        for statement in statements:
+            conn.execute(statement)
+
+    return run
+
+
+def _create_habit_stats(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS habit_stats (
+            habit_id TEXT PRIMARY KEY,
+            total REAL NOT NULL,
+            log_count INTEGER NOT NULL,
+            last_date TEXT NOT NULL,     -- ISO date string
+            current_streak INTEGER NOT NULL,
+            FOREIGN KEY (habit_id) REFERENCES habits(id)
+                ON DELETE CASCADE
+        );
+        """
+    )
+    # backfill from the logs that already exist
+    rebuild_stats(conn)
+
+
+def _create_habit_log_rollups(conn: sqlite3.Connection) -> None:
+    # column types follow the storage format the database already uses
+    fmt = read_storage_format(conn)
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS habit_log_rollups (
+            habit_id {fmt.uuid_type} NOT NULL,
+            bucket TEXT NOT NULL,             -- 'day' | 'week' | 'month'
+            bucket_start {fmt.day_type} NOT NULL,
+            total REAL NOT NULL,
+            log_count INTEGER NOT NULL,
+            min_value REAL NOT NULL,
+            max_value REAL NOT NULL,
+            PRIMARY KEY (habit_id, bucket, bucket_start),
+            FOREIGN KEY (habit_id) REFERENCES habits(id)
+                ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """
+    )
+    rebuild_rollups(conn)
+
+
+def _create_habit_closure(conn: sqlite3.Connection) -> None:
+    fmt = read_storage_format(conn)
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS habit_closure (
+            ancestor_id {fmt.uuid_type} NOT NULL,
+            descendant_id {fmt.uuid_type} NOT NULL,
+            depth INTEGER NOT NULL,           -- 0 = the habit itself
+            PRIMARY KEY (ancestor_id, descendant_id),
+            FOREIGN KEY (ancestor_id) REFERENCES habits(id)
+                ON DELETE CASCADE,
+            FOREIGN KEY (descendant_id) REFERENCES habits(id)
+                ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """
+    )
+    # reparenting looks up every ancestor of a subtree's habits
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_habit_closure_descendant
+            ON habit_closure (descendant_id, depth);
+        """
+    )
+    # triggers keep it current for every writer (sync, async, raw SQL);
+    # deletes are covered by ON DELETE CASCADE
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS habit_closure_insert
+        AFTER INSERT ON habits
+        BEGIN
+            INSERT INTO habit_closure (ancestor_id, descendant_id, depth)
+            VALUES (NEW.id, NEW.id, 0);
+            INSERT INTO habit_closure (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, NEW.id, depth + 1
+              FROM habit_closure
+             WHERE descendant_id = NEW.parent_id;
+        END;
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS habit_closure_no_cycle
+        BEFORE UPDATE OF parent_id ON habits
+        WHEN NEW.parent_id IS NOT NULL AND EXISTS (
+            SELECT 1
+              FROM habit_closure
+             WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_id
+        )
+        BEGIN
+            SELECT RAISE(ABORT, 'Habit cannot be moved below itself');
+        END;
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS habit_closure_reparent
+        AFTER UPDATE OF parent_id ON habits
+        WHEN OLD.parent_id IS NOT NEW.parent_id
+        BEGIN
+            -- detach the subtree from its old ancestors
+            DELETE FROM habit_closure
+             WHERE descendant_id IN (
+                       SELECT descendant_id FROM habit_closure
+                        WHERE ancestor_id = NEW.id
+                   )
+               AND ancestor_id NOT IN (
+                       SELECT descendant_id FROM habit_closure
+                        WHERE ancestor_id = NEW.id
+                   );
+            -- attach it below the new parent's ancestors
+            INSERT INTO habit_closure (ancestor_id, descendant_id, depth)
+            SELECT above.ancestor_id,
+                   below.descendant_id,
+                   above.depth + below.depth + 1
+              FROM habit_closure AS above, habit_closure AS below
+             WHERE above.descendant_id = NEW.parent_id
+               AND below.ancestor_id = NEW.id;
+        END;
+        """
+    )
+    # backfill from parent_id
+    conn.execute(
+        """
+        INSERT INTO habit_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM habits
+            UNION ALL
+            SELECT tree.ancestor_id, habits.id, tree.depth + 1
+              FROM tree
+              JOIN habits ON habits.parent_id = tree.descendant_id
+        )
+        SELECT ancestor_id, descendant_id, depth FROM tree;
+        """
+    )
+
+
+# unix seconds with millisecond precision (unixepoch('subsec') needs
+# SQLite 3.42); SQLite evaluates 'now' once per statement
+NOW = "(julianday('now') - 2440587.5) * 86400.0"
+
+CHANGE_TRIGGERS = (
+    "habit_changes_insert",
+    "habit_changes_update",
+    "habit_changes_delete",
+    "habit_changes_log_insert",
+)
+
+
+def _create_change_counters(conn: sqlite3.Connection) -> None:
+    fmt = read_storage_format(conn)
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS habit_changes (
+            habit_id {fmt.uuid_type} PRIMARY KEY,
+            version INTEGER NOT NULL,
+            modified_at INTEGER NOT NULL,     -- unix seconds, fractional since v12
+            FOREIGN KEY (habit_id) REFERENCES habits(id)
+                ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS change_counters (
+            name TEXT PRIMARY KEY,            -- 'habits': the habit list
+            version INTEGER NOT NULL,
+            modified_at INTEGER NOT NULL      -- unix seconds, fractional since v12
+        );
+        """
+    )
+    _create_change_triggers(conn)
+    # backfill: every existing habit starts at version 1
+    conn.execute(
+        f"""
+        INSERT OR IGNORE INTO change_counters (name, version, modified_at)
+        VALUES ('habits', 1, {NOW});
+        """
+    )
+    conn.execute(
+        f"""
+        INSERT OR IGNORE INTO habit_changes (habit_id, version, modified_at)
+        SELECT id, 1, {NOW} FROM habits;
+        """
+    )
+
+
+def _create_change_triggers(conn: sqlite3.Connection) -> None:
+    # like habit_closure, bumped by triggers so every writer is covered;
+    # logs are only deleted together with their habit
+    bump_list = f"""
+            UPDATE change_counters
+               SET version = version + 1, modified_at = {NOW}
+             WHERE name = 'habits';
+    """
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS habit_changes_insert
+        AFTER INSERT ON habits
+        BEGIN
+            INSERT INTO habit_changes (habit_id, version, modified_at)
+            VALUES (NEW.id, 1, {NOW});
+            {bump_list}
+        END;
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS habit_changes_update
+        AFTER UPDATE ON habits
+        BEGIN
+            UPDATE habit_changes
+               SET version = version + 1, modified_at = {NOW}
+             WHERE habit_id = NEW.id;
+            {bump_list}
+        END;
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS habit_changes_delete
+        AFTER DELETE ON habits
+        BEGIN
+            {bump_list}
+        END;
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS habit_changes_log_insert
+        AFTER INSERT ON habit_logs
+        BEGIN
+            UPDATE habit_changes
+               SET version = version + 1, modified_at = {NOW}
+             WHERE habit_id = NEW.habit_id;
+        END;
+        """
+    )
+
+
+def _subsecond_change_times(conn: sqlite3.Connection) -> None:
+    # whole seconds could not tell two writes of the same second apart
+    for trigger in CHANGE_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger};")
+    _create_change_triggers(conn)
+
+
+def _create_habit_search(conn: sqlite3.Connection) -> None:
+    # external content: the index stores no copy of the text, only
+    # tokens keyed by the rowid of the habit they came from
+    conn.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS habits_fts USING fts5(
+            name,
+            description,
+            content = 'habits',
+            content_rowid = 'rowid',
+            tokenize = 'unicode61 remove_diacritics 2'
+        );
+        """
+    )
+    # kept in sync by triggers, like habit_closure; ON DELETE CASCADE of
+    # sub-habits fires the delete trigger as well
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS habits_fts_insert
+        AFTER INSERT ON habits
+        BEGIN
+            INSERT INTO habits_fts (rowid, name, description)
+            VALUES (NEW.rowid, NEW.name, NEW.description);
+        END;
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS habits_fts_update
+        AFTER UPDATE OF name, description ON habits
+        BEGIN
+            INSERT INTO habits_fts (habits_fts, rowid, name, description)
+            VALUES ('delete', OLD.rowid, OLD.name, OLD.description);
+            INSERT INTO habits_fts (rowid, name, description)
+            VALUES (NEW.rowid, NEW.name, NEW.description);
+        END;
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS habits_fts_delete
+        AFTER DELETE ON habits
+        BEGIN
+            INSERT INTO habits_fts (habits_fts, rowid, name, description)
+            VALUES ('delete', OLD.rowid, OLD.name, OLD.description);
+        END;
+        """
+    )
+    # backfill from the habits that already exist
+    conn.execute("INSERT INTO habits_fts (habits_fts) VALUES ('rebuild');")
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(
+        version=1,
+        name="create habits and habit_logs",
+        apply=_sql(
+            """
+            CREATE TABLE IF NOT EXISTS habits (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                description TEXT NOT NULL,
+                category TEXT NOT NULL,
+                type TEXT NOT NULL,          -- 'boolean' | 'numeric'
+                goal REAL,                   -- optional target value
+                created_at TEXT NOT NULL,    -- ISO date string
+                parent_id TEXT,              -- nullable, references habits(id)
+                FOREIGN KEY (parent_id) REFERENCES habits(id)
+                    ON DELETE CASCADE
+            );
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS habit_logs (
+                id TEXT PRIMARY KEY,
+                habit_id TEXT NOT NULL,
+                date TEXT NOT NULL,          -- ISO date string
+                value REAL NOT NULL,
+                FOREIGN KEY (habit_id) REFERENCES habits(id)
+                    ON DELETE CASCADE
+            );
+            """,
+        ),
+    ),
+    Migration(
+        version=2,
+        name="covering index on habit_logs(habit_id, date, value)",
+        apply=_sql(
+            """
+            CREATE INDEX IF NOT EXISTS idx_habit_logs_habit_date
+                ON habit_logs (habit_id, date, value);
+            """
+        ),
+    ),
+    Migration(
+        version=3,
+        name="index on habits(parent_id)",
+        apply=_sql(
+            """
+            CREATE INDEX IF NOT EXISTS idx_habits_parent
+                ON habits (parent_id);
+            """
+        ),
+    ),
+    Migration(
+        version=4,
+        name="materialized habit_stats",
+        apply=_create_habit_stats,
+    ),
+    Migration(
+        version=5,
+        name="keyset pagination indexes",
+        apply=_sql(
+            # (habit_id, date, id, value) still covers every per-habit
+            # date/value query and also orders pages by (date, id)
+            """
+            CREATE INDEX IF NOT EXISTS idx_habit_logs_page
+                ON habit_logs (habit_id, date, id, value);
+            """,
+            "DROP INDEX IF EXISTS idx_habit_logs_habit_date;",
+            """
+            CREATE INDEX IF NOT EXISTS idx_habits_page
+                ON habits (created_at, name, id);
+            """,
+        ),
+    ),
+    Migration(
+        version=6,
+        name="db_meta with the storage format",
+        apply=_sql(
+            """
+            CREATE TABLE IF NOT EXISTS db_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """,
+            # 'compact' is opt-in, see src/infra/storage_format.py
+            """
+            INSERT OR IGNORE INTO db_meta (key, value)
+            VALUES ('storage_format', 'text');
+            """,
+        ),
+    ),
+    Migration(
+        version=7,
+        name="day/week/month log rollups",
+        apply=_create_habit_log_rollups,
+    ),
+    Migration(
+        version=8,
+        name="habit_closure hierarchy index",
+        apply=_create_habit_closure,
+    ),
+    Migration(
+        version=9,
+        name="change counters for conditional requests",
+        apply=_create_change_counters,
+    ),
+    Migration(
+        version=10,
+        name="habit filter indexes",
+        apply=_sql(
+            # each ends in the page key, so a filtered page is one range scan
+            """
+            CREATE INDEX IF NOT EXISTS idx_habits_category
+                ON habits (category, created_at, name, id);
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_habits_type
+                ON habits (type, created_at, name, id);
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_habits_has_goal
+                ON habits ((goal IS NOT NULL), created_at, name, id);
+            """,
+            # (parent_id, ...) still serves the cascades and closure triggers
+            """
+            CREATE INDEX IF NOT EXISTS idx_habits_parent_page
+                ON habits (parent_id, created_at, name, id);
+            """,
+            "DROP INDEX IF EXISTS idx_habits_parent;",
+        ),
+    ),
+    Migration(
+        version=11,
+        name="full-text search on habit names and descriptions",
+        apply=_create_habit_search,
+    ),
+    Migration(
+        version=12,
+        name="sub-second change timestamps",
+        apply=_subsecond_change_times,
+    ),
+]
+
+
+def _ensure_migrations_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL     -- ISO timestamp (UTC)
+        );
+        """
+    )
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """Highest applied migration version, 0 for an unversioned database."""
+    table = conn.execute(
+        """
+        SELECT 1
+          FROM sqlite_master
+         WHERE type = 'table' AND name = 'schema_migrations'
+        """
+    ).fetchone()
+    if table is None:
+        return 0
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    return int(row[0] or 0)
+
+
+def migrate(conn: sqlite3.Connection) -> list[int]:
+    """
+    Apply every migration newer than the recorded schema version.
+    Each migration runs in its own IMMEDIATE transaction, so concurrent
+    processes serialize and never apply the same version twice.
+    Returns the versions applied by this call.
+    """
+    _ensure_migrations_table(conn)
+
+    applied: list[int] = []
+    for migration in MIGRATIONS:
+        if migration.version <= current_version(conn):
+            continue
+
+        conn.execute("BEGIN IMMEDIATE;")
+        try:
+            # another process may have applied it while we waited for the lock
+            if migration.version <= current_version(conn):
+                conn.rollback()
+                continue
+            migration.apply(conn)
+            conn.execute(
+                """
+                INSERT INTO schema_migrations (version, name, applied_at)
+                VALUES (?, ?, ?)
+                """,
+                (
+                    migration.version,
+                    migration.name,
+                    datetime.now(UTC).isoformat(),
+                ),
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        applied.append(migration.version)
+    return applied
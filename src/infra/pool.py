@@ -0,0 +1,252 @@
+# src/infra/pool.py
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+
+import aiosqlite
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+class PoolClosedError(RuntimeError):
+    """Raised by `acquire` once the pool has been closed."""
+
+
+@dataclass
+class PoolStats:
+    """
+    Counters describing how the pool has been used.
+    - hits:     acquisitions served by an idle, already configured connection
+    - misses:   acquisitions that had to open a new connection
+    - waits:    acquisitions that blocked because the pool was exhausted
+    - timeouts: acquisitions that gave up after waiting
+    """
+
+    size: int
+    open: int = 0
+    idle: int = 0
+    hits: int = 0
+    misses: int = 0
+    waits: int = 0
+    timeouts: int = 0
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of SQLite connections.
+
+    At most `size` connections are open at once. Connections are created
+    lazily by `factory` (which is expected to apply all per-connection
+    settings) and reused in LIFO order so the hottest connection stays warm.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], sqlite3.Connection],
+        size: int,
+        timeout: float,
+    ) -> None:
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._factory = factory
+        self._size = size
+        self._timeout = timeout
+        self._idle: list[sqlite3.Connection] = []
+        self._open = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = PoolStats(size=size)
+
+    def acquire(self) -> sqlite3.Connection:
+        with self._cond:
+            if self._closed:
+                raise PoolClosedError("Connection pool is closed")
+            if not self._idle and self._open >= self._size:
+                self._stats.waits += 1
+                available = self._cond.wait_for(
+                    lambda: bool(self._idle) or self._open < self._size,
+                    timeout=self._timeout,
+                )
+                if not available:
+                    self._stats.timeouts += 1
+                    raise PoolTimeoutError(
+                        "Timed out waiting for a database connection"
+                    )
+
+            if self._idle:
+                self._stats.hits += 1
+                return self._idle.pop()
+
+            # reserve a slot, then open the connection outside the lock
+            self._open += 1
+            self._stats.misses += 1
+
+        try:
+            return self._factory()
+        except BaseException:
+            self._discard()
+            raise
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        try:
+            # never hand out a connection with a half-finished transaction
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            self._discard()
+            return
+
+        with self._cond:
+            if self._closed:
+                self._open -= 1
+                conn.close()
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Close idle connections; busy ones are closed when released."""
+        with self._cond:
+            self._closed = True
+            for conn in self._idle:
+                conn.close()
+            self._open -= len(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+
+    def stats(self) -> PoolStats:
+        with self._cond:
+            return replace(self._stats, open=self._open, idle=len(self._idle))
+
+    def _discard(self) -> None:
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+
+def _wake(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class AsyncConnectionPool:
+    """
+    ConnectionPool counterpart for aiosqlite connections.
+
+    Waiters are plain futures woken through their own loop, so the pool is
+    not tied to a single event loop.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Awaitable[aiosqlite.Connection]],
+        size: int,
+        timeout: float,
+    ) -> None:
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._factory = factory
+        self._size = size
+        self._timeout = timeout
+        self._idle: list[aiosqlite.Connection] = []
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._open = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._stats = PoolStats(size=size)
+
+    async def acquire(self) -> aiosqlite.Connection:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._timeout
+        waited = False
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise PoolClosedError("Connection pool is closed")
+                if self._idle:
+                    self._stats.hits += 1
+                    return self._idle.pop()
+                if self._open < self._size:
+                    # reserve a slot, then open the connection outside the lock
+                    self._open += 1
+                    self._stats.misses += 1
+                    break
+                if not waited:
+                    self._stats.waits += 1
+                    waited = True
+                waiter: asyncio.Future[None] = loop.create_future()
+                self._waiters.append(waiter)
+
+            try:
+                await asyncio.wait_for(waiter, deadline - loop.time())
+            except TimeoutError:
+                with self._lock:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                    self._stats.timeouts += 1
+                raise PoolTimeoutError(
+                    "Timed out waiting for a database connection"
+                ) from None
+
+        try:
+            return await self._factory()
+        except BaseException:
+            self._discard()
+            raise
+
+    async def release(self, conn: aiosqlite.Connection) -> None:
+        try:
+            # never hand out a connection with a half-finished transaction
+            if conn.in_transaction:
+                await conn.rollback()
+        except sqlite3.Error:
+            await conn.close()
+            self._discard()
+            return
+
+        with self._lock:
+            closed = self._closed
+            if closed:
+                self._open -= 1
+            else:
+                self._idle.append(conn)
+            self._wake_one()
+        if closed:
+            await conn.close()
+
+    async def close(self) -> None:
+        """Close idle connections; busy ones are closed when released."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            while self._waiters:
+                self._wake_one()
+        for conn in idle:
+            await conn.close()
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return replace(self._stats, open=self._open, idle=len(self._idle))
+
+    def _discard(self) -> None:
+        with self._lock:
+            self._open -= 1
+            self._wake_one()
+
+    def _wake_one(self) -> None:
+        # caller holds self._lock
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+                return
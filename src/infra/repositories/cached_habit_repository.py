@@ -0,0 +1,290 @@
+# src/infra/repositories/cached_habit_repository.py
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from uuid import UUID
+
+from src.core.entities.habit import Habit
+from src.core.entities.habit_filter import HabitFilter
+from src.core.interface.repositories import HabitPageKey, HabitRepository
+from src.infra.config import get_settings
+from src.infra.tenancy import current_tenant
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters describing how the habit cache has been used.
+    - hits:          reads answered from memory
+    - misses:        reads that went to the wrapped repository
+    - evictions:     entries dropped to stay within max_size
+    - expirations:   entries dropped because they outlived the TTL
+    - invalidations: writes (create/update/delete) that bumped the version
+    """
+
+    size: int
+    max_size: int
+    ttl: float
+    version: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+@dataclass(frozen=True)
+class _Entry:
+    habit: Habit
+    expires_at: float
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    habits: list[Habit]
+    version: int
+    expires_at: float
+
+
+class HabitCache:
+    """
+    Process-wide habit cache: a bounded LRU of habits by id with a TTL,
+    plus one `get_all` snapshot that is valid for the current version only.
+
+    Every invalidation bumps the version. Readers pass the version they saw
+    before going to the database, so a row read before a concurrent write
+    is never stored afterwards.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4_096,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[UUID, _Entry] = OrderedDict()
+        self._snapshot: _Snapshot | None = None
+        self._stats = CacheStats(size=0, max_size=max_size, ttl=ttl)
+
+    def get(self, habit_id: UUID) -> tuple[Habit | None, int]:
+        """Cached habit (a copy) or None, and the version to store under."""
+        with self._lock:
+            entry = self._entries.get(habit_id)
+            if entry is not None and entry.expires_at <= self._clock():
+                del self._entries[habit_id]
+                self._stats.expirations += 1
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return None, self._stats.version
+            self._entries.move_to_end(habit_id)
+            self._stats.hits += 1
+            return replace(entry.habit), self._stats.version
+
+    def put(self, habit: Habit, version: int) -> None:
+        with self._lock:
+            # a write happened while the caller was reading: may be stale
+            if version != self._stats.version:
+                return
+            self._entries[habit.id] = _Entry(
+                habit=replace(habit),
+                expires_at=self._clock() + self._ttl,
+            )
+            self._entries.move_to_end(habit.id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def get_all(self) -> tuple[list[Habit] | None, int]:
+        with self._lock:
+            snapshot = self._snapshot
+            if (
+                snapshot is not None
+                and snapshot.version == self._stats.version
+                and snapshot.expires_at > self._clock()
+            ):
+                self._stats.hits += 1
+                return [replace(h) for h in snapshot.habits], self._stats.version
+            self._stats.misses += 1
+            return None, self._stats.version
+
+    def put_all(self, habits: list[Habit], version: int) -> None:
+        with self._lock:
+            if version != self._stats.version:
+                return
+            self._snapshot = _Snapshot(
+                habits=[replace(habit) for habit in habits],
+                version=version,
+                expires_at=self._clock() + self._ttl,
+            )
+
+    def invalidate(self, habit_id: UUID | None = None) -> None:
+        """Drop one habit (and the snapshot), or everything if None."""
+        with self._lock:
+            self._stats.version += 1
+            self._stats.invalidations += 1
+            self._snapshot = None
+            if habit_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(habit_id, None)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return replace(self._stats, size=len(self._entries))
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            return self._stats.version
+
+
+class CachedHabitRepository(HabitRepository):
+    """
+    Read-through HabitRepository on top of a HabitCache.
+
+    Misses ("not found") are not cached. Callers get copies: services
+    mutate the habits they load before calling update().
+
+    Inside a unit of work (`deferred=True`):
+    - rows are only stored under the version seen when the transaction
+      started; its snapshot may predate later commits of other requests
+    - writes are only visible to others after the commit, so they
+      invalidate both immediately and again in `flush()`, which the unit
+      of work calls once it has ended
+    """
+
+    def __init__(
+        self,
+        inner: HabitRepository,
+        cache: HabitCache,
+        deferred: bool = False,
+    ) -> None:
+        self._inner = inner
+        self._cache = cache
+        self._deferred = deferred
+        self._pending: list[UUID | None] = []
+        self._since = cache.version if deferred else None
+
+    def create(self, habit: Habit) -> None:
+        self._inner.create(habit)
+        self._invalidate(habit.id)
+
+    def get_by_id(self, habit_id: UUID) -> Habit | None:
+        habit, version = self._cache.get(habit_id)
+        if habit is not None:
+            return habit
+
+        habit = self._inner.get_by_id(habit_id)
+        if habit is not None:
+            self._cache.put(habit, self._version(version))
+        return habit
+
+    def get_all(self) -> list[Habit]:
+        habits, version = self._cache.get_all()
+        if habits is not None:
+            return habits
+
+        habits = self._inner.get_all()
+        self._cache.put_all(habits, self._version(version))
+        return habits
+
+    def get_page(
+        self,
+        limit: int,
+        after: HabitPageKey | None = None,
+        filters: HabitFilter | None = None,
+    ) -> list[Habit]:
+        # pages are cheap index range scans; not worth caching
+        return self._inner.get_page(limit, after, filters)
+
+    def search(self, text: str, limit: int) -> list[Habit]:
+        return self._inner.search(text, limit)
+
+    def get_subtree(self, habit_id: UUID, max_depth: int | None = None) -> list[Habit]:
+        # one query either way; caching it would need tree-wide invalidation
+        return self._inner.get_subtree(habit_id, max_depth)
+
+    def is_descendant(self, habit_id: UUID, ancestor_id: UUID) -> bool:
+        return self._inner.is_descendant(habit_id, ancestor_id)
+
+    def update(self, habit: Habit) -> None:
+        self._inner.update(habit)
+        self._invalidate(habit.id)
+
+    def delete(self, habit_id: UUID) -> None:
+        self._inner.delete(habit_id)
+        # ON DELETE CASCADE also removes sub-habits: drop every entry
+        self._invalidate(None)
+
+    def flush(self) -> None:
+        """Repeat the invalidations of a unit of work after it ended."""
+        pending, self._pending = self._pending, []
+        for habit_id in pending:
+            self._cache.invalidate(habit_id)
+
+    def _version(self, seen: int) -> int:
+        return self._since if self._since is not None else seen
+
+    def _invalidate(self, habit_id: UUID | None) -> None:
+        self._cache.invalidate(habit_id)
+        if self._deferred:
+            self._pending.append(habit_id)
+
+
+# one cache per tenant, so habits never cross tenants; bounded like the shards
+_caches: OrderedDict[str | None, HabitCache] = OrderedDict()
+_caches_lock = threading.Lock()
+
+
+def get_habit_cache() -> HabitCache | None:
+    """
+    Cache of the current tenant's habits, shared by all requests of this
+    process, so a write in one request invalidates what the others of
+    this process have cached. Writes of other processes are not seen
+    until the TTL runs out: src/main.py turns the cache off (with
+    HABIT_CACHE_SIZE=0, which disables it) when it starts several workers.
+    """
+    settings = get_settings()
+    if settings.habit_cache_size <= 0:
+        return None
+    tenant = current_tenant()
+    with _caches_lock:
+        cache = _caches.get(tenant)
+        if cache is not None:
+            _caches.move_to_end(tenant)
+            return cache
+        cache = _caches[tenant] = HabitCache(
+            max_size=settings.habit_cache_size,
+            ttl=settings.habit_cache_ttl,
+        )
+        # the default database's cache counts as one more shard
+        while len(_caches) > max(settings.shard_cache_size, 1) + 1:
+            _caches.popitem(last=False)
+        return cache
+
+
+def _forget_caches() -> None:
+    # a forked worker starts with empty caches (and an unheld lock)
+    global _caches, _caches_lock
+    _caches = OrderedDict()
+    _caches_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_caches)
+
+
+def habit_cache_stats() -> CacheStats | None:
+    """Counters of the current tenant's habit cache, None if it is disabled."""
+    cache = get_habit_cache()
+    return cache.stats() if cache is not None else None
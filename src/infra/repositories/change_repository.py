@@ -0,0 +1,73 @@
+# src/infra/repositories/change_repository.py
+
+import sqlite3
+from datetime import UTC, datetime
+from uuid import UUID
+
+from src.core.entities.change_version import ChangeVersion
+from src.core.interface.async_repositories import AsyncChangeRepository
+from src.core.interface.repositories import ChangeRepository
+from src.infra.async_database import get_async_db
+from src.infra.database import storage_format
+from src.infra.repositories.sqlite_repository import SQLiteRepository
+
+# both tables are kept current by triggers (see migration 9)
+SELECT_HABIT_VERSION = """
+    SELECT version, modified_at
+      FROM habit_changes
+     WHERE habit_id = ?
+"""
+
+SELECT_HABITS_VERSION = """
+    SELECT version, modified_at
+      FROM change_counters
+     WHERE name = 'habits'
+"""
+
+
+def _row_to_version(row: sqlite3.Row) -> ChangeVersion:
+    return ChangeVersion(
+        version=row["version"],
+        modified_at=datetime.fromtimestamp(row["modified_at"], UTC),
+    )
+
+
+class SQLiteChangeRepository(SQLiteRepository, ChangeRepository):
+    """
+    SQLite implementation of ChangeRepository.
+    Each read is a primary-key lookup; no habit or log rows are touched.
+    """
+
+    def get_habit_version(self, habit_id: UUID) -> ChangeVersion | None:
+        params = (self._format.encode_uuid(habit_id),)
+        with self._connection() as db:
+            row = db.execute(SELECT_HABIT_VERSION, params).fetchone()
+        return None if row is None else _row_to_version(row)
+
+    def get_habits_version(self) -> ChangeVersion:
+        with self._connection() as db:
+            row = db.execute(SELECT_HABITS_VERSION).fetchone()
+        return _row_to_version(row)
+
+
+class AsyncSQLiteChangeRepository(AsyncChangeRepository):
+    """aiosqlite implementation of AsyncChangeRepository (same SQL)."""
+
+    async def get_habit_version(self, habit_id: UUID) -> ChangeVersion | None:
+        params = (storage_format().encode_uuid(habit_id),)
+        async with (
+            get_async_db() as db,
+            db.execute(SELECT_HABIT_VERSION, params) as cursor,
+        ):
+            row = await cursor.fetchone()
+        return None if row is None else _row_to_version(row)
+
+    async def get_habits_version(self) -> ChangeVersion:
+        async with (
+            get_async_db() as db,
+            db.execute(SELECT_HABITS_VERSION) as cursor,
+        ):
+            row = await cursor.fetchone()
+        if row is None:
+            raise RuntimeError("Missing change counter, run the migrations")
+        return _row_to_version(row)
@@ -0,0 +1,57 @@
+# src/infra/repositories/group_commit_log_repository.py
+
+import asyncio
+import sqlite3
+
+from src.core.entities.habit_log import HabitLog
+from src.infra.group_commit import GroupCommitWriter, get_group_commit_writer
+from src.infra.repositories.habit_log_repository import (
+    AsyncSQLiteHabitLogRepository,
+    SQLiteHabitLogRepository,
+)
+
+
+class GroupCommitHabitLogRepository(SQLiteHabitLogRepository):
+    """
+    SQLiteHabitLogRepository whose inserts go through a GroupCommitWriter.
+
+    Reads still use the bound connection (or pool). Inserts are committed
+    by the writer thread, not by the caller's unit of work, and have been
+    committed by the time create() / create_many() return.
+    """
+
+    def __init__(
+        self,
+        writer: GroupCommitWriter,
+        conn: sqlite3.Connection | None = None,
+        read_only: bool = False,
+    ) -> None:
+        super().__init__(conn, read_only)
+        self._writer = writer
+
+    def create(self, log: HabitLog) -> None:
+        self._writer.write([log])
+
+    def create_many(self, logs: list[HabitLog]) -> None:
+        self._writer.write(logs)
+
+
+class AsyncGroupCommitHabitLogRepository(AsyncSQLiteHabitLogRepository):
+    """AsyncSQLiteHabitLogRepository whose inserts go through a GroupCommitWriter."""
+
+    def __init__(self, writer: GroupCommitWriter) -> None:
+        self._writer = writer
+
+    async def create(self, log: HabitLog) -> None:
+        await asyncio.wrap_future(self._writer.submit([log]))
+
+    async def create_many(self, logs: list[HabitLog]) -> None:
+        await asyncio.wrap_future(self._writer.submit(logs))
+
+
+def create_async_log_repository() -> AsyncSQLiteHabitLogRepository:
+    """Group-commit inserts if HABIT_GROUP_COMMIT_SIZE is set."""
+    writer = get_group_commit_writer()
+    if writer is None:
+        return AsyncSQLiteHabitLogRepository()
+    return AsyncGroupCommitHabitLogRepository(writer)
@@ -0,0 +1,23 @@
+# src/infra/repositories/habit_analytics_repository.py
+
+from datetime import date
+
+from src.core.entities.habit import Habit
+from src.core.entities.habit_analytics import HabitAnalytics
+from src.core.interface.repositories import HabitAnalyticsRepository
+from src.infra.analytics import compute_analytics, load_daily_series
+from src.infra.repositories.sqlite_repository import SQLiteRepository
+
+
+class SQLiteHabitAnalyticsRepository(SQLiteRepository, HabitAnalyticsRepository):
+    """
+    SQLite implementation of HabitAnalyticsRepository.
+    Logs are summed per day in SQL; the metrics are computed with NumPy
+    (see src/infra/analytics.py).
+    """
+
+    def get_analytics(self, habit: Habit, as_of: date) -> HabitAnalytics:
+        fmt = self._format
+        with self._connection() as db:
+            series = load_daily_series(db, fmt, habit.id, as_of)
+        return compute_analytics(habit, series, as_of)
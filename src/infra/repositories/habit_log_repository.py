@@ -1,36 +1,174 @@
 # src/infra/repositories/habit_log_repository.py
 
+import sqlite3
+from collections import defaultdict
+from collections.abc import Iterator
 from datetime import date
 from uuid import UUID
 
 from src.core.entities.habit_log import HabitLog
-from src.core.interface.repositories import HabitLogRepository
-from src.infra.database import get_db
+from src.core.entities.log_rollup import LogRollup, RollupBucket
+from src.core.interface.async_repositories import AsyncHabitLogRepository
+from src.core.interface.repositories import (
+    HabitLogRepository,
+    LogPageKey,
+    RollupPageKey,
+)
+from src.infra.async_database import get_async_db
+from src.infra.database import get_db, storage_format
+from src.infra.materialized_stats import (
+    record_batch,
+    record_batch_async,
+    record_log,
+    record_log_async,
+)
+from src.infra.repositories.sqlite_repository import SQLiteRepository
+from src.infra.rollups import record_rollups, record_rollups_async
+from src.infra.storage_format import StorageFormat
 
+INSERT_LOG = """
+    INSERT INTO habit_logs (
+        id,
+        habit_id,
+        date,
+        value
+    )
+    VALUES (?, ?, ?, ?)
+"""
 
-class SQLiteHabitLogRepository(HabitLogRepository):
+
+def _log_params(log: HabitLog, fmt: StorageFormat) -> tuple[object, ...]:
+    return (
+        fmt.encode_uuid(log.id),
+        fmt.encode_uuid(log.habit_id),
+        fmt.encode_day(log.date),
+        log.value,
+    )
+
+
+def _select_for_habit(
+    habit_id: UUID,
+    start: date | None,
+    end: date | None,
+    fmt: StorageFormat,
+    after: LogPageKey | None = None,
+) -> tuple[str, list[object]]:
+    query = """
+        SELECT
+            id,
+            habit_id,
+            date,
+            value
+        FROM habit_logs
+        WHERE habit_id = ?
+    """
+    params: list[object] = [fmt.encode_uuid(habit_id)]
+
+    if start is not None:
+        query += " AND date >= ?"
+        params.append(fmt.encode_day(start))
+    if end is not None:
+        query += " AND date <= ?"
+        params.append(fmt.encode_day(end))
+    if after is not None:
+        query += " AND (date, id) > (?, ?)"
+        params += [fmt.encode_day(after[0]), fmt.encode_uuid(after[1])]
+
+    # (habit_id, date, id) is the idx_habit_logs_page index order
+    query += " ORDER BY date ASC, id ASC"
+    return query, params
+
+
+def _select_rollups(
+    habit_id: UUID,
+    bucket: RollupBucket,
+    start: date | None,
+    end: date | None,
+    fmt: StorageFormat,
+    after: RollupPageKey | None = None,
+) -> tuple[str, list[object]]:
+    # served by the (habit_id, bucket, bucket_start) primary key
+    query = """
+        SELECT
+            habit_id,
+            bucket,
+            bucket_start,
+            total,
+            log_count,
+            min_value,
+            max_value
+        FROM habit_log_rollups
+        WHERE habit_id = ? AND bucket = ?
+    """
+    params: list[object] = [fmt.encode_uuid(habit_id), bucket.value]
+
+    if start is not None:
+        # the bucket containing `start` overlaps the range
+        query += " AND bucket_start >= ?"
+        params.append(fmt.encode_day(bucket.start_of(start)))
+    if end is not None:
+        query += " AND bucket_start <= ?"
+        params.append(fmt.encode_day(end))
+    if after is not None:
+        query += " AND bucket_start > ?"
+        params.append(fmt.encode_day(after))
+
+    query += " ORDER BY bucket_start ASC LIMIT ?"
+    return query, params
+
+
+def _group_by_habit(logs: list[HabitLog]) -> dict[UUID, list[tuple[date, float]]]:
+    by_habit: defaultdict[UUID, list[tuple[date, float]]] = defaultdict(list)
+    for log in logs:
+        by_habit[log.habit_id].append((log.date, log.value))
+    return by_habit
+
+
+def insert_logs(
+    db: sqlite3.Connection, fmt: StorageFormat, logs: list[HabitLog]
+) -> None:
+    """Insert logs and update their stats and rollups, in the caller's transaction."""
+    db.executemany(INSERT_LOG, [_log_params(log, fmt) for log in logs])
+    for habit_id, entries in _group_by_habit(logs).items():
+        record_batch(db, fmt, habit_id, entries)
+        record_rollups(db, fmt, habit_id, entries)
+
+
+def _row_to_rollup(row: sqlite3.Row, fmt: StorageFormat) -> LogRollup:
+    return LogRollup(
+        habit_id=fmt.decode_uuid(row["habit_id"]),
+        bucket=RollupBucket(row["bucket"]),
+        start=fmt.decode_day(row["bucket_start"]),
+        total=row["total"],
+        log_count=row["log_count"],
+        min_value=row["min_value"],
+        max_value=row["max_value"],
+    )
+
+
+def _row_to_log(row: sqlite3.Row, fmt: StorageFormat) -> HabitLog:
+    return HabitLog(
+        id=fmt.decode_uuid(row["id"]),
+        habit_id=fmt.decode_uuid(row["habit_id"]),
+        date=fmt.decode_day(row["date"]),
+        value=row["value"],
+    )
+
+
+class SQLiteHabitLogRepository(SQLiteRepository, HabitLogRepository):
     """SQLite implementation of HabitLogRepository."""
 
     def create(self, log: HabitLog) -> None:
-        with get_db() as db:
-            db.execute(
-                """
-                INSERT INTO habit_logs (
-                    id,
-                    habit_id,
-                    date,
-                    value
-                )
-                VALUES (?, ?, ?, ?)
-                """,
-                (
-                    str(log.id),
-                    str(log.habit_id),
-                    log.date.isoformat(),
-                    log.value,
-                ),
-            )
-            db.commit()
+        fmt = self._format
+        with self._transaction() as db:
+            db.execute(INSERT_LOG, _log_params(log, fmt))
+            record_log(db, fmt, log.habit_id, log.date, log.value)
+            record_rollups(db, fmt, log.habit_id, [(log.date, log.value)])
+
+    def create_many(self, logs: list[HabitLog]) -> None:
+        fmt = self._format
+        with self._transaction() as db:
+            insert_logs(db, fmt, logs)
 
     def list_for_habit(
         self,
@@ -38,37 +176,127 @@ class SQLiteHabitLogRepository(HabitLogRepository):
         start: date | None = None,
         end: date | None = None,
     ) -> list[HabitLog]:
-        query = """
-            SELECT
-                id,
-                habit_id,
-                date,
-                value
-            FROM habit_logs
-            WHERE habit_id = ?
-        """
-        params: list[str] = [str(habit_id)]
-
-        if start is not None:
-            query += " AND date >= ?"
-            params.append(start.isoformat())
-        if end is not None:
-            query += " AND date <= ?"
-            params.append(end.isoformat())
-
-        query += " ORDER BY date ASC"
-
-        with get_db() as db:
+        fmt = self._format
+        query, params = _select_for_habit(habit_id, start, end, fmt)
+
+        with self._connection() as db:
             rows = db.execute(query, params).fetchall()
 
-        logs: list[HabitLog] = []
-        for row in rows:
-            logs.append(
-                HabitLog(
-                    id=UUID(row["id"]),
-                    habit_id=UUID(row["habit_id"]),
-                    date=date.fromisoformat(row["date"]),
-                    value=row["value"],
-                )
-            )
-        return logs
+        return [_row_to_log(row, fmt) for row in rows]
+
+    def list_page(
+        self,
+        habit_id: UUID,
+        limit: int,
+        after: LogPageKey | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> list[HabitLog]:
+        fmt = self._format
+        query, params = _select_for_habit(habit_id, start, end, fmt, after)
+
+        with self._connection() as db:
+            rows = db.execute(f"{query} LIMIT ?", [*params, limit]).fetchall()
+
+        return [_row_to_log(row, fmt) for row in rows]
+
+    def iter_for_habit(
+        self,
+        habit_id: UUID,
+        start: date | None = None,
+        end: date | None = None,
+        chunk_size: int = 500,
+    ) -> Iterator[HabitLog]:
+        fmt = self._format
+        query, params = _select_for_habit(habit_id, start, end, fmt)
+
+        # Always a connection of its own, even inside a unit of work: the
+        # stream is consumed after the request's transaction has ended.
+        # It stays checked out until the iterator is exhausted or closed;
+        # only `chunk_size` rows are held in memory at a time.
+        with get_db(read_only=True) as db:
+            cursor = db.execute(query, params)
+            try:
+                while rows := cursor.fetchmany(chunk_size):
+                    for row in rows:
+                        yield _row_to_log(row, fmt)
+            finally:
+                cursor.close()
+
+    def list_rollups(
+        self,
+        habit_id: UUID,
+        bucket: RollupBucket,
+        limit: int,
+        after: RollupPageKey | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> list[LogRollup]:
+        fmt = self._format
+        query, params = _select_rollups(habit_id, bucket, start, end, fmt, after)
+
+        with self._connection() as db:
+            rows = db.execute(query, [*params, limit]).fetchall()
+
+        return [_row_to_rollup(row, fmt) for row in rows]
+
+
+class AsyncSQLiteHabitLogRepository(AsyncHabitLogRepository):
+    """aiosqlite implementation of AsyncHabitLogRepository (same SQL)."""
+
+    async def create(self, log: HabitLog) -> None:
+        fmt = storage_format()
+        async with get_async_db() as db:
+            await db.execute(INSERT_LOG, _log_params(log, fmt))
+            await record_log_async(db, fmt, log.habit_id, log.date, log.value)
+            await record_rollups_async(db, fmt, log.habit_id, [(log.date, log.value)])
+            await db.commit()
+
+    async def create_many(self, logs: list[HabitLog]) -> None:
+        fmt = storage_format()
+        async with get_async_db() as db:
+            await db.executemany(INSERT_LOG, [_log_params(log, fmt) for log in logs])
+            for habit_id, entries in _group_by_habit(logs).items():
+                await record_batch_async(db, fmt, habit_id, entries)
+                await record_rollups_async(db, fmt, habit_id, entries)
+            await db.commit()
+
+    async def list_page(
+        self,
+        habit_id: UUID,
+        limit: int,
+        after: LogPageKey | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> list[HabitLog]:
+        fmt = storage_format()
+        query, params = _select_for_habit(habit_id, start, end, fmt, after)
+        page_params: list[object] = [*params, limit]
+
+        async with (
+            get_async_db() as db,
+            db.execute(f"{query} LIMIT ?", page_params) as cursor,
+        ):
+            rows = await cursor.fetchall()
+
+        return [_row_to_log(row, fmt) for row in rows]
+
+    async def list_rollups(
+        self,
+        habit_id: UUID,
+        bucket: RollupBucket,
+        limit: int,
+        after: RollupPageKey | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> list[LogRollup]:
+        fmt = storage_format()
+        query, params = _select_rollups(habit_id, bucket, start, end, fmt, after)
+
+        async with (
+            get_async_db() as db,
+            db.execute(query, [*params, limit]) as cursor,
+        ):
+            rows = await cursor.fetchall()
+
+        return [_row_to_rollup(row, fmt) for row in rows]
@@ -1,149 +1,383 @@
 # src/infra/repositories/habit_repository.py
 
-from datetime import date
+import re
+import sqlite3
 from uuid import UUID
 
 from src.core.entities.habit import Habit, HabitType
-from src.core.interface.repositories import HabitRepository
-from src.infra.database import get_db
+from src.core.entities.habit_filter import HabitFilter
+from src.core.interface.async_repositories import AsyncHabitRepository
+from src.core.interface.repositories import HabitPageKey, HabitRepository
+from src.infra.async_database import get_async_db
+from src.infra.database import storage_format
+from src.infra.repositories.sqlite_repository import SQLiteRepository
+from src.infra.storage_format import StorageFormat
 
+SELECT_HABIT = """
+    SELECT
+        id,
+        name,
+        description,
+        category,
+        type,
+        goal,
+        created_at,
+        parent_id
+    FROM habits
+"""
 
-class SQLiteHabitRepository(HabitRepository):
+ORDER_BY_PAGE_KEY = "ORDER BY created_at ASC, name ASC, id ASC"
+
+INSERT_HABIT = """
+    INSERT INTO habits (
+        id,
+        name,
+        description,
+        category,
+        type,
+        goal,
+        created_at,
+        parent_id
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE_HABIT = """
+    UPDATE habits
+    SET
+        name = ?,
+        description = ?,
+        category = ?,
+        type = ?,
+        goal = ?,
+        created_at = ?,
+        parent_id = ?
+    WHERE id = ?
+"""
+
+# delete logs first to keep referential integrity
+DELETE_HABIT = (
+    "DELETE FROM habit_logs WHERE habit_id = ?",
+    "DELETE FROM habits WHERE id = ?",
+)
+
+
+# one indexed range scan of the closure table, parents before children
+SELECT_SUBTREE = """
+    SELECT
+        h.id,
+        h.name,
+        h.description,
+        h.category,
+        h.type,
+        h.goal,
+        h.created_at,
+        h.parent_id
+    FROM habit_closure AS c
+    JOIN habits AS h ON h.id = c.descendant_id
+    WHERE c.ancestor_id = ? AND c.depth <= ?
+    ORDER BY c.depth ASC, h.created_at ASC, h.name ASC, h.id ASC
+"""
+
+SELECT_IS_DESCENDANT = """
+    SELECT 1
+      FROM habit_closure
+     WHERE ancestor_id = ? AND descendant_id = ?
+"""
+
+# habits_fts shares rowids with habits; ranked by bm25, best first
+SELECT_SEARCH = """
+    SELECT
+        h.id,
+        h.name,
+        h.description,
+        h.category,
+        h.type,
+        h.goal,
+        h.created_at,
+        h.parent_id
+    FROM habits_fts
+    JOIN habits AS h ON h.rowid = habits_fts.rowid
+    WHERE habits_fts MATCH ?
+    ORDER BY habits_fts.rank
+    LIMIT ?
+"""
+
+# deeper than any real routine; SQLite integers cannot be unbounded
+UNLIMITED_DEPTH = 2**31
+
+
+def _subtree_params(
+    habit_id: UUID, max_depth: int | None, fmt: StorageFormat
+) -> tuple[object, int]:
+    depth = UNLIMITED_DEPTH if max_depth is None else max_depth
+    return fmt.encode_uuid(habit_id), depth
+
+
+def _insert_params(habit: Habit, fmt: StorageFormat) -> tuple[object, ...]:
+    return (
+        fmt.encode_uuid(habit.id),
+        habit.name,
+        habit.description,
+        habit.category,
+        habit.type.value,
+        habit.goal,
+        fmt.encode_day(habit.created_at),
+        fmt.encode_optional_uuid(habit.parent_id),
+    )
+
+
+def _update_params(habit: Habit, fmt: StorageFormat) -> tuple[object, ...]:
+    # same columns as INSERT, with the id moved to the WHERE clause
+    habit_id, *columns = _insert_params(habit, fmt)
+    return (*columns, habit_id)
+
+
+def _filter_conditions(
+    filters: HabitFilter, fmt: StorageFormat
+) -> tuple[list[str], list[object]]:
+    # each has an index ending in the page key (created_at, name, id)
+    conditions: list[str] = []
+    params: list[object] = []
+    if filters.category is not None:
+        conditions.append("category = ?")
+        params.append(filters.category)
+    if filters.type is not None:
+        conditions.append("type = ?")
+        params.append(filters.type.value)
+    if filters.parent_id is not None:
+        conditions.append("parent_id = ?")
+        params.append(fmt.encode_uuid(filters.parent_id))
+    if filters.has_goal is not None:
+        # same expression as idx_habits_has_goal
+        conditions.append("(goal IS NOT NULL) = ?")
+        params.append(filters.has_goal)
+    return conditions, params
+
+
+def _select_page(
+    limit: int,
+    after: HabitPageKey | None,
+    fmt: StorageFormat,
+    filters: HabitFilter | None = None,
+) -> tuple[str, list[object]]:
+    conditions, params = _filter_conditions(filters or HabitFilter(), fmt)
+    if after is not None:
+        created_at, name, habit_id = after
+        # row-value comparison is answered by idx_habits_page
+        conditions.append("(created_at, name, id) > (?, ?, ?)")
+        params += [fmt.encode_day(created_at), name, fmt.encode_uuid(habit_id)]
+
+    query = SELECT_HABIT
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += f" {ORDER_BY_PAGE_KEY} LIMIT ?"
+    params.append(limit)
+    return query, params
+
+
+def _match_expression(text: str) -> str | None:
+    """
+    FTS5 query for free text: every word must match, the last one as a
+    prefix ("read bo" finds "Read book"). Words are quoted, so FTS5
+    operators and punctuation in `text` are taken literally.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    quoted = [f'"{word}"' for word in words]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _row_to_habit(row: sqlite3.Row, fmt: StorageFormat) -> Habit:
+    return Habit(
+        id=fmt.decode_uuid(row["id"]),
+        name=row["name"],
+        description=row["description"],
+        category=row["category"],
+        type=HabitType(row["type"]),
+        goal=row["goal"],
+        created_at=fmt.decode_day(row["created_at"]),
+        parent_id=fmt.decode_optional_uuid(row["parent_id"]),
+    )
+
+
+class SQLiteHabitRepository(SQLiteRepository, HabitRepository):
     """SQLite implementation of HabitRepository."""
 
     def create(self, habit: Habit) -> None:
-        with get_db() as db:
-            db.execute(
-                """
-                INSERT INTO habits (
-                    id,
-                    name,
-                    description,
-                    category,
-                    type,
-                    goal,
-                    created_at,
-                    parent_id
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    str(habit.id),
-                    habit.name,
-                    habit.description,
-                    habit.category,
-                    habit.type.value,
-                    habit.goal,
-                    habit.created_at.isoformat(),
-                    str(habit.parent_id) if habit.parent_id else None,
-                ),
-            )
-            db.commit()
+        fmt = self._format
+        with self._transaction() as db:
+            db.execute(INSERT_HABIT, _insert_params(habit, fmt))
 
     def get_by_id(self, habit_id: UUID) -> Habit | None:
-        with get_db() as db:
+        fmt = self._format
+        with self._connection() as db:
             row = db.execute(
-                """
-                SELECT
-                    id,
-                    name,
-                    description,
-                    category,
-                    type,
-                    goal,
-                    created_at,
-                    parent_id
-                FROM habits
-                WHERE id = ?
-                """,
-                (str(habit_id),),
+                f"{SELECT_HABIT} WHERE id = ?",
+                (fmt.encode_uuid(habit_id),),
             ).fetchone()
 
         if row is None:
             return None
-
-        return Habit(
-            id=UUID(row["id"]),
-            name=row["name"],
-            description=row["description"],
-            category=row["category"],
-            type=HabitType(row["type"]),
-            goal=row["goal"],
-            created_at=date.fromisoformat(row["created_at"]),
-            parent_id=UUID(row["parent_id"]) if row["parent_id"] else None,
-        )
+        return _row_to_habit(row, fmt)
 
     def get_all(self) -> list[Habit]:
-        with get_db() as db:
-            rows = db.execute(
-                """
-                SELECT
-                    id,
-                    name,
-                    description,
-                    category,
-                    type,
-                    goal,
-                    created_at,
-                    parent_id
-                FROM habits
-                ORDER BY created_at ASC, name ASC
-                """
-            ).fetchall()
-
-        habits: list[Habit] = []
-        for row in rows:
-            habits.append(
-                Habit(
-                    id=UUID(row["id"]),
-                    name=row["name"],
-                    description=row["description"],
-                    category=row["category"],
-                    type=HabitType(row["type"]),
-                    goal=row["goal"],
-                    created_at=date.fromisoformat(row["created_at"]),
-                    parent_id=UUID(row["parent_id"]) if row["parent_id"] else None,
-                )
-            )
-        return habits
+        fmt = self._format
+        with self._connection() as db:
+            rows = db.execute(f"{SELECT_HABIT} {ORDER_BY_PAGE_KEY}").fetchall()
+
+        return [_row_to_habit(row, fmt) for row in rows]
+
+    def get_page(
+        self,
+        limit: int,
+        after: HabitPageKey | None = None,
+        filters: HabitFilter | None = None,
+    ) -> list[Habit]:
+        fmt = self._format
+        query, params = _select_page(limit, after, fmt, filters)
+
+        with self._connection() as db:
+            rows = db.execute(query, params).fetchall()
+
+        return [_row_to_habit(row, fmt) for row in rows]
+
+    def search(self, text: str, limit: int) -> list[Habit]:
+        match = _match_expression(text)
+        if match is None:
+            return []
+        fmt = self._format
+
+        with self._connection() as db:
+            rows = db.execute(SELECT_SEARCH, (match, limit)).fetchall()
+
+        return [_row_to_habit(row, fmt) for row in rows]
 
     def update(self, habit: Habit) -> None:
-        with get_db() as db:
-            db.execute(
-                """
-                UPDATE habits
-                SET
-                    name = ?,
-                    description = ?,
-                    category = ?,
-                    type = ?,
-                    goal = ?,
-                    created_at = ?,
-                    parent_id = ?
-                WHERE id = ?
-                """,
-                (
-                    habit.name,
-                    habit.description,
-                    habit.category,
-                    habit.type.value,
-                    habit.goal,
-                    habit.created_at.isoformat(),
-                    str(habit.parent_id) if habit.parent_id else None,
-                    str(habit.id),
-                ),
-            )
-            db.commit()
+        fmt = self._format
+        with self._transaction() as db:
+            db.execute(UPDATE_HABIT, _update_params(habit, fmt))
 
     def delete(self, habit_id: UUID) -> None:
-        with get_db() as db:
-            # delete logs first to keep referential integrity
-            db.execute(
-                "DELETE FROM habit_logs WHERE habit_id = ?",
-                (str(habit_id),),
-            )
+        fmt = self._format
+        with self._transaction() as db:
+            for statement in DELETE_HABIT:
+                db.execute(statement, (fmt.encode_uuid(habit_id),))
+
+    def get_subtree(self, habit_id: UUID, max_depth: int | None = None) -> list[Habit]:
+        fmt = self._format
+        params = _subtree_params(habit_id, max_depth, fmt)
+
+        with self._connection() as db:
+            rows = db.execute(SELECT_SUBTREE, params).fetchall()
+
+        return [_row_to_habit(row, fmt) for row in rows]
+
+    def is_descendant(self, habit_id: UUID, ancestor_id: UUID) -> bool:
+        fmt = self._format
+        params = (fmt.encode_uuid(ancestor_id), fmt.encode_uuid(habit_id))
+
+        with self._connection() as db:
+            row = db.execute(SELECT_IS_DESCENDANT, params).fetchone()
+
+        return row is not None
+
+
+class AsyncSQLiteHabitRepository(AsyncHabitRepository):
+    """aiosqlite implementation of AsyncHabitRepository (same SQL)."""
+
+    async def create(self, habit: Habit) -> None:
+        fmt = storage_format()
+        async with get_async_db() as db:
+            await db.execute(INSERT_HABIT, _insert_params(habit, fmt))
+            await db.commit()
+
+    async def get_by_id(self, habit_id: UUID) -> Habit | None:
+        fmt = storage_format()
+        async with (
+            get_async_db() as db,
             db.execute(
-                "DELETE FROM habits WHERE id = ?",
-                (str(habit_id),),
-            )
-            db.commit()
+                f"{SELECT_HABIT} WHERE id = ?",
+                (fmt.encode_uuid(habit_id),),
+            ) as cursor,
+        ):
+            row = await cursor.fetchone()
+
+        if row is None:
+            return None
+        return _row_to_habit(row, fmt)
+
+    async def get_all(self) -> list[Habit]:
+        fmt = storage_format()
+        query = f"{SELECT_HABIT} {ORDER_BY_PAGE_KEY}"
+
+        async with get_async_db() as db, db.execute(query) as cursor:
+            rows = await cursor.fetchall()
+
+        return [_row_to_habit(row, fmt) for row in rows]
+
+    async def get_page(
+        self,
+        limit: int,
+        after: HabitPageKey | None = None,
+        filters: HabitFilter | None = None,
+    ) -> list[Habit]:
+        fmt = storage_format()
+        query, params = _select_page(limit, after, fmt, filters)
+
+        async with get_async_db() as db, db.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+
+        return [_row_to_habit(row, fmt) for row in rows]
+
+    async def search(self, text: str, limit: int) -> list[Habit]:
+        match = _match_expression(text)
+        if match is None:
+            return []
+        fmt = storage_format()
+
+        async with (
+            get_async_db() as db,
+            db.execute(SELECT_SEARCH, (match, limit)) as cursor,
+        ):
+            rows = await cursor.fetchall()
+
+        return [_row_to_habit(row, fmt) for row in rows]
+
+    async def update(self, habit: Habit) -> None:
+        fmt = storage_format()
+        async with get_async_db() as db:
+            await db.execute(UPDATE_HABIT, _update_params(habit, fmt))
+            await db.commit()
+
+    async def delete(self, habit_id: UUID) -> None:
+        fmt = storage_format()
+        async with get_async_db() as db:
+            for statement in DELETE_HABIT:
+                await db.execute(statement, (fmt.encode_uuid(habit_id),))
+            await db.commit()
+
+    async def get_subtree(
+        self, habit_id: UUID, max_depth: int | None = None
+    ) -> list[Habit]:
+        fmt = storage_format()
+        params = _subtree_params(habit_id, max_depth, fmt)
+
+        async with get_async_db() as db, db.execute(SELECT_SUBTREE, params) as cursor:
+            rows = await cursor.fetchall()
+
+        return [_row_to_habit(row, fmt) for row in rows]
+
+    async def is_descendant(self, habit_id: UUID, ancestor_id: UUID) -> bool:
+        fmt = storage_format()
+        params = (fmt.encode_uuid(ancestor_id), fmt.encode_uuid(habit_id))
+
+        async with (
+            get_async_db() as db,
+            db.execute(SELECT_IS_DESCENDANT, params) as cursor,
+        ):
+            row = await cursor.fetchone()
+
+        return row is not None
@@ -1,14 +1,188 @@
 # src/infra/repositories/habit_stats_repository.py
 
-from datetime import date, timedelta
+import sqlite3
+from collections.abc import Iterator
 from uuid import UUID
 
-from src.core.entities.habit_stats import HabitStats
+from src.core.entities.habit_stats import HabitStats, SubtreeStats
+from src.core.interface.async_repositories import AsyncHabitStatsRepository
 from src.core.interface.repositories import HabitStatsRepository
-from src.infra.database import get_db
+from src.infra.async_database import get_async_db
+from src.infra.database import storage_format
+from src.infra.repositories.sqlite_repository import SQLiteRepository
+from src.infra.routine_stats import routine_streaks, routine_streaks_async
+from src.infra.storage_format import StorageFormat
 
+# the habit and all of its descendants, from the closure table
+SUBTREE_FILTER = "id IN (SELECT descendant_id FROM habit_closure WHERE ancestor_id = ?)"
 
-class SQLiteHabitStatsRepository(HabitStatsRepository):
+# keeps every statement well below SQLite's bound-parameter limit
+MAX_IDS_PER_QUERY = 500
+
+# `selected` picks the habits ({habits_filter} is a condition on habits);
+# habits without logs come back with zeroed stats.
+SELECTED_HABITS_CTE = """
+    selected AS (
+        SELECT id, created_at, name
+          FROM habits
+         WHERE {habits_filter}
+    )
+"""
+
+# Gaps-and-islands: within a run of consecutive, distinct days
+# day_number(date) - row_number is constant ({day_number} is the storage
+# format's day number of the date column). It drops by one on a second log
+# for the same day and grows on a gap, so the current streak is the number
+# of trailing rows sharing the last row's island key.
+COMPUTED_STATS_QUERY = f"""
+    WITH {SELECTED_HABITS_CTE},
+    islands AS (
+        SELECT habit_id,
+               value,
+               ROW_NUMBER() OVER by_date AS rn,
+               {{day_number}} - ROW_NUMBER() OVER by_date AS island,
+               COUNT(*) OVER (PARTITION BY habit_id) AS log_count
+          FROM habit_logs
+         WHERE habit_id IN (SELECT id FROM selected)
+        WINDOW by_date AS (PARTITION BY habit_id ORDER BY date)
+    ),
+    per_habit AS (
+        SELECT i.habit_id,
+               SUM(i.value) AS total,
+               COUNT(*) AS log_count,
+               COUNT(*) - COALESCE(
+                   MAX(CASE WHEN i.island <> latest.island THEN i.rn END),
+                   0
+               ) AS current_streak
+          FROM islands AS i
+          JOIN islands AS latest
+            ON latest.habit_id = i.habit_id AND latest.rn = latest.log_count
+      GROUP BY i.habit_id
+    )
+    SELECT h.id AS habit_id,
+           COALESCE(p.total, 0.0) AS total,
+           COALESCE(p.log_count, 0) AS log_count,
+           COALESCE(p.current_streak, 0) AS current_streak
+      FROM selected AS h
+ LEFT JOIN per_habit AS p ON p.habit_id = h.id
+  ORDER BY h.created_at ASC, h.name ASC, h.id ASC
+"""
+
+MATERIALIZED_STATS_QUERY = f"""
+    WITH {SELECTED_HABITS_CTE}
+    SELECT h.id AS habit_id,
+           COALESCE(s.total, 0.0) AS total,
+           COALESCE(s.log_count, 0) AS log_count,
+           COALESCE(s.current_streak, 0) AS current_streak
+      FROM selected AS h
+ LEFT JOIN habit_stats AS s ON s.habit_id = h.id
+  ORDER BY h.created_at ASC, h.name ASC, h.id ASC
+"""
+
+
+def _row_to_stats(row: sqlite3.Row, fmt: StorageFormat) -> HabitStats:
+    log_count = row["log_count"]
+    return HabitStats(
+        habit_id=fmt.decode_uuid(row["habit_id"]),
+        total=row["total"],
+        current_streak=row["current_streak"],
+        average=row["total"] / log_count if log_count else 0.0,
+    )
+
+
+def _empty_stats(habit_id: UUID) -> HabitStats:
+    return HabitStats(
+        habit_id=habit_id,
+        total=0.0,
+        current_streak=0,
+        average=0.0,
+    )
+
+
+def _id_filters(
+    unique_ids: list[UUID], fmt: StorageFormat
+) -> Iterator[tuple[str, list[object]]]:
+    """`habits_filter` and params for each chunk of ids."""
+    for offset in range(0, len(unique_ids), MAX_IDS_PER_QUERY):
+        chunk = [
+            fmt.encode_uuid(i) for i in unique_ids[offset : offset + MAX_IDS_PER_QUERY]
+        ]
+        placeholders = ", ".join("?" * len(chunk))
+        yield f"id IN ({placeholders})", chunk
+
+
+def _subtree_stats(
+    habit_id: UUID,
+    rows: list[sqlite3.Row],
+    fmt: StorageFormat,
+    streaks: tuple[int, int],
+) -> SubtreeStats:
+    total = sum(row["total"] for row in rows)
+    log_count = sum(row["log_count"] for row in rows)
+    any_streak, all_streak = streaks
+    return SubtreeStats(
+        habit_id=habit_id,
+        total=total,
+        average=total / log_count if log_count else 0.0,
+        any_streak=any_streak,
+        all_streak=all_streak,
+        habits=[_row_to_stats(row, fmt) for row in rows],
+    )
+
+
+def _in_input_order(
+    unique_ids: list[UUID], stats: list[HabitStats]
+) -> list[HabitStats]:
+    by_id = {s.habit_id: s for s in stats}
+    return [by_id[i] for i in unique_ids if i in by_id]
+
+
+class _QueryHabitStatsRepository(SQLiteRepository, HabitStatsRepository):
+    """Runs `_query` for one habit, a list of habits, or all habits."""
+
+    _query: str
+
+    def get_stats(self, habit_id: UUID) -> HabitStats:
+        fmt = self._format
+        stats = self._fetch(fmt, "id = ?", [fmt.encode_uuid(habit_id)])
+        return stats[0] if stats else _empty_stats(habit_id)
+
+    def get_stats_many(self, habit_ids: list[UUID] | None = None) -> list[HabitStats]:
+        fmt = self._format
+        if habit_ids is None:
+            return self._fetch(fmt, "1", [])
+
+        unique_ids = list(dict.fromkeys(habit_ids))
+        fetched: list[HabitStats] = []
+        for habits_filter, params in _id_filters(unique_ids, fmt):
+            fetched += self._fetch(fmt, habits_filter, params)
+        return _in_input_order(unique_ids, fetched)
+
+    def get_subtree_stats(self, habit_id: UUID) -> SubtreeStats:
+        fmt = self._format
+        encoded_id = fmt.encode_uuid(habit_id)
+        query = self._format_query(fmt, SUBTREE_FILTER)
+        # one connection, so the rows and the streaks see the same logs
+        with self._connection() as db:
+            rows = db.execute(query, [encoded_id]).fetchall()
+            streaks = routine_streaks(db, fmt, habit_id)
+        return _subtree_stats(habit_id, rows, fmt, streaks)
+
+    def _format_query(self, fmt: StorageFormat, habits_filter: str) -> str:
+        return self._query.format(
+            habits_filter=habits_filter, day_number=fmt.day_number("date")
+        )
+
+    def _fetch(
+        self, fmt: StorageFormat, habits_filter: str, params: list[object]
+    ) -> list[HabitStats]:
+        query = self._format_query(fmt, habits_filter)
+        with self._connection() as db:
+            rows = db.execute(query, params).fetchall()
+        return [_row_to_stats(row, fmt) for row in rows]
+
+
+class SQLiteHabitStatsRepository(_QueryHabitStatsRepository):
     """
     SQLite implementation of HabitStatsRepository.
 
@@ -18,63 +192,101 @@ class SQLiteHabitStatsRepository(HabitStatsRepository):
     - current_streak:
         number of consecutive days with at least one log,
         counting backwards from the most recent log date.
+
+    Everything is aggregated inside SQLite (see COMPUTED_STATS_QUERY);
+    no log rows are loaded into Python.
     """
 
-    def get_stats(self, habit_id: UUID) -> HabitStats:
-        # Fetch all logs for this habit, ordered by date
-        with get_db() as db:
-            rows = db.execute(
-                """
-                SELECT date, value
-                  FROM habit_logs
-                 WHERE habit_id = ?
-              ORDER BY date ASC
-                """,
-                (str(habit_id),),
-            ).fetchall()
-
-        # No logs → empty stats
-        if not rows:
-            return HabitStats(
-                habit_id=habit_id,
-                total=0.0,
-                current_streak=0,
-                average=0.0,
-            )
-
-        # Convert rows to Python types
-        dates: list[date] = []
-        values: list[float] = []
-
-        for row in rows:
-            dates.append(date.fromisoformat(row["date"]))
-            values.append(float(row["value"]))
-
-        total = sum(values)
-        count = len(values)
-        average = total / count if count > 0 else 0.0
-
-        # --- current streak calculation ---
-        # Start from the last (most recent) log date
-        last_date = dates[-1]
-        streak = 1
-        expected = last_date - timedelta(days=1)
-
-        # Walk backward through previous dates
-        for idx in range(len(dates) - 2, -1, -1):
-            current_date = dates[idx]
-
-            if current_date == expected:
-                streak += 1
-                expected -= timedelta(days=1)
-            elif current_date < expected:
-                break
-            else:
-                break
-
-        return HabitStats(
-            habit_id=habit_id,
-            total=total,
-            current_streak=streak,
-            average=average,
+    _query = COMPUTED_STATS_QUERY
+
+
+class MaterializedHabitStatsRepository(_QueryHabitStatsRepository):
+    """
+    HabitStatsRepository backed by the `habit_stats` table, which
+    SQLiteHabitLogRepository keeps up to date on every insert.
+    Reading stats is a primary-key lookup per habit.
+    """
+
+    _query = MATERIALIZED_STATS_QUERY
+
+
+class _AsyncQueryHabitStatsRepository(AsyncHabitStatsRepository):
+    """Async counterpart of _QueryHabitStatsRepository."""
+
+    _query: str
+
+    async def get_stats(self, habit_id: UUID) -> HabitStats:
+        fmt = storage_format()
+        stats = await self._fetch(fmt, "id = ?", [fmt.encode_uuid(habit_id)])
+        return stats[0] if stats else _empty_stats(habit_id)
+
+    async def get_stats_many(
+        self, habit_ids: list[UUID] | None = None
+    ) -> list[HabitStats]:
+        fmt = storage_format()
+        if habit_ids is None:
+            return await self._fetch(fmt, "1", [])
+
+        unique_ids = list(dict.fromkeys(habit_ids))
+        fetched: list[HabitStats] = []
+        for habits_filter, params in _id_filters(unique_ids, fmt):
+            fetched += await self._fetch(fmt, habits_filter, params)
+        return _in_input_order(unique_ids, fetched)
+
+    async def get_subtree_stats(self, habit_id: UUID) -> SubtreeStats:
+        fmt = storage_format()
+        query = self._format_query(fmt, SUBTREE_FILTER)
+        async with get_async_db() as db:
+            async with db.execute(query, [fmt.encode_uuid(habit_id)]) as cursor:
+                rows = list(await cursor.fetchall())
+            streaks = await routine_streaks_async(db, fmt, habit_id)
+        return _subtree_stats(habit_id, rows, fmt, streaks)
+
+    def _format_query(self, fmt: StorageFormat, habits_filter: str) -> str:
+        return self._query.format(
+            habits_filter=habits_filter, day_number=fmt.day_number("date")
         )
+
+    async def _fetch(
+        self, fmt: StorageFormat, habits_filter: str, params: list[object]
+    ) -> list[HabitStats]:
+        query = self._format_query(fmt, habits_filter)
+        async with get_async_db() as db, db.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+        return [_row_to_stats(row, fmt) for row in rows]
+
+
+class AsyncSQLiteHabitStatsRepository(_AsyncQueryHabitStatsRepository):
+    """aiosqlite version of SQLiteHabitStatsRepository."""
+
+    _query = COMPUTED_STATS_QUERY
+
+
+class AsyncMaterializedHabitStatsRepository(_AsyncQueryHabitStatsRepository):
+    """aiosqlite version of MaterializedHabitStatsRepository."""
+
+    _query = MATERIALIZED_STATS_QUERY
+
+
+def create_stats_repository(
+    backend: str, conn: sqlite3.Connection | None = None, read_only: bool = False
+) -> HabitStatsRepository:
+    """
+    Pick the stats implementation:
+    - materialized: read precomputed rows (default)
+    - computed:     aggregate the habit's logs on every call
+    """
+    if backend == "materialized":
+        return MaterializedHabitStatsRepository(conn, read_only)
+    if backend == "computed":
+        return SQLiteHabitStatsRepository(conn, read_only)
+    raise ValueError(f"Unknown stats backend {backend!r}")
+
+
+def create_async_stats_repository(backend: str) -> AsyncHabitStatsRepository:
+    """Async variant of create_stats_repository."""
+    if backend == "materialized":
+        return AsyncMaterializedHabitStatsRepository()
+    if backend == "computed":
+        return AsyncSQLiteHabitStatsRepository()
+    raise ValueError(f"Unknown stats backend {backend!r}")
@@ -0,0 +1,44 @@
+# src/infra/repositories/sqlite_repository.py
+
+import sqlite3
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from src.infra.database import get_db, storage_format
+from src.infra.storage_format import StorageFormat
+
+
+class SQLiteRepository:
+    """
+    Base for the SQLite repositories.
+
+    Bound to a connection (by a unit of work), every call runs inside the
+    caller's transaction and nothing is committed here. Unbound, each call
+    borrows a pooled connection and commits its own writes; with
+    `read_only=True` it borrows from the read-only pool instead.
+    """
+
+    def __init__(
+        self, conn: sqlite3.Connection | None = None, read_only: bool = False
+    ) -> None:
+        self._conn = conn
+        self._read_only = read_only
+
+    @property
+    def _format(self) -> StorageFormat:
+        return storage_format()
+
+    @contextmanager
+    def _connection(self) -> Generator[sqlite3.Connection]:
+        if self._conn is not None:
+            yield self._conn
+            return
+        with get_db(read_only=self._read_only) as db:
+            yield db
+
+    @contextmanager
+    def _transaction(self) -> Generator[sqlite3.Connection]:
+        with self._connection() as db:
+            yield db
+            if self._conn is None:
+                db.commit()
@@ -0,0 +1,138 @@
+# src/infra/rollups.py
+
+"""
+Maintenance of the `habit_log_rollups` table.
+
+One row per habit, bucket size (day / week / month) and bucket start,
+holding the sum, count, min and max of the logs in that bucket, so
+long-range charts read a few hundred rollups instead of every log.
+
+Like `record_log` in materialized_stats, `record_rollups` (and its
+`_async` variant) must run in the transaction that inserts the logs.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable
+from datetime import date
+from itertools import groupby
+from operator import itemgetter
+from uuid import UUID
+
+import aiosqlite
+
+from src.core.entities.log_rollup import RollupBucket
+from src.infra.storage_format import StorageFormat, read_storage_format
+
+UPSERT_ROLLUP = """
+    INSERT INTO habit_log_rollups (
+        habit_id,
+        bucket,
+        bucket_start,
+        total,
+        log_count,
+        min_value,
+        max_value
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (habit_id, bucket, bucket_start) DO UPDATE
+       SET total = total + excluded.total,
+           log_count = log_count + excluded.log_count,
+           min_value = MIN(min_value, excluded.min_value),
+           max_value = MAX(max_value, excluded.max_value)
+"""
+
+RollupKey = tuple[RollupBucket, date]  # (bucket, start)
+
+
+class _Aggregate:
+    """Running sum / count / min / max of one bucket."""
+
+    def __init__(self, value: float) -> None:
+        self.total = value
+        self.count = 1
+        self.min = value
+        self.max = value
+
+    def add(self, value: float) -> None:
+        self.total += value
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+
+def _aggregate(entries: Iterable[tuple[date, float]]) -> dict[RollupKey, _Aggregate]:
+    buckets: dict[RollupKey, _Aggregate] = {}
+    for log_date, value in entries:
+        for bucket in RollupBucket:
+            key = (bucket, bucket.start_of(log_date))
+            if key in buckets:
+                buckets[key].add(value)
+            else:
+                buckets[key] = _Aggregate(value)
+    return buckets
+
+
+def _rollup_params(
+    fmt: StorageFormat,
+    habit_id: UUID,
+    entries: Iterable[tuple[date, float]],
+) -> list[tuple[object, ...]]:
+    """One upsert per touched bucket, however many logs fall into it."""
+    encoded_id = fmt.encode_uuid(habit_id)
+    return [
+        (
+            encoded_id,
+            bucket.value,
+            fmt.encode_day(start),
+            aggregate.total,
+            aggregate.count,
+            aggregate.min,
+            aggregate.max,
+        )
+        for (bucket, start), aggregate in _aggregate(entries).items()
+    ]
+
+
+def record_rollups(
+    db: sqlite3.Connection,
+    fmt: StorageFormat,
+    habit_id: UUID,
+    entries: list[tuple[date, float]],
+) -> None:
+    db.executemany(UPSERT_ROLLUP, _rollup_params(fmt, habit_id, entries))
+
+
+async def record_rollups_async(
+    db: aiosqlite.Connection,
+    fmt: StorageFormat,
+    habit_id: UUID,
+    entries: list[tuple[date, float]],
+) -> None:
+    await db.executemany(UPSERT_ROLLUP, _rollup_params(fmt, habit_id, entries))
+
+
+def rebuild_rollups(db: sqlite3.Connection, habit_id: UUID | None = None) -> int:
+    """
+    Recompute `habit_log_rollups` from `habit_logs` for one habit (or all).
+    Returns the number of rollup rows written.
+    """
+    fmt = read_storage_format(db)
+    where = "WHERE habit_id = ?" if habit_id is not None else ""
+    params = (fmt.encode_uuid(habit_id),) if habit_id is not None else ()
+
+    db.execute(f"DELETE FROM habit_log_rollups {where}", params)
+    rows = db.execute(
+        f"SELECT habit_id, date, value FROM habit_logs {where} ORDER BY habit_id",
+        params,
+    )
+    written = 0
+    for raw_id, habit_rows in groupby(rows, key=itemgetter(0)):
+        entries = [
+            (fmt.decode_day(raw_date), value) for _, raw_date, value in habit_rows
+        ]
+        upserts = _rollup_params(fmt, fmt.decode_uuid(raw_id), entries)
+        db.executemany(UPSERT_ROLLUP, upserts)
+        written += len(upserts)
+    return written
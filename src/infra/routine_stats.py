@@ -0,0 +1,111 @@
+# src/infra/routine_stats.py
+
+"""
+Streaks of a routine (a habit and its sub-habits), from the daily rollups.
+
+Members are the habit's descendants, or the habit itself if it has none.
+One grouped query over habit_log_rollups (joined with habit_closure)
+returns, newest first, every day on which members were logged and how
+many of them; the streaks are walked from there, stopping at the first
+day that breaks both.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from uuid import UUID
+
+import aiosqlite
+
+from src.infra.materialized_stats import StreakWalker
+from src.infra.storage_format import StorageFormat
+
+# number of sub-habits, at any depth
+COUNT_MEMBERS = """
+    SELECT COUNT(*)
+      FROM habit_closure
+     WHERE ancestor_id = ? AND depth >= 1
+"""
+
+# members are the descendants from depth 1, or from 0 for a lone habit
+SELECT_MEMBER_DAYS = """
+    SELECT r.bucket_start AS day,
+           COUNT(*) AS logged
+      FROM habit_closure AS c
+      JOIN habit_log_rollups AS r
+        ON r.habit_id = c.descendant_id AND r.bucket = 'day'
+     WHERE c.ancestor_id = ? AND c.depth >= ?
+  GROUP BY r.bucket_start
+  ORDER BY r.bucket_start DESC
+"""
+
+
+class _RoutineStreaks:
+    """Feeds (day, members logged) rows, newest first, to two walkers."""
+
+    def __init__(self, fmt: StorageFormat, members: int) -> None:
+        self._fmt = fmt
+        self._members = members
+        self._any: StreakWalker | None = None
+        self._all: StreakWalker | None = None
+        self._any_open = True
+        self._all_open = True
+
+    def feed(self, day: object, logged: int) -> bool:
+        """Consume the next (older) day; False once both streaks ended."""
+        if self._any is None:
+            self._any = StreakWalker(self._fmt.decode_day(day), self._fmt)
+        self._any_open = self._any_open and self._any.feed(day)
+
+        if logged == self._members and self._all is None:
+            self._all = StreakWalker(self._fmt.decode_day(day), self._fmt)
+        if self._all is not None:
+            self._all_open = (
+                self._all_open and logged == self._members and self._all.feed(day)
+            )
+        return self._any_open or self._all_open
+
+    @property
+    def streaks(self) -> tuple[int, int]:
+        """(any_streak, all_streak)"""
+        return (
+            self._any.streak if self._any else 0,
+            self._all.streak if self._all else 0,
+        )
+
+
+def _walk_params(
+    fmt: StorageFormat, habit_id: UUID, members: int
+) -> tuple[object, int]:
+    return fmt.encode_uuid(habit_id), 1 if members else 0
+
+
+def routine_streaks(
+    db: sqlite3.Connection, fmt: StorageFormat, habit_id: UUID
+) -> tuple[int, int]:
+    """(any_streak, all_streak) of the routine rooted at `habit_id`."""
+    (members,) = db.execute(COUNT_MEMBERS, (fmt.encode_uuid(habit_id),)).fetchone()
+    walker = _RoutineStreaks(fmt, members or 1)
+
+    cursor = db.execute(SELECT_MEMBER_DAYS, _walk_params(fmt, habit_id, members))
+    for day, logged in cursor:
+        if not walker.feed(day, logged):
+            break
+    cursor.close()
+    return walker.streaks
+
+
+async def routine_streaks_async(
+    db: aiosqlite.Connection, fmt: StorageFormat, habit_id: UUID
+) -> tuple[int, int]:
+    async with db.execute(COUNT_MEMBERS, (fmt.encode_uuid(habit_id),)) as cursor:
+        row = await cursor.fetchone()
+    members = row[0] if row else 0
+    walker = _RoutineStreaks(fmt, members or 1)
+
+    params = _walk_params(fmt, habit_id, members)
+    async with db.execute(SELECT_MEMBER_DAYS, params) as cursor:
+        async for day, logged in cursor:
+            if not walker.feed(day, logged):
+                break
+    return walker.streaks
@@ -0,0 +1,258 @@
+# src/infra/storage_format.py
+
+"""
+On-disk encoding of ids and dates.
+
+- text:    36-character TEXT UUIDs and ISO 'YYYY-MM-DD' TEXT dates (original)
+- compact: 16-byte BLOB UUIDs and INTEGER day numbers (days since 1970-01-01)
+
+Both keep the sort order of the values, so indexes, keyset pagination and
+date ranges work unchanged. The format of a database is recorded in
+`db_meta` and switched with `convert_storage`.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+from uuid import UUID
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# columns holding encoded values, per table
+UUID_COLUMNS = {
+    "habits": ("id", "parent_id"),
+    "habit_logs": ("id", "habit_id"),
+    "habit_stats": ("habit_id",),
+    "habit_log_rollups": ("habit_id",),
+    "habit_closure": ("ancestor_id", "descendant_id"),
+    "habit_changes": ("habit_id",),
+}
+DAY_COLUMNS = {
+    "habits": ("created_at",),
+    "habit_logs": ("date",),
+    "habit_stats": ("last_date",),
+    "habit_log_rollups": ("bucket_start",),
+    "habit_closure": (),
+    "habit_changes": (),
+}
+# external-content full-text indexes over those tables, keyed by rowids
+# the table rebuild renumbers
+FTS_TABLES = ("habits_fts",)
+
+
+def _uuid_to_bytes(value: UUID) -> bytes:
+    return value.bytes
+
+
+def _uuid_from_bytes(raw: bytes) -> UUID:
+    return UUID(bytes=raw)
+
+
+def epoch_day(value: date) -> int:
+    """Days since 1970-01-01, as stored by the compact format."""
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def _day_from_number(raw: int) -> date:
+    return date.fromordinal(raw + EPOCH_ORDINAL)
+
+
+@dataclass(frozen=True)
+class StorageFormat:
+    """
+    How UUIDs and dates are encoded in SQL parameters and decoded from rows.
+    `day_number` turns a date column into days since 1970-01-01 in SQL.
+    """
+
+    name: str
+    uuid_type: str
+    day_type: str
+    encode_uuid: Callable[[UUID], Any]
+    decode_uuid: Callable[[Any], UUID]
+    encode_day: Callable[[date], Any]
+    decode_day: Callable[[Any], date]
+    day_number_sql: str
+
+    def encode_optional_uuid(self, value: UUID | None) -> Any:
+        return self.encode_uuid(value) if value is not None else None
+
+    def decode_optional_uuid(self, raw: Any) -> UUID | None:
+        return self.decode_uuid(raw) if raw is not None else None
+
+    def day_number(self, column: str) -> str:
+        return self.day_number_sql.format(column=column)
+
+
+TEXT_FORMAT = StorageFormat(
+    name="text",
+    uuid_type="TEXT",
+    day_type="TEXT",
+    encode_uuid=str,
+    decode_uuid=UUID,
+    encode_day=date.isoformat,
+    decode_day=date.fromisoformat,
+    # 2440587.5 is the Julian day of 1970-01-01 00:00
+    day_number_sql="CAST(julianday({column}) - 2440587.5 AS INTEGER)",
+)
+
+COMPACT_FORMAT = StorageFormat(
+    name="compact",
+    uuid_type="BLOB",
+    day_type="INTEGER",
+    encode_uuid=_uuid_to_bytes,
+    decode_uuid=_uuid_from_bytes,
+    encode_day=epoch_day,
+    decode_day=_day_from_number,
+    day_number_sql="{column}",
+)
+
+STORAGE_FORMATS: dict[str, StorageFormat] = {
+    fmt.name: fmt for fmt in (TEXT_FORMAT, COMPACT_FORMAT)
+}
+
+
+def get_storage_format(name: str) -> StorageFormat:
+    try:
+        return STORAGE_FORMATS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown storage format {name!r}; "
+            f"expected one of {sorted(STORAGE_FORMATS)}"
+        ) from None
+
+
+def read_storage_format(conn: sqlite3.Connection) -> StorageFormat:
+    """Format recorded in `db_meta`; text for databases that predate it."""
+    table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'db_meta'"
+    ).fetchone()
+    if table is None:
+        return TEXT_FORMAT
+    row = conn.execute(
+        "SELECT value FROM db_meta WHERE key = 'storage_format'"
+    ).fetchone()
+    return get_storage_format(row[0]) if row is not None else TEXT_FORMAT
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def _rewrite_column_types(sql: str, table: str, target: StorageFormat) -> str:
+    for column in UUID_COLUMNS[table]:
+        sql = re.sub(rf"(\b{column}\s+)(TEXT|BLOB)\b", rf"\g<1>{target.uuid_type}", sql)
+    for column in DAY_COLUMNS[table]:
+        sql = re.sub(
+            rf"(\b{column}\s+)(TEXT|INTEGER)\b", rf"\g<1>{target.day_type}", sql
+        )
+    return re.sub(rf"^CREATE TABLE \"?{table}\"?", f"CREATE TABLE {table}__new", sql)
+
+
+def _copy_expressions(conn: sqlite3.Connection, table: str) -> str:
+    expressions = []
+    for row in conn.execute(f"PRAGMA table_info({table});"):
+        column = row[1]
+        if column in UUID_COLUMNS[table]:
+            expressions.append(f"convert_uuid({column})")
+        elif column in DAY_COLUMNS[table]:
+            expressions.append(f"convert_day({column})")
+        else:
+            expressions.append(column)
+    return ", ".join(expressions)
+
+
+def _register_converters(
+    conn: sqlite3.Connection, source: StorageFormat, target: StorageFormat
+) -> None:
+    def convert_uuid(raw: Any) -> Any:
+        return target.encode_optional_uuid(source.decode_optional_uuid(raw))
+
+    def convert_day(raw: Any) -> Any:
+        return target.encode_day(source.decode_day(raw)) if raw is not None else None
+
+    conn.create_function("convert_uuid", 1, convert_uuid, deterministic=True)
+    conn.create_function("convert_day", 1, convert_day, deterministic=True)
+
+
+def convert_storage(conn: sqlite3.Connection, target: StorageFormat) -> bool:
+    """
+    Rewrite every table in UUID_COLUMNS into `target`'s encoding.
+    Tables are rebuilt and renamed (SQLite cannot change column types in
+    place); their indexes and triggers are re-created from sqlite_master.
+    Runs in one IMMEDIATE transaction. Returns False if nothing changed.
+    """
+    # with foreign keys on, dropping the old tables would cascade into the
+    # new ones (they reference the tables by name); checked before COMMIT
+    conn.execute("PRAGMA foreign_keys = OFF;")
+    try:
+        return _convert(conn, target)
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON;")
+
+
+def _convert(conn: sqlite3.Connection, target: StorageFormat) -> bool:
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        source = read_storage_format(conn)
+        if source == target:
+            conn.rollback()
+            return False
+
+        _register_converters(conn, source, target)
+        tables = list(UUID_COLUMNS)
+        placeholders = ", ".join("?" * len(tables))
+        dependents = conn.execute(
+            f"""
+            SELECT sql
+              FROM sqlite_master
+             WHERE type IN ('index', 'trigger')
+               AND tbl_name IN ({placeholders})
+               AND sql IS NOT NULL
+            """,
+            tables,
+        ).fetchall()
+
+        for table in tables:
+            (sql,) = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (table,),
+            ).fetchone()
+            conn.execute(_rewrite_column_types(sql, table, target))
+            conn.execute(
+                f"INSERT INTO {table}__new "
+                f"SELECT {_copy_expressions(conn, table)} FROM {table}"
+            )
+        for table in tables:
+            conn.execute(f"DROP TABLE {table};")
+        for table in tables:
+            conn.execute(f"ALTER TABLE {table}__new RENAME TO {table};")
+        for (sql,) in dependents:
+            conn.execute(sql)
+        for fts_table in FTS_TABLES:
+            if _table_exists(conn, fts_table):
+                conn.execute(
+                    f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild');"
+                )
+
+        conn.execute(
+            """
+            INSERT INTO db_meta (key, value) VALUES ('storage_format', ?)
+            ON CONFLICT (key) DO UPDATE SET value = excluded.value
+            """,
+            (target.name,),
+        )
+        if conn.execute("PRAGMA foreign_key_check;").fetchone() is not None:
+            raise RuntimeError("Foreign key violation after storage conversion")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return True
@@ -0,0 +1,45 @@
+# src/infra/tenancy.py
+
+"""
+Tenant of the current request.
+
+With HABIT_TENANT_HEADER set, every request naming a tenant in that
+header is served from the tenant's own SQLite file (its shard, see
+`src/infra/database.py`). The tenant is kept in a context variable, so
+repositories resolve their shard without it being passed around:
+threadpool calls and asyncio tasks inherit the caller's context.
+Requests without the header use the default database.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# also the shard's file name: no separators, dots or leading dashes
+TENANT_ID_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]{0,63}")
+
+_tenant: ContextVar[str | None] = ContextVar("tenant", default=None)
+
+
+def is_valid_tenant(tenant: str) -> bool:
+    return TENANT_ID_PATTERN.fullmatch(tenant) is not None
+
+
+def current_tenant() -> str | None:
+    """Tenant of the current context, None for the default database."""
+    return _tenant.get()
+
+
+@contextmanager
+def use_tenant(tenant: str | None) -> Generator[None]:
+    """Route the database work of this block to `tenant`'s shard."""
+    if tenant is not None and not is_valid_tenant(tenant):
+        raise ValueError("Invalid tenant id")
+    token = _tenant.set(tenant)
+    try:
+        yield
+    finally:
+        _tenant.reset(token)
@@ -0,0 +1,120 @@
+# src/infra/unit_of_work.py
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from src.core.interface.unit_of_work import UnitOfWork
+from src.infra.config import get_settings
+from src.infra.database import get_db
+from src.infra.group_commit import GroupCommitWriter, get_group_commit_writer
+from src.infra.repositories.cached_habit_repository import (
+    CachedHabitRepository,
+    get_habit_cache,
+)
+from src.infra.repositories.change_repository import SQLiteChangeRepository
+from src.infra.repositories.group_commit_log_repository import (
+    GroupCommitHabitLogRepository,
+)
+from src.infra.repositories.habit_analytics_repository import (
+    SQLiteHabitAnalyticsRepository,
+)
+from src.infra.repositories.habit_log_repository import SQLiteHabitLogRepository
+from src.infra.repositories.habit_repository import SQLiteHabitRepository
+from src.infra.repositories.habit_stats_repository import create_stats_repository
+
+
+class SQLiteUnitOfWork(UnitOfWork):
+    """
+    UnitOfWork on a single SQLite connection.
+
+    The transaction is opened up front, so reads (e.g. the habit existence
+    check) and writes of one request see the same snapshot and commit
+    together. `write=True` takes the write lock immediately (BEGIN
+    IMMEDIATE): a deferred transaction that reads first and writes later
+    fails with SQLITE_BUSY if another connection committed in between.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, write: bool = False) -> None:
+        self._conn = conn
+        self._write = write
+
+        habits = SQLiteHabitRepository(conn)
+        cache = get_habit_cache()
+        self._cached_habits = (
+            CachedHabitRepository(habits, cache, deferred=True) if cache else None
+        )
+        self.habits = self._cached_habits or habits
+        self.logs = SQLiteHabitLogRepository(conn)
+        self.stats = create_stats_repository(get_settings().stats_backend, conn)
+        self.analytics = SQLiteHabitAnalyticsRepository(conn)
+        self.changes = SQLiteChangeRepository(conn)
+
+    def __enter__(self) -> SQLiteUnitOfWork:
+        self._conn.execute("BEGIN IMMEDIATE;" if self._write else "BEGIN;")
+        return self
+
+    def commit(self) -> None:
+        self._conn.commit()
+        self._flush()
+
+    def rollback(self) -> None:
+        self._conn.rollback()
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._cached_habits is not None:
+            self._cached_habits.flush()
+
+
+class GroupCommitUnitOfWork(UnitOfWork):
+    """
+    UnitOfWork of the log inserts when group commit is enabled
+    (HABIT_GROUP_COMMIT_SIZE > 0).
+
+    It holds no connection and opens no transaction: each read borrows a
+    read-only connection for one statement, and log inserts are committed
+    by the group-commit writer. A request waiting for its batch therefore
+    keeps no pooled connection busy, and a batch is not limited by the
+    pool size. Commit and rollback have nothing left to do.
+    """
+
+    def __init__(self, writer: GroupCommitWriter) -> None:
+        habits = SQLiteHabitRepository(read_only=True)
+        cache = get_habit_cache()
+        self.habits = CachedHabitRepository(habits, cache) if cache else habits
+        self.logs = GroupCommitHabitLogRepository(writer, read_only=True)
+        self.stats = create_stats_repository(
+            get_settings().stats_backend, read_only=True
+        )
+        self.analytics = SQLiteHabitAnalyticsRepository(read_only=True)
+        self.changes = SQLiteChangeRepository(read_only=True)
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+
+@contextmanager
+def unit_of_work(
+    write: bool = False, group_commit: bool = False
+) -> Generator[UnitOfWork]:
+    """
+    Borrow a pooled connection and run one transaction on it.
+    Read-only units of work use the read-only pool. `group_commit=True`
+    hands log inserts to the group-commit writer, if it is enabled.
+    """
+    writer = get_group_commit_writer() if group_commit else None
+    if writer is not None:
+        with GroupCommitUnitOfWork(writer) as uow:
+            yield uow
+        return
+    with (
+        get_db(read_only=not write) as conn,
+        SQLiteUnitOfWork(conn, write) as uow,
+    ):
+        yield uow
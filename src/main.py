@@ -1,14 +1,110 @@
 # src/main.py
 
+"""
+Production launcher.
+
+    python -m src.main --workers 4 --port 8000
+
+Options default to the HABIT_* settings (HABIT_HOST, HABIT_PORT,
+HABIT_WORKERS, HABIT_LOOP, HABIT_HTTP, HABIT_SHUTDOWN_TIMEOUT).
+
+Migrations run once, here, before any worker starts. That also switches
+the database to WAL (see src/infra/pragmas.py) while nothing else has it
+open. The workers are told (HABIT_DB_READY=1) to skip their own
+init_db(). Each worker opens its own connections on first use; pools
+inherited through fork() are dropped (see src/infra/database.py).
+
+With more than one worker the habit cache is turned off
+(HABIT_CACHE_SIZE=0): each process would keep its own, and a write in
+one worker would never invalidate what the others have cached. Setting
+HABIT_CACHE_SIZE above 0 together with several workers is an error.
+
+On SIGINT / SIGTERM, uvicorn stops accepting connections, gives
+in-flight requests up to the shutdown timeout, and then runs the app's
+shutdown hook. That hook commits queued group-commit writes and closes
+the pools.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+
 import uvicorn
 
-from src.app import app
+from src.infra.config import Settings, get_settings
 from src.infra.database import init_db
+from src.infra.pragmas import get_pragma_profile
+
+# imported by uvicorn in every worker, after HABIT_DB_READY is set
+APP = "src.app:app"
+
+
+def _parse_args(argv: list[str] | None, settings: Settings) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Habit Tracker API.")
+    parser.add_argument("--host", default=settings.host)
+    parser.add_argument("--port", type=int, default=settings.port)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.workers,
+        help="worker processes, e.g. one per core",
+    )
+    parser.add_argument(
+        "--loop", choices=["auto", "asyncio", "uvloop"], default=settings.loop
+    )
+    parser.add_argument(
+        "--http", choices=["auto", "h11", "httptools"], default=settings.http
+    )
+    parser.add_argument(
+        "--shutdown-timeout",
+        type=int,
+        default=settings.shutdown_timeout,
+        help="seconds in-flight requests get to finish on shutdown",
+    )
+    args = parser.parse_args(argv)
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    # in rollback-journal mode every writer blocks all the other workers
+    journal_mode = get_pragma_profile(settings.db_profile).journal_mode
+    if args.workers > 1 and journal_mode != "WAL":
+        parser.error(
+            f"HABIT_DB_PROFILE={settings.db_profile} uses journal_mode="
+            f"{journal_mode}; several workers need a WAL profile"
+        )
+    # the launcher turns the per-process habit cache off for several
+    # workers; refuse rather than silently drop an explicit size
+    explicit_cache = os.environ.get("HABIT_CACHE_SIZE")
+    if args.workers > 1 and explicit_cache and settings.habit_cache_size > 0:
+        parser.error(
+            f"HABIT_CACHE_SIZE={settings.habit_cache_size} keeps a habit cache "
+            "per process, which several workers would serve stale; "
+            "unset it or set it to 0"
+        )
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv, get_settings())
 
+    init_db()
+    # read by the workers' settings: the schema is already up to date
+    os.environ["HABIT_DB_READY"] = "1"
+    if args.workers > 1:
+        # caches are per process: others would serve stale (or deleted) habits
+        os.environ["HABIT_CACHE_SIZE"] = "0"
+    get_settings.cache_clear()
 
-def main() -> None:
-    init_db()  # <-- important
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    uvicorn.run(
+        APP,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=args.loop,
+        http=args.http,
+        timeout_graceful_shutdown=args.shutdown_timeout,
+    )
 
 
 if __name__ == "__main__":
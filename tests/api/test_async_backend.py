@@ -0,0 +1,175 @@
+# tests/api/test_async_backend.py
+
+from collections.abc import Generator
+from datetime import date, timedelta
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app import create_app
+
+
+@pytest.fixture
+def async_client() -> Generator[TestClient]:
+    # the context manager runs startup/shutdown, which closes the aiosqlite pool
+    with TestClient(create_app("async")) as client:
+        yield client
+
+
+def _create_habit(client: TestClient, **overrides: Any) -> str:
+    habit_json = {
+        "name": "Read book",
+        "description": "Read 10 pages",
+        "category": "Learning",
+        "type": "numeric",
+        "goal": 10,
+        "parent_id": None,
+        **overrides,
+    }
+    resp = client.post("/habits", json=habit_json)
+    assert resp.status_code == 200
+    return str(resp.json()["id"])
+
+
+def test_async_habit_crud(async_client: TestClient) -> None:
+    habit_id = _create_habit(async_client)
+
+    resp = async_client.put(f"/habits/{habit_id}", json={"name": "Read more"})
+    assert resp.status_code == 200
+    assert resp.json()["name"] == "Read more"
+
+    resp = async_client.post(
+        f"/habits/{habit_id}/subhabits",
+        json={
+            "name": "Read a chapter",
+            "description": "One chapter",
+            "category": "Learning",
+            "type": "boolean",
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.json()["parent_id"] == habit_id
+
+    resp = async_client.get("/habits", params={"limit": 1})
+    assert resp.status_code == 200
+    first_page = resp.json()
+    assert len(first_page["habits"]) == 1
+
+    resp = async_client.get("/habits", params={"cursor": first_page["next_cursor"]})
+    assert len(resp.json()["habits"]) == 1
+    assert resp.json()["next_cursor"] is None
+
+    resp = async_client.get("/habits", params={"parent_id": habit_id})
+    assert [h["name"] for h in resp.json()["habits"]] == ["Read a chapter"]
+    resp = async_client.get("/habits/search", params={"q": "chap"})
+    assert [h["name"] for h in resp.json()["habits"]] == ["Read a chapter"]
+
+    assert async_client.delete(f"/habits/{habit_id}").status_code == 200
+    assert async_client.get(f"/habits/{habit_id}").status_code == 404
+
+
+def test_async_logs_and_stats_match_sync_backend(
+    async_client: TestClient, client: TestClient
+) -> None:
+    habit_id = _create_habit(async_client, type="boolean", goal=None)
+    today = date.today()
+
+    resp = async_client.post(
+        f"/habits/{habit_id}/logs", json={"date": today.isoformat(), "value": 1}
+    )
+    assert resp.status_code == 200
+
+    resp = async_client.post(
+        f"/habits/{habit_id}/logs:bulk",
+        json={
+            "logs": [
+                {"date": (today - timedelta(days=1)).isoformat(), "value": 1},
+                {"date": (today - timedelta(days=2)).isoformat(), "value": 5},
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    assert len(resp.json()["created"]) == 1
+    assert resp.json()["errors"][0]["index"] == 1
+
+    resp = async_client.get(f"/habits/{habit_id}/logs")
+    assert [log["value"] for log in resp.json()["logs"]] == [1, 1]
+
+    async_stats = async_client.get(f"/habits/{habit_id}/stats").json()
+    assert async_stats == {
+        "habit_id": habit_id,
+        "total": 2.0,
+        "current_streak": 2,
+        "average": 1.0,
+    }
+    # both backends share the database file and the habit_stats table
+    assert client.get(f"/habits/{habit_id}/stats").json() == async_stats
+    assert async_client.get("/habits/stats").json() == {"stats": [async_stats]}
+
+    # rollups are kept current by async writes as well
+    params = {"bucket": "day"}
+    rollups = async_client.get(f"/habits/{habit_id}/logs", params=params).json()
+    assert [r["total"] for r in rollups["rollups"]] == [1.0, 1.0]
+    assert client.get(f"/habits/{habit_id}/logs", params=params).json() == rollups
+
+    # both backends read the same change counters
+    etag = async_client.get(f"/habits/{habit_id}/logs").headers["ETag"]
+    assert client.get(f"/habits/{habit_id}/logs").headers["ETag"] == etag
+    headers = {"If-None-Match": etag}
+    resp = async_client.get(f"/habits/{habit_id}/stats", headers=headers)
+    assert resp.status_code == 304
+
+    url = f"/habits/{habit_id}/calendar"
+    params = {"year": str(today.year)}
+    calendar = async_client.get(url, params=params).json()
+    assert client.get(url, params=params).json() == calendar
+
+
+def test_async_habit_tree_matches_sync_backend(
+    async_client: TestClient, client: TestClient
+) -> None:
+    root_id = _create_habit(async_client)
+    resp = async_client.post(
+        f"/habits/{root_id}/subhabits",
+        json={"name": "a", "description": "", "category": "c", "type": "boolean"},
+    )
+    child_id = resp.json()["id"]
+
+    tree = async_client.get(f"/habits/{root_id}/tree").json()
+    assert [child["id"] for child in tree["children"]] == [child_id]
+    assert client.get(f"/habits/{root_id}/tree").json() == tree
+
+    resp = async_client.put(f"/habits/{root_id}", json={"parent_id": child_id})
+    assert resp.status_code == 400
+
+    async_client.post(
+        f"/habits/{child_id}/logs", json={"date": "2025-01-01", "value": 1}
+    )
+    params = {"scope": "subtree"}
+    subtree = async_client.get(f"/habits/{root_id}/stats", params=params).json()
+    assert (subtree["total"], subtree["all_streak"]) == (1.0, 1)
+    assert client.get(f"/habits/{root_id}/stats", params=params).json() == subtree
+
+
+def test_async_missing_habit_returns_404(async_client: TestClient) -> None:
+    random_id = str(uuid4())
+
+    assert async_client.get(f"/habits/{random_id}").status_code == 404
+    assert async_client.get(f"/habits/{random_id}/stats").status_code == 404
+    resp = async_client.post(f"/habits/{random_id}/logs", json={"value": 1})
+    assert resp.status_code == 404
+
+
+def test_async_backend_reports_pool_metrics(async_client: TestClient) -> None:
+    _create_habit(async_client)
+
+    resp = async_client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.json()["async_db_pool"]["open"] >= 1
+
+
+def test_create_app_rejects_unknown_backend() -> None:
+    with pytest.raises(ValueError, match="Unknown backend"):
+        create_app("threads")
@@ -0,0 +1,102 @@
+# tests/api/test_conditional_requests.py
+
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+
+def _habit_json(**overrides: Any) -> dict[str, Any]:
+    return {
+        "name": "Read book",
+        "description": "Read 10 pages",
+        "category": "Learning",
+        "type": "numeric",
+        "goal": 10,
+        "parent_id": None,
+        **overrides,
+    }
+
+
+def _revalidate(client: TestClient, url: str, etag: str) -> int:
+    status: int = client.get(url, headers={"If-None-Match": etag}).status_code
+    return status
+
+
+def test_habit_list_is_not_modified_until_a_habit_changes(
+    client: TestClient,
+) -> None:
+    habit_id = client.post("/habits", json=_habit_json()).json()["id"]
+    resp = client.get("/habits")
+    etag = resp.headers["ETag"]
+    assert "Last-Modified" in resp.headers
+
+    not_modified = client.get("/habits", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    client.put(f"/habits/{habit_id}", json={"name": "Read two books"})
+
+    assert _revalidate(client, "/habits", etag) == 200
+
+
+def test_logs_and_stats_change_with_new_logs(client: TestClient) -> None:
+    habit_id = client.post("/habits", json=_habit_json()).json()["id"]
+    urls = [
+        f"/habits/{habit_id}/logs",
+        f"/habits/{habit_id}/logs?bucket=day",
+        f"/habits/{habit_id}/stats",
+    ]
+    etags = {url: client.get(url).headers["ETag"] for url in urls}
+    assert all(_revalidate(client, url, etags[url]) == 304 for url in urls)
+
+    client.post(f"/habits/{habit_id}/logs", json={"date": "2025-01-01", "value": 1})
+
+    assert all(_revalidate(client, url, etags[url]) == 200 for url in urls)
+
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(UTC), usegmt=True)
+
+
+def test_if_modified_since_uses_last_modified(client: TestClient) -> None:
+    habit_id = client.post("/habits", json=_habit_json()).json()["id"]
+    url = f"/habits/{habit_id}/stats"
+    last_modified = parsedate_to_datetime(client.get(url).headers["Last-Modified"])
+
+    later = _http_date(last_modified + timedelta(seconds=1))
+    resp = client.get(url, headers={"If-Modified-Since": later})
+    assert resp.status_code == 304
+
+    resp = client.get(
+        url, headers={"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    )
+    assert resp.status_code == 200
+
+
+def test_if_modified_since_ignores_writes_of_the_same_second(
+    client: TestClient,
+) -> None:
+    habit_id = client.post("/habits", json=_habit_json()).json()["id"]
+    url = f"/habits/{habit_id}/stats"
+    first = client.get(url)
+    assert first.json()["total"] == 0
+
+    # a write within the second named by Last-Modified
+    client.post(f"/habits/{habit_id}/logs", json={"date": "2025-01-01", "value": 5})
+    last_modified = parsedate_to_datetime(first.headers["Last-Modified"])
+    second = client.get(url, headers={"If-Modified-Since": _http_date(last_modified)})
+
+    assert second.status_code == 200
+    assert second.json()["total"] == 5
+    assert second.headers["ETag"] != first.headers["ETag"]
+
+
+def test_unknown_habit_is_still_404(client: TestClient) -> None:
+    resp = client.get(
+        "/habits/00000000-0000-0000-0000-000000000000/logs",
+        headers={"If-None-Match": "*"},
+    )
+    assert resp.status_code == 404
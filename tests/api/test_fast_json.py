@@ -0,0 +1,49 @@
+# tests/api/test_fast_json.py
+
+from datetime import date
+from uuid import uuid4
+
+import orjson
+
+from src.api.fast_json import json_response
+from src.api.models.habits import HabitListResponse, HabitResponse
+from src.api.models.logs import HabitLogListResponse, HabitLogResponse
+from src.core.entities.habit import Habit, HabitType
+from src.core.entities.habit_log import HabitLog
+
+
+def test_entities_serialize_like_the_response_models() -> None:
+    habits = [
+        Habit(
+            uuid4(),
+            "Run",
+            "5k",
+            "Health",
+            HabitType.NUMERIC,
+            5.0,
+            date(2025, 1, 1),
+            None,
+        ),
+        Habit(
+            uuid4(),
+            "Walk",
+            "",
+            "Health",
+            HabitType.BOOLEAN,
+            None,
+            date(2025, 1, 2),
+            uuid4(),
+        ),
+    ]
+    logs = [HabitLog(uuid4(), habits[0].id, date(2025, 1, 3), 2.5)]
+
+    fast_habits = json_response({"habits": habits, "next_cursor": "abc"}, {})
+    fast_logs = json_response({"logs": logs, "next_cursor": None}, {})
+
+    assert orjson.loads(fast_habits.body) == HabitListResponse(
+        habits=[HabitResponse.from_entity(h) for h in habits], next_cursor="abc"
+    ).model_dump(mode="json")
+    assert orjson.loads(fast_logs.body) == HabitLogListResponse(
+        logs=[HabitLogResponse.from_entity(log) for log in logs]
+    ).model_dump(mode="json")
+    assert fast_logs.headers["content-type"] == "application/json"
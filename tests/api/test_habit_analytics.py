@@ -0,0 +1,81 @@
+# tests/api/test_habit_analytics.py
+
+from datetime import date, timedelta
+from typing import Any
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+
+def _create_habit(client: TestClient, goal: float | None = 10) -> str:
+    body = {
+        "name": "Test habit",
+        "description": "Test description",
+        "category": "Test",
+        "type": "numeric",
+        "goal": goal,
+        "parent_id": None,
+    }
+    resp = client.post("/habits", json=body)
+    assert resp.status_code == 200
+
+    data: dict[str, Any] = resp.json()
+    return str(data["id"])
+
+
+def _add_logs(
+    client: TestClient, habit_id: str, start: date, days: int, value: float
+) -> None:
+    body = {
+        "logs": [
+            {"date": (start + timedelta(days=i)).isoformat(), "value": value}
+            for i in range(days)
+        ]
+    }
+    resp = client.post(f"/habits/{habit_id}/logs:bulk", json=body)
+    assert resp.status_code == 200
+
+
+def test_analytics_metrics(client: TestClient) -> None:
+    habit_id = _create_habit(client, goal=10)
+    _add_logs(client, habit_id, date(2025, 1, 1), 5, 10)  # Jan 1-5
+    _add_logs(client, habit_id, date(2025, 2, 1), 2, 4)  # Feb 1-2
+    _add_logs(client, habit_id, date(2025, 2, 2), 1, 7)  # second log on Feb 2
+    _add_logs(client, habit_id, date(2025, 2, 8), 7, 10)  # Feb 8-14
+    _add_logs(client, habit_id, date(2025, 2, 20), 1, 99)  # after as_of
+
+    resp = client.get(f"/habits/{habit_id}/analytics", params={"as_of": "2025-02-14"})
+    assert resp.status_code == 200
+
+    data = resp.json()
+    assert data["as_of"] == "2025-02-14"
+    assert data["log_count"] == 15
+    assert data["active_days"] == 14
+    assert data["total"] == 135.0
+    assert data["rolling_7d"] == 70.0
+    assert data["rolling_30d"] == 85.0  # Jan 16 - Feb 14
+    assert data["week_over_week"] == 55.0  # 70 - (4 + 11)
+    assert data["longest_streak"] == 7
+    assert data["current_streak"] == 7
+    # Jan 1-5, Feb 2 and Feb 8-14 reached the goal, out of 45 days
+    assert data["completion_rate"] == 13 / 45
+
+
+def test_analytics_without_logs_or_goal(client: TestClient) -> None:
+    habit_id = _create_habit(client, goal=None)
+
+    resp = client.get(f"/habits/{habit_id}/analytics")
+    assert resp.status_code == 200
+
+    data = resp.json()
+    assert data["as_of"] == date.today().isoformat()
+    assert data["log_count"] == 0
+    assert data["total"] == 0.0
+    assert data["longest_streak"] == 0
+    assert data["completion_rate"] is None
+
+
+def test_analytics_for_missing_habit_returns_404(client: TestClient) -> None:
+    resp = client.get(f"/habits/{uuid4()}/analytics")
+
+    assert resp.status_code == 404
@@ -1,11 +1,20 @@
 # tests/api/test_habit_logs.py
 
-from datetime import date
+import base64
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from typing import Any
 from uuid import uuid4
 
+import pytest
 from fastapi.testclient import TestClient
 
+from src.app import create_app
+from src.infra.config import get_settings
+from src.infra.database import close_db
+from src.infra.group_commit import get_group_commit_writer
+
 
 def _create_habit(client: TestClient) -> str:
     habit_json = {
@@ -52,3 +61,263 @@ def test_create_log_for_missing_habit_returns_404(client: TestClient) -> None:
 
     # from our service: we raise ValueError("Habit not found") → route maps to 404
     assert resp.status_code == 404
+
+
+def test_group_commit_batches_more_writers_than_the_pools_have(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # waiting requests hold no pooled connection, so 20 writers can share
+    # batches although each pool has only 2 connections
+    monkeypatch.setenv("HABIT_GROUP_COMMIT_SIZE", "64")
+    monkeypatch.setenv("HABIT_GROUP_COMMIT_DELAY", "0.1")
+    monkeypatch.setenv("HABIT_DB_POOL_SIZE", "2")
+    monkeypatch.setenv("HABIT_DB_READ_POOL_SIZE", "2")
+    monkeypatch.setenv("HABIT_DB_POOL_TIMEOUT", "0.5")
+    get_settings.cache_clear()
+    get_group_commit_writer.cache_clear()
+    close_db()
+    writers = 20
+    try:
+        with TestClient(create_app("sync")) as client:
+            habit_id = _create_habit(client)
+            start = date(2025, 1, 1)
+
+            def post(day: int) -> int:
+                log_json = {
+                    "date": (start + timedelta(days=day)).isoformat(),
+                    "value": 1,
+                }
+                resp = client.post(f"/habits/{habit_id}/logs", json=log_json)
+                status: int = resp.status_code
+                return status
+
+            with ThreadPoolExecutor(max_workers=writers) as pool:
+                statuses = list(pool.map(post, range(writers)))
+            metrics = client.get("/metrics").json()
+
+            assert statuses == [200] * writers
+            commit_stats = metrics["group_commit"]
+            assert commit_stats["logs"] == writers
+            assert commit_stats["failed"] == 0
+            # with a pooled connection per waiter: at least writers / 2
+            assert commit_stats["batches"] < writers // 2
+            assert metrics["db_pool"]["timeouts"] == 0
+            assert metrics["db_read_pool"]["timeouts"] == 0
+            resp = client.get(f"/habits/{habit_id}/logs", params={"limit": 100})
+            assert len(resp.json()["logs"]) == writers
+    finally:
+        close_db()
+        monkeypatch.undo()
+        get_settings.cache_clear()
+        get_group_commit_writer.cache_clear()
+
+
+def test_bulk_create_stores_valid_logs_and_reports_errors(client: TestClient) -> None:
+    resp = client.post(
+        "/habits",
+        json={
+            "name": "Meditate",
+            "description": "Meditate every morning",
+            "category": "Health",
+            "type": "boolean",
+            "goal": None,
+            "parent_id": None,
+        },
+    )
+    habit_id = resp.json()["id"]
+
+    body = {
+        "logs": [
+            {"date": "2025-05-01", "value": 1},
+            {"date": "2025-05-02", "value": 3},  # invalid for boolean habits
+            {"date": "2025-05-03", "value": 0},
+        ]
+    }
+    resp = client.post(f"/habits/{habit_id}/logs:bulk", json=body)
+    assert resp.status_code == 200
+
+    data = resp.json()
+    assert [log["date"] for log in data["created"]] == ["2025-05-01", "2025-05-03"]
+    assert data["errors"] == [
+        {"index": 1, "message": "Boolean habits must have value 0 or 1"}
+    ]
+
+    stats = client.get(f"/habits/{habit_id}/stats").json()
+    assert stats["total"] == 1.0
+    assert stats["current_streak"] == 1
+
+
+def test_bulk_create_for_missing_habit_returns_404(client: TestClient) -> None:
+    body = {"logs": [{"date": "2025-05-01", "value": 1}]}
+
+    resp = client.post(f"/habits/{uuid4()}/logs:bulk", json=body)
+    assert resp.status_code == 404
+
+
+def test_bulk_create_rejects_oversized_batch(client: TestClient) -> None:
+    habit_id = _create_habit(client)
+    body = {"logs": [{"date": "2025-05-01", "value": 1}] * 1_001}
+
+    resp = client.post(f"/habits/{habit_id}/logs:bulk", json=body)
+    assert resp.status_code == 400
+
+
+def _add_logs(client: TestClient, habit_id: str, count: int) -> None:
+    body = {
+        "logs": [
+            {"date": date(2024, 1, 1 + i % 28).isoformat(), "value": i}
+            for i in range(count)
+        ]
+    }
+    resp = client.post(f"/habits/{habit_id}/logs:bulk", json=body)
+    assert resp.status_code == 200
+
+
+def test_export_logs_as_ndjson(client: TestClient) -> None:
+    habit_id = _create_habit(client)
+    _add_logs(client, habit_id, 1_000)
+
+    resp = client.get(f"/habits/{habit_id}/logs/export")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert len(records) == 1_000
+    assert {r["habit_id"] for r in records} == {habit_id}
+    assert records == sorted(records, key=lambda r: r["date"])
+
+
+def test_export_logs_as_csv_with_date_range(client: TestClient) -> None:
+    habit_id = _create_habit(client)
+    _add_logs(client, habit_id, 28)
+
+    resp = client.get(
+        f"/habits/{habit_id}/logs/export",
+        params={"format": "csv", "start": "2024-01-10", "end": "2024-01-12"},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+
+    lines = resp.text.splitlines()
+    assert lines[0] == "id,habit_id,date,value"
+    assert [line.split(",")[2] for line in lines[1:]] == [
+        "2024-01-10",
+        "2024-01-11",
+        "2024-01-12",
+    ]
+
+
+def test_export_logs_for_missing_habit_returns_404(client: TestClient) -> None:
+    resp = client.get(f"/habits/{uuid4()}/logs/export")
+    assert resp.status_code == 404
+
+
+def test_list_logs_pages_through_duplicate_dates(client: TestClient) -> None:
+    habit_id = _create_habit(client)
+    _add_logs(client, habit_id, 56)  # every day of the range is logged twice
+
+    seen: list[dict[str, Any]] = []
+    params: dict[str, Any] = {"limit": 10, "start": "2024-01-05"}
+    while True:
+        resp = client.get(f"/habits/{habit_id}/logs", params=params)
+        assert resp.status_code == 200
+        body = resp.json()
+        seen += body["logs"]
+        if body["next_cursor"] is None:
+            break
+        params["cursor"] = body["next_cursor"]
+
+    assert len(seen) == 48
+    assert len({log["id"] for log in seen}) == 48
+    assert [log["date"] for log in seen] == sorted(log["date"] for log in seen)
+
+
+def test_list_logs_by_bucket_reads_rollups(client: TestClient) -> None:
+    habit_id = _create_habit(client)
+    _add_logs(client, habit_id, 28)  # 2024-01-01 (a Monday) .. 01-28, value 0..27
+
+    resp = client.get(f"/habits/{habit_id}/logs", params={"bucket": "month"})
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "habit_id": habit_id,
+        "rollups": [
+            {
+                "bucket": "month",
+                "start": "2024-01-01",
+                "total": 378.0,
+                "log_count": 28,
+                "min_value": 0.0,
+                "max_value": 27.0,
+            }
+        ],
+        "next_cursor": None,
+    }
+
+    # the week containing `start` is included; pages follow the cursor
+    params: dict[str, Any] = {"bucket": "week", "start": "2024-01-10", "limit": 2}
+    first = client.get(f"/habits/{habit_id}/logs", params=params).json()
+    params["cursor"] = first["next_cursor"]
+    second = client.get(f"/habits/{habit_id}/logs", params=params).json()
+
+    weeks = first["rollups"] + second["rollups"]
+    assert [w["start"] for w in weeks] == ["2024-01-08", "2024-01-15", "2024-01-22"]
+    assert [w["total"] for w in weeks] == [70.0, 119.0, 168.0]
+    assert second["next_cursor"] is None
+
+
+def test_list_logs_rejects_unknown_bucket(client: TestClient) -> None:
+    habit_id = _create_habit(client)
+
+    resp = client.get(f"/habits/{habit_id}/logs", params={"bucket": "year"})
+    assert resp.status_code == 422
+
+
+def test_calendar_of_numeric_habit(client: TestClient) -> None:
+    habit_id = _create_habit(client)
+    logs = [("2024-01-01", 5), ("2024-01-01", 2.5), ("2024-12-31", 3)]
+    client.post(
+        f"/habits/{habit_id}/logs:bulk",
+        json={"logs": [{"date": d, "value": v} for d, v in logs]},
+    )
+
+    resp = client.get(f"/habits/{habit_id}/calendar", params={"year": 2024})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert (body["type"], body["days"], "bitmap" in body) == ("numeric", 366, False)
+    assert body["values"][0] == 7.5
+    assert body["values"][-1] == 3
+    assert sum(body["values"]) == 10.5
+
+
+def test_calendar_of_boolean_habit_is_a_bitmap(client: TestClient) -> None:
+    resp = client.post(
+        "/habits",
+        json={
+            "name": "Stretch",
+            "description": "",
+            "category": "Health",
+            "type": "boolean",
+        },
+    )
+    habit_id = resp.json()["id"]
+    for day, value in (("2025-01-01", 1), ("2025-01-10", 1), ("2025-01-11", 0)):
+        client.post(f"/habits/{habit_id}/logs", json={"date": day, "value": value})
+
+    resp = client.get(f"/habits/{habit_id}/calendar", params={"year": 2025})
+
+    assert len(resp.content) < 200
+    bitmap = base64.b64decode(resp.json()["bitmap"])
+    assert len(bitmap) == 46  # 365 days
+    done = [day for day in range(365) if bitmap[day // 8] >> (day % 8) & 1]
+    assert done == [0, 9]
+
+    # a new log changes the habit's version: not answered from the cache
+    client.post(f"/habits/{habit_id}/logs", json={"date": "2025-01-11", "value": 1})
+    resp = client.get(f"/habits/{habit_id}/calendar", params={"year": 2025})
+    assert base64.b64decode(resp.json()["bitmap"])[1] == 0b110
+
+
+def test_calendar_for_missing_habit_returns_404(client: TestClient) -> None:
+    resp = client.get(f"/habits/{uuid4()}/calendar", params={"year": 2025})
+    assert resp.status_code == 404
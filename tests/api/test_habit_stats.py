@@ -105,3 +105,91 @@ def test_stats_for_missing_habit_returns_404(client: TestClient) -> None:
 
     resp = client.get(f"/habits/{random_id}/stats")
     assert resp.status_code == 404
+
+
+def test_batch_stats_for_selected_habits(client: TestClient) -> None:
+    first = _create_habit(client)
+    second = _create_habit(client)
+    _create_habit(client)  # not requested
+
+    _add_log(client, first, date(2025, 3, 1), 2)
+    _add_log(client, first, date(2025, 3, 2), 4)
+
+    resp = client.get("/habits/stats", params={"ids": [first, second]})
+    assert resp.status_code == 200
+
+    stats = {item["habit_id"]: item for item in resp.json()["stats"]}
+    assert set(stats) == {first, second}
+    assert stats[first]["total"] == 6.0
+    assert stats[first]["average"] == 3.0
+    assert stats[first]["current_streak"] == 2
+    assert stats[second]["total"] == 0.0
+    assert stats[second]["current_streak"] == 0
+
+
+def test_batch_stats_without_ids_returns_all_habits(client: TestClient) -> None:
+    habit_ids = {_create_habit(client) for _ in range(3)}
+
+    resp = client.get("/habits/stats")
+    assert resp.status_code == 200
+
+    assert {item["habit_id"] for item in resp.json()["stats"]} == habit_ids
+
+
+def test_batch_stats_with_missing_habit_returns_404(client: TestClient) -> None:
+    habit_id = _create_habit(client)
+
+    resp = client.get("/habits/stats", params={"ids": [habit_id, str(uuid4())]})
+    assert resp.status_code == 404
+
+
+def test_subtree_stats_combine_sub_habits(client: TestClient) -> None:
+    parent = _create_habit(client)
+    body = {"name": "Sub", "description": "", "category": "Test", "type": "numeric"}
+    first, second = (
+        client.post(f"/habits/{parent}/subhabits", json=body).json()["id"]
+        for _ in range(2)
+    )
+
+    # both on Mar 1-2, only the first on Mar 3-4, nothing on Mar 5, both on Mar 6
+    for day in (1, 2, 3, 4, 6):
+        _add_log(client, first, date(2025, 3, day), 1)
+    for day in (1, 2, 6):
+        _add_log(client, second, date(2025, 3, day), 3)
+    _add_log(client, second, date(2025, 3, 6), 3)
+
+    resp = client.get(f"/habits/{parent}/stats", params={"scope": "subtree"})
+    assert resp.status_code == 200
+
+    data = resp.json()
+    assert data["habit_id"] == parent
+    assert data["total"] == 17.0
+    assert data["average"] == 17.0 / 9
+    assert (data["any_streak"], data["all_streak"]) == (1, 1)
+    habits = {item["habit_id"]: item for item in data["habits"]}
+    assert set(habits) == {parent, first, second}
+    assert habits[second]["total"] == 12.0
+
+
+def test_subtree_all_streak_counts_days_every_sub_habit_logged(
+    client: TestClient,
+) -> None:
+    parent = _create_habit(client)
+    body = {"name": "Sub", "description": "", "category": "Test", "type": "numeric"}
+    first, second = (
+        client.post(f"/habits/{parent}/subhabits", json=body).json()["id"]
+        for _ in range(2)
+    )
+    for day in (1, 2, 3, 4):
+        _add_log(client, first, date(2025, 3, day), 1)
+    for day in (1, 2):
+        _add_log(client, second, date(2025, 3, day), 1)
+
+    data = client.get(f"/habits/{parent}/stats?scope=subtree").json()
+
+    assert (data["any_streak"], data["all_streak"]) == (4, 2)
+
+
+def test_subtree_stats_for_missing_habit_returns_404(client: TestClient) -> None:
+    resp = client.get(f"/habits/{uuid4()}/stats", params={"scope": "subtree"})
+    assert resp.status_code == 404
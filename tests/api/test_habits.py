@@ -52,3 +52,158 @@ def test_get_habit_not_found(client: TestClient) -> None:
     body = resp.json()
     # from our route: HTTPException(status_code=404, detail="Habit not found")
     assert body["detail"] == "Habit not found"
+
+
+def test_list_habits_is_paginated_with_cursor(client: TestClient) -> None:
+    created = []
+    for i in range(5):
+        body = _sample_habit_json() | {"name": f"Habit {i}"}
+        created.append(client.post("/habits", json=body).json()["id"])
+
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        params: dict[str, Any] = {"limit": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+        resp = client.get("/habits", params=params)
+        assert resp.status_code == 200
+
+        body = resp.json()
+        assert len(body["habits"]) <= 2
+        seen += [h["id"] for h in body["habits"]]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == created  # same day, so ordered by name
+
+
+def test_list_habits_with_invalid_cursor_returns_400(client: TestClient) -> None:
+    resp = client.get("/habits", params={"cursor": "not-a-cursor"})
+
+    assert resp.status_code == 400
+
+
+def test_deleting_parent_removes_cached_subhabits(client: TestClient) -> None:
+    parent_id = client.post("/habits", json=_sample_habit_json()).json()["id"]
+    resp = client.post(f"/habits/{parent_id}/subhabits", json=_sample_habit_json())
+    child_id = resp.json()["id"]
+
+    # warm the cache, then read again from memory
+    assert client.get(f"/habits/{child_id}").status_code == 200
+    assert client.get(f"/habits/{child_id}").status_code == 200
+    assert client.get("/metrics").json()["habit_cache"]["hits"] >= 1
+
+    client.delete(f"/habits/{parent_id}")
+
+    assert client.get(f"/habits/{child_id}").status_code == 404
+
+
+def _create_subhabit(client: TestClient, parent_id: str, name: str) -> str:
+    body = {**_sample_habit_json(), "name": name}
+    resp = client.post(f"/habits/{parent_id}/subhabits", json=body)
+    assert resp.status_code == 200
+    return str(resp.json()["id"])
+
+
+def _names(tree: dict[str, Any]) -> list[Any]:
+    return [tree["name"], [_names(child) for child in tree["children"]]]
+
+
+def test_habit_tree_with_depth_limit(client: TestClient) -> None:
+    root = client.post("/habits", json={**_sample_habit_json(), "name": "r"})
+    root_id = root.json()["id"]
+    a = _create_subhabit(client, root_id, "a")
+    _create_subhabit(client, root_id, "b")
+    _create_subhabit(client, a, "a1")
+
+    resp = client.get(f"/habits/{root_id}/tree")
+    assert resp.status_code == 200
+    assert _names(resp.json()) == ["r", [["a", [["a1", []]]], ["b", []]]]
+
+    resp = client.get(f"/habits/{root_id}/tree", params={"max_depth": 1})
+    assert _names(resp.json()) == ["r", [["a", []], ["b", []]]]
+
+    client.delete(f"/habits/{a}")
+    resp = client.get(f"/habits/{root_id}/tree")
+    assert _names(resp.json()) == ["r", [["b", []]]]
+
+    assert client.get(f"/habits/{uuid4()}/tree").status_code == 404
+
+
+def test_reparenting_moves_the_subtree_and_rejects_cycles(client: TestClient) -> None:
+    root = client.post("/habits", json={**_sample_habit_json(), "name": "r"})
+    root_id = root.json()["id"]
+    a = _create_subhabit(client, root_id, "a")
+    b = _create_subhabit(client, root_id, "b")
+    a1 = _create_subhabit(client, a, "a1")
+
+    resp = client.put(f"/habits/{a}", json={"parent_id": b})
+    assert resp.status_code == 200
+    tree = client.get(f"/habits/{root_id}/tree").json()
+    assert _names(tree) == ["r", [["b", [["a", [["a1", []]]]]]]]
+
+    resp = client.put(f"/habits/{root_id}", json={"parent_id": a1})
+    assert resp.status_code == 400
+    resp = client.put(f"/habits/{a}", json={"parent_id": a})
+    assert resp.status_code == 400
+    resp = client.put(f"/habits/{a}", json={"parent_id": str(uuid4())})
+    assert resp.status_code == 404
+
+
+def test_list_habits_with_filters(client: TestClient) -> None:
+    root = client.post("/habits", json={**_sample_habit_json(), "name": "r"})
+    root_id = root.json()["id"]
+    _create_subhabit(client, root_id, "a")
+    client.post(
+        "/habits",
+        json={
+            **_sample_habit_json(),
+            "name": "pages",
+            "category": "Learning",
+            "type": "numeric",
+            "goal": None,
+        },
+    )
+
+    def listed(**params: Any) -> list[str]:
+        resp = client.get("/habits", params=params)
+        assert resp.status_code == 200
+        return sorted(habit["name"] for habit in resp.json()["habits"])
+
+    assert listed(category="Learning") == ["pages"]
+    assert listed(type="boolean") == ["a", "r"]
+    assert listed(parent_id=root_id) == ["a"]
+    assert listed(has_goal=False) == ["pages"]
+    assert listed(category="Health", has_goal=True) == ["a", "r"]
+    assert listed(category="Sleep") == []
+
+
+def test_search_habits(client: TestClient) -> None:
+    water = client.post("/habits", json=_sample_habit_json()).json()["id"]
+    client.post(
+        "/habits",
+        json={**_sample_habit_json(), "name": "Read book", "description": "Pages"},
+    )
+
+    def found(q: str) -> list[str]:
+        resp = client.get("/habits/search", params={"q": q})
+        assert resp.status_code == 200
+        return [habit["name"] for habit in resp.json()["habits"]]
+
+    assert found("water") == ["Drink water"]
+    # the last word matches as a prefix, FTS5 syntax is taken literally
+    assert found("read bo") == ["Read book"]
+    assert found('glasses" OR "pages') == []
+    assert found("-") == []
+
+    # renames and deletes are reflected in the index
+    client.put(f"/habits/{water}", json={"name": "Drink tea"})
+    assert found("water") == ["Drink tea"]
+    assert found("tea") == ["Drink tea"]
+    client.delete(f"/habits/{water}")
+    assert found("tea") == []
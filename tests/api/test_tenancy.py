@@ -0,0 +1,104 @@
+# tests/api/test_tenancy.py
+
+import asyncio
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app import create_app
+from src.infra.async_database import close_async_db
+from src.infra.config import get_settings
+from src.infra.database import close_db, shard_stats
+
+HEADER = "X-Tenant-ID"
+
+
+@pytest.fixture(autouse=True)
+def sharded(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Generator[Path]:
+    monkeypatch.setenv("HABIT_TENANT_HEADER", HEADER)
+    monkeypatch.setenv("HABIT_SHARD_DIR", str(tmp_path))
+    monkeypatch.setenv("HABIT_SHARD_CACHE_SIZE", "2")
+    get_settings.cache_clear()
+    yield tmp_path
+    # shard pools point into tmp_path
+    close_db()
+    asyncio.run(close_async_db())
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+def _habit_json(**overrides: Any) -> dict[str, Any]:
+    return {
+        "name": "Drink water",
+        "description": "Drink 8 glasses of water",
+        "category": "Health",
+        "type": "boolean",
+        "goal": 1,
+        "parent_id": None,
+        **overrides,
+    }
+
+
+def _names(client: TestClient, tenant: str | None) -> list[str]:
+    headers = {HEADER: tenant} if tenant else {}
+    resp = client.get("/habits", headers=headers)
+    assert resp.status_code == 200
+    return [habit["name"] for habit in resp.json()["habits"]]
+
+
+@pytest.mark.parametrize("backend", ["sync", "async"])
+def test_tenants_are_served_from_their_own_shard(backend: str, tmp_path: Path) -> None:
+    with TestClient(create_app(backend)) as client:
+        for tenant in ("acme", "globex"):
+            resp = client.post(
+                "/habits", json=_habit_json(name=tenant), headers={HEADER: tenant}
+            )
+            assert resp.status_code == 200
+        habit_id = resp.json()["id"]
+
+        assert _names(client, "acme") == ["acme"]
+        assert _names(client, "globex") == ["globex"]
+        # no header: the default database
+        assert _names(client, None) == []
+        # a habit of another tenant does not exist for this one
+        resp = client.get(f"/habits/{habit_id}", headers={HEADER: "acme"})
+        assert resp.status_code == 404
+
+    assert {path.name for path in tmp_path.glob("*.db")} == {"acme.db", "globex.db"}
+
+
+def test_least_recently_used_shards_are_closed(client: TestClient) -> None:
+    for tenant in ("a", "b", "c"):
+        client.post("/habits", json=_habit_json(name=tenant), headers={HEADER: tenant})
+
+    assert shard_stats().open == 2
+    assert shard_stats().evictions == 1
+    # an evicted shard is opened again, with its data
+    assert _names(client, "a") == ["a"]
+
+
+def test_invalid_tenant_id_is_rejected(client: TestClient) -> None:
+    resp = client.get("/habits", headers={HEADER: "../pos"})
+
+    assert resp.status_code == 400
+    assert resp.json() == {"detail": "Invalid tenant id"}
+
+
+@pytest.mark.parametrize("url", ["/habits", "/habits/search?q=read", "/metrics"])
+def test_reads_of_an_unknown_tenant_create_no_shard(
+    client: TestClient, tmp_path: Path, url: str
+) -> None:
+    resp = client.get(url, headers={HEADER: "nobody"})
+
+    assert resp.status_code == 404
+    assert resp.json() == {"detail": "Unknown tenant"}
+    assert list(tmp_path.glob("*.db")) == []
+    assert shard_stats().open == 0
+
+    # the first write creates the shard
+    resp = client.post("/habits", json=_habit_json(), headers={HEADER: "nobody"})
+    assert resp.status_code == 200
+    assert client.get(url, headers={HEADER: "nobody"}).status_code == 200
@@ -1,6 +1,6 @@
 # tests/conftest.py
 
-import os
+import asyncio
 from collections.abc import Generator
 from pathlib import Path
 
@@ -8,7 +8,29 @@ import pytest
 from fastapi.testclient import TestClient
 
 from src.app import app
-from src.infra.database import DB_PATH, init_db
+from src.infra.async_database import close_async_db
+from src.infra.database import DB_PATH, close_db, init_db
+from src.infra.group_commit import close_group_commit_writer
+from src.infra.repositories.cached_habit_repository import get_habit_cache
+
+
+def _remove_db_files() -> None:
+    # pooled connections (and the group-commit writer's own) would keep
+    # the old file open
+    close_group_commit_writer()
+    close_db()
+    asyncio.run(close_async_db())
+
+    # cached habits would outlive the deleted database
+    cache = get_habit_cache()
+    if cache is not None:
+        cache.invalidate()
+
+    # WAL mode keeps "-wal" / "-shm" side files next to the DB
+    db_path = Path(DB_PATH)
+    for path in (db_path, Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+        if path.exists():
+            path.unlink()
 
 
 @pytest.fixture(autouse=True)
@@ -23,13 +45,7 @@ def reset_db() -> Generator[None]:
     This keeps tests isolated from each other.
     """
     # make sure old DB is gone
-    if isinstance(DB_PATH, Path):
-        if DB_PATH.exists():
-            DB_PATH.unlink()
-    else:
-        # fallback, if DB_PATH happened to be a string
-        if os.path.exists(DB_PATH):
-            os.remove(DB_PATH)
+    _remove_db_files()
 
     # create tables
     init_db()
@@ -37,12 +53,7 @@ def reset_db() -> Generator[None]:
     yield
 
     # cleanup after test
-    if isinstance(DB_PATH, Path):
-        if DB_PATH.exists():
-            DB_PATH.unlink()
-    else:
-        if os.path.exists(DB_PATH):
-            os.remove(DB_PATH)
+    _remove_db_files()
 
 
 @pytest.fixture
@@ -0,0 +1,27 @@
+# tests/infra/test_calendar_cache.py
+
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from src.core.entities.change_version import ChangeVersion
+from src.core.entities.habit import HabitType
+from src.core.entities.habit_calendar import HabitCalendar
+from src.infra.calendar_cache import CalendarCache
+
+
+def test_entry_is_only_served_for_the_version_it_was_built_from() -> None:
+    cache = CalendarCache()
+    calendar = HabitCalendar(uuid4(), HabitType.BOOLEAN, 2025, [0.0] * 365)
+    built = ChangeVersion(version=3, modified_at=datetime(2025, 1, 1, tzinfo=UTC))
+    cache.put(calendar, built)
+
+    assert cache.get(calendar.habit_id, 2025, built) == calendar
+    assert cache.get(calendar.habit_id, 2024, built) is None
+    newer = ChangeVersion(version=4, modified_at=built.modified_at)
+    assert cache.get(calendar.habit_id, 2025, newer) is None
+    # a recreated database counts from 1 again: same number, other time
+    recreated = ChangeVersion(version=3, modified_at=datetime(2025, 2, 1, tzinfo=UTC))
+    assert cache.get(calendar.habit_id, 2025, recreated) is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 3)
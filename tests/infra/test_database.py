@@ -0,0 +1,45 @@
+# tests/infra/test_database.py
+
+import sqlite3
+
+import pytest
+
+from src.infra.database import get_db
+from src.infra.pragmas import get_pragma_profile
+
+
+def test_connections_use_balanced_profile_by_default() -> None:
+    with get_db() as db:
+        journal_mode = db.execute("PRAGMA journal_mode;").fetchone()[0]
+        synchronous = db.execute("PRAGMA synchronous;").fetchone()[0]
+        busy_timeout = db.execute("PRAGMA busy_timeout;").fetchone()[0]
+
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert busy_timeout == 5_000
+
+
+def test_reader_is_not_blocked_by_open_write_transaction() -> None:
+    with get_db() as writer, get_db() as reader:
+        writer.execute(
+            "INSERT INTO habits VALUES ('h1', 'n', 'd', 'c', 'boolean', NULL, "
+            "'2025-01-01', NULL)"
+        )
+        assert writer.in_transaction
+
+        # uncommitted insert is invisible, but the read does not block
+        count = reader.execute("SELECT COUNT(*) FROM habits").fetchone()[0]
+        assert count == 0
+
+
+def test_unknown_profile_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown database profile"):
+        get_pragma_profile("turbo")
+
+
+def test_read_only_connections_refuse_writes() -> None:
+    with get_db(read_only=True) as db, pytest.raises(sqlite3.OperationalError):
+        db.execute(
+            "INSERT INTO habits VALUES ('h1', 'n', 'd', 'c', 'boolean', NULL, "
+            "'2025-01-01', NULL)"
+        )
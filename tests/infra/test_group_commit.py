@@ -0,0 +1,77 @@
+# tests/infra/test_group_commit.py
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.core.entities.habit import Habit, HabitType
+from src.core.entities.habit_log import HabitLog
+from src.infra.group_commit import GroupCommitWriter
+from src.infra.repositories.group_commit_log_repository import (
+    GroupCommitHabitLogRepository,
+)
+from src.infra.repositories.habit_repository import SQLiteHabitRepository
+from src.infra.repositories.habit_stats_repository import (
+    MaterializedHabitStatsRepository,
+    SQLiteHabitStatsRepository,
+)
+
+
+def _habit() -> Habit:
+    habit = Habit(
+        id=uuid4(),
+        name="Water",
+        description="",
+        category="Health",
+        type=HabitType.BOOLEAN,
+        goal=None,
+        created_at=date(2025, 1, 1),
+        parent_id=None,
+    )
+    SQLiteHabitRepository().create(habit)
+    return habit
+
+
+def test_concurrent_inserts_are_committed_in_batches() -> None:
+    habit = _habit()
+    writer = GroupCommitWriter(max_size=100, max_delay=0.05)
+    logs = GroupCommitHabitLogRepository(writer)
+    start = date(2025, 1, 1)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(
+            pool.map(
+                lambda day: logs.create(
+                    HabitLog(uuid4(), habit.id, start + timedelta(days=day), 1.0)
+                ),
+                range(40),
+            )
+        )
+    writer.close()
+
+    stats = writer.stats()
+    assert (stats.writes, stats.logs, stats.failed) == (40, 40, 0)
+    assert stats.batches < 40
+    assert len(logs.list_for_habit(habit.id)) == 40
+    computed = SQLiteHabitStatsRepository().get_stats(habit.id)
+    assert computed.current_streak == 40
+    assert MaterializedHabitStatsRepository().get_stats(habit.id) == computed
+
+
+def test_failing_insert_does_not_fail_its_batch() -> None:
+    habit = _habit()
+    writer = GroupCommitWriter(max_size=100, max_delay=0.05)
+
+    good = writer.submit([HabitLog(uuid4(), habit.id, date(2025, 1, 1), 1.0)])
+    # no such habit: the foreign key rejects it
+    bad = writer.submit([HabitLog(uuid4(), uuid4(), date(2025, 1, 1), 1.0)])
+    writer.close()
+
+    assert good.result() is None
+    with pytest.raises(sqlite3.IntegrityError):
+        bad.result()
+    assert writer.stats().batches == 1
+    assert len(GroupCommitHabitLogRepository(writer).list_for_habit(habit.id)) == 1
@@ -0,0 +1,178 @@
+# tests/infra/test_habit_cache.py
+
+from dataclasses import replace
+from datetime import date
+from uuid import UUID, uuid4
+
+from src.core.entities.habit import Habit, HabitType
+from src.core.entities.habit_filter import HabitFilter
+from src.core.interface.repositories import HabitPageKey, HabitRepository
+from src.infra.repositories.cached_habit_repository import (
+    CachedHabitRepository,
+    HabitCache,
+)
+
+
+class _DictHabitRepository(HabitRepository):
+    """In-memory repository that counts reads."""
+
+    def __init__(self) -> None:
+        self.habits: dict[UUID, Habit] = {}
+        self.reads = 0
+
+    def create(self, habit: Habit) -> None:
+        self.habits[habit.id] = habit
+
+    def get_by_id(self, habit_id: UUID) -> Habit | None:
+        self.reads += 1
+        return self.habits.get(habit_id)
+
+    def get_all(self) -> list[Habit]:
+        self.reads += 1
+        return list(self.habits.values())
+
+    def get_page(
+        self,
+        limit: int,
+        after: HabitPageKey | None = None,
+        filters: HabitFilter | None = None,
+    ) -> list[Habit]:
+        raise NotImplementedError
+
+    def search(self, text: str, limit: int) -> list[Habit]:
+        raise NotImplementedError
+
+    def get_subtree(self, habit_id: UUID, max_depth: int | None = None) -> list[Habit]:
+        raise NotImplementedError
+
+    def is_descendant(self, habit_id: UUID, ancestor_id: UUID) -> bool:
+        raise NotImplementedError
+
+    def update(self, habit: Habit) -> None:
+        self.habits[habit.id] = habit
+
+    def delete(self, habit_id: UUID) -> None:
+        del self.habits[habit_id]
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _habit(name: str = "Read") -> Habit:
+    return Habit(
+        id=uuid4(),
+        name=name,
+        description="",
+        category="Learning",
+        type=HabitType.BOOLEAN,
+        goal=None,
+        created_at=date(2024, 1, 1),
+        parent_id=None,
+    )
+
+
+def test_get_by_id_is_served_from_cache_until_update() -> None:
+    inner = _DictHabitRepository()
+    cache = HabitCache()
+    repository = CachedHabitRepository(inner, cache)
+    habit = _habit()
+    repository.create(habit)
+
+    repository.get_by_id(habit.id)
+    cached = repository.get_by_id(habit.id)
+    assert inner.reads == 1
+
+    # callers get copies, mutating them does not touch the cache
+    assert cached is not None
+    cached.name = "Changed"
+    assert repository.get_by_id(habit.id) == habit
+
+    repository.update(cached)
+    assert repository.get_by_id(habit.id) == cached
+    assert inner.reads == 2
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.invalidations) == (2, 2, 2)
+
+
+def test_entries_expire_and_lru_evicts() -> None:
+    inner = _DictHabitRepository()
+    clock = _Clock()
+    cache = HabitCache(max_size=2, ttl=10.0, clock=clock)
+    repository = CachedHabitRepository(inner, cache)
+    first, second, third = _habit("a"), _habit("b"), _habit("c")
+    for habit in (first, second, third):
+        repository.create(habit)
+
+    repository.get_by_id(first.id)
+    repository.get_by_id(second.id)
+    repository.get_by_id(first.id)  # first is now the most recently used
+    repository.get_by_id(third.id)  # evicts second
+    assert cache.stats().evictions == 1
+
+    reads = inner.reads
+    repository.get_by_id(first.id)
+    assert inner.reads == reads
+
+    clock.now = 10.0
+    repository.get_by_id(first.id)
+    assert inner.reads == reads + 1
+    assert cache.stats().expirations == 1
+
+
+def test_get_all_snapshot_is_invalidated_by_writes() -> None:
+    inner = _DictHabitRepository()
+    repository = CachedHabitRepository(inner, HabitCache())
+    repository.create(_habit())
+
+    assert len(repository.get_all()) == 1
+    assert len(repository.get_all()) == 1
+    assert inner.reads == 1
+
+    repository.create(_habit())
+    assert len(repository.get_all()) == 2
+    assert inner.reads == 2
+
+
+def test_read_racing_a_write_is_not_cached() -> None:
+    habit = _habit()
+
+    class _RacingRepository(_DictHabitRepository):
+        def get_by_id(self, habit_id: UUID) -> Habit | None:
+            stale = super().get_by_id(habit_id)
+            # another request commits an update while this read is in flight
+            CachedHabitRepository(_DictHabitRepository(), cache).update(renamed)
+            return stale
+
+    cache = HabitCache()
+    renamed = replace(habit, name="Renamed")
+    inner = _RacingRepository()
+    inner.create(habit)
+
+    assert CachedHabitRepository(inner, cache).get_by_id(habit.id) == habit
+    assert cache.stats().size == 0
+
+
+def test_unit_of_work_does_not_cache_rows_from_an_older_snapshot() -> None:
+    inner = _DictHabitRepository()
+    habit = _habit()
+    inner.create(habit)
+    cache = HabitCache()
+
+    # transaction starts, then another request updates the habit
+    in_transaction = CachedHabitRepository(inner, cache, deferred=True)
+    CachedHabitRepository(inner, cache).update(replace(habit, name="Renamed"))
+
+    in_transaction.get_by_id(habit.id)
+    assert cache.stats().size == 0
+
+    # writes inside the transaction are invalidated again after it ends
+    in_transaction.update(habit)
+    version = cache.version
+    in_transaction.flush()
+    assert cache.version == version + 1
@@ -0,0 +1,122 @@
+# tests/infra/test_habit_stats_query.py
+
+import math
+from datetime import date, timedelta
+from uuid import UUID, uuid4
+
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+
+from src.core.entities.habit import Habit, HabitType
+from src.core.entities.habit_log import HabitLog
+from src.core.entities.habit_stats import HabitStats
+from src.infra.repositories.habit_analytics_repository import (
+    SQLiteHabitAnalyticsRepository,
+)
+from src.infra.repositories.habit_log_repository import SQLiteHabitLogRepository
+from src.infra.repositories.habit_repository import SQLiteHabitRepository
+from src.infra.repositories.habit_stats_repository import (
+    MaterializedHabitStatsRepository,
+    SQLiteHabitStatsRepository,
+)
+
+BASE_DATE = date(2025, 1, 1)
+
+
+def _reference_stats(habit_id: UUID, logs: list[tuple[date, float]]) -> HabitStats:
+    """The original per-row Python implementation of get_stats."""
+    if not logs:
+        return HabitStats(habit_id=habit_id, total=0.0, current_streak=0, average=0.0)
+
+    dates = sorted(d for d, _ in logs)
+    values = [v for _, v in sorted(logs, key=lambda log: log[0])]
+    total = sum(values)
+
+    streak = 1
+    expected = dates[-1] - timedelta(days=1)
+    for idx in range(len(dates) - 2, -1, -1):
+        if dates[idx] != expected:
+            break
+        streak += 1
+        expected -= timedelta(days=1)
+
+    return HabitStats(
+        habit_id=habit_id,
+        total=total,
+        current_streak=streak,
+        average=total / len(values),
+    )
+
+
+def _assert_same_stats(actual: HabitStats, expected: HabitStats) -> None:
+    assert actual.habit_id == expected.habit_id
+    assert actual.current_streak == expected.current_streak
+    assert math.isclose(actual.total, expected.total, rel_tol=1e-9, abs_tol=1e-9)
+    assert math.isclose(actual.average, expected.average, rel_tol=1e-9, abs_tol=1e-9)
+
+
+# small day range so duplicates, gaps and long runs are all common
+LOGS = st.lists(
+    st.tuples(
+        st.integers(min_value=0, max_value=20).map(lambda n: BASE_DATE + timedelta(n)),
+        st.floats(min_value=0, max_value=1_000, allow_nan=False),
+    ),
+    max_size=30,
+)
+
+
+def _habit_with_logs(logs: list[tuple[date, float]]) -> Habit:
+    habit = Habit(
+        id=uuid4(),
+        name="Read",
+        description="Read pages",
+        category="Learning",
+        type=HabitType.NUMERIC,
+        goal=None,
+        created_at=BASE_DATE,
+        parent_id=None,
+    )
+    SQLiteHabitRepository().create(habit)
+    log_repository = SQLiteHabitLogRepository()
+    for log_date, value in logs:
+        log_repository.create(
+            HabitLog(id=uuid4(), habit_id=habit.id, date=log_date, value=value)
+        )
+    return habit
+
+
+@settings(
+    max_examples=150,
+    deadline=None,
+    suppress_health_check=[HealthCheck.function_scoped_fixture],
+)
+@given(logs=LOGS)
+def test_sql_and_materialized_stats_match_python_reference(
+    logs: list[tuple[date, float]],
+) -> None:
+    habit = _habit_with_logs(logs)
+
+    expected = _reference_stats(habit.id, logs)
+
+    _assert_same_stats(SQLiteHabitStatsRepository().get_stats(habit.id), expected)
+    _assert_same_stats(MaterializedHabitStatsRepository().get_stats(habit.id), expected)
+
+
+@settings(
+    max_examples=150,
+    deadline=None,
+    suppress_health_check=[HealthCheck.function_scoped_fixture],
+)
+@given(logs=LOGS)
+def test_analytics_current_streak_matches_stats(
+    logs: list[tuple[date, float]],
+) -> None:
+    habit = _habit_with_logs(logs)
+    # every log is on or before the last day of the range
+    as_of = BASE_DATE + timedelta(days=20)
+
+    analytics = SQLiteHabitAnalyticsRepository().get_analytics(habit, as_of)
+
+    stats = SQLiteHabitStatsRepository().get_stats(habit.id)
+    assert analytics.current_streak == stats.current_streak
+    assert analytics.longest_streak >= analytics.current_streak
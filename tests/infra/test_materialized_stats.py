@@ -0,0 +1,117 @@
+# tests/infra/test_materialized_stats.py
+
+from datetime import date
+from uuid import uuid4
+
+import pytest
+
+from src.core.entities.habit import Habit, HabitType
+from src.core.entities.habit_log import HabitLog
+from src.infra.database import get_db
+from src.infra.materialized_stats import rebuild_stats
+from src.infra.repositories.habit_log_repository import SQLiteHabitLogRepository
+from src.infra.repositories.habit_repository import SQLiteHabitRepository
+from src.infra.repositories.habit_stats_repository import (
+    MaterializedHabitStatsRepository,
+    SQLiteHabitStatsRepository,
+)
+
+
+def _create_habit() -> Habit:
+    habit = Habit(
+        id=uuid4(),
+        name="Run",
+        description="Run 5k",
+        category="Health",
+        type=HabitType.NUMERIC,
+        goal=None,
+        created_at=date(2025, 1, 1),
+        parent_id=None,
+    )
+    SQLiteHabitRepository().create(habit)
+    return habit
+
+
+@pytest.mark.parametrize(
+    "days",
+    [
+        [1, 2, 3],  # in order
+        [3, 1, 2],  # backfill closes the gap
+        [5, 6, 7, 3, 4],  # backfill right before the streak, joins older days
+        [1, 3, 4, 3],  # second log inside the streak cuts it
+        [1, 2, 2, 3],  # duplicate day in the middle
+        [2, 3, 2, 1],  # backfill before a duplicated first day
+        [10, 1, 2],  # old backfill does not reach the streak
+    ],
+)
+def test_materialized_stats_match_computed_stats(days: list[int]) -> None:
+    habit = _create_habit()
+    logs = SQLiteHabitLogRepository()
+    for value, day in enumerate(days, start=1):
+        logs.create(
+            HabitLog(
+                id=uuid4(),
+                habit_id=habit.id,
+                date=date(2025, 3, day),
+                value=float(value),
+            )
+        )
+
+    materialized = MaterializedHabitStatsRepository().get_stats(habit.id)
+    computed = SQLiteHabitStatsRepository().get_stats(habit.id)
+
+    assert materialized == computed
+
+
+def test_rebuild_restores_stats() -> None:
+    habit = _create_habit()
+    logs = SQLiteHabitLogRepository()
+    for day in (1, 2, 4, 5):
+        logs.create(
+            HabitLog(id=uuid4(), habit_id=habit.id, date=date(2025, 3, day), value=2)
+        )
+    expected = MaterializedHabitStatsRepository().get_stats(habit.id)
+
+    with get_db() as db:
+        db.execute("DELETE FROM habit_stats")
+        db.commit()
+        assert rebuild_stats(db) == 1
+        db.commit()
+
+    assert MaterializedHabitStatsRepository().get_stats(habit.id) == expected
+
+
+def test_stats_many_matches_between_backends() -> None:
+    habits = [_create_habit() for _ in range(3)]
+    logs = SQLiteHabitLogRepository()
+    for offset, habit in enumerate(habits):
+        for day in range(1, offset + 3):
+            logs.create(
+                HabitLog(
+                    id=uuid4(), habit_id=habit.id, date=date(2025, 4, day), value=day
+                )
+            )
+    ids = [h.id for h in habits]
+
+    materialized = MaterializedHabitStatsRepository().get_stats_many(ids)
+    computed = SQLiteHabitStatsRepository().get_stats_many(ids)
+
+    assert materialized == computed
+    assert [s.current_streak for s in computed] == [2, 3, 4]
+
+
+def test_bulk_insert_keeps_stats_in_sync() -> None:
+    habit = _create_habit()
+    logs = SQLiteHabitLogRepository()
+    logs.create(HabitLog(id=uuid4(), habit_id=habit.id, date=date(2025, 3, 9), value=1))
+
+    logs.create_many(
+        [
+            HabitLog(id=uuid4(), habit_id=habit.id, date=date(2025, 3, day), value=1)
+            for day in (7, 8, 10, 4)
+        ]
+    )
+
+    materialized = MaterializedHabitStatsRepository().get_stats(habit.id)
+    assert materialized == SQLiteHabitStatsRepository().get_stats(habit.id)
+    assert materialized.current_streak == 4
@@ -0,0 +1,69 @@
+# tests/infra/test_migrations.py
+
+import sqlite3
+from datetime import date
+from pathlib import Path
+from uuid import uuid4
+
+from src.core.entities.habit import HabitType
+from src.core.entities.habit_filter import HabitFilter
+from src.infra.migrations import MIGRATIONS, current_version, migrate
+from src.infra.repositories.habit_repository import _select_page
+from src.infra.storage_format import TEXT_FORMAT
+
+
+def _index_names(conn: sqlite3.Connection) -> set[str]:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    return {row[0] for row in rows}
+
+
+def test_fresh_database_is_migrated_to_latest_version(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "fresh.db")
+
+    applied = migrate(conn)
+
+    assert applied == [m.version for m in MIGRATIONS]
+    assert current_version(conn) == MIGRATIONS[-1].version
+    assert {"idx_habit_logs_page", "idx_habits_parent_page"} <= _index_names(conn)
+
+
+def test_migrate_is_idempotent(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "again.db")
+    migrate(conn)
+
+    assert migrate(conn) == []
+
+
+def test_legacy_database_keeps_data_and_gains_indexes(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "legacy.db")
+    # what the original init_db created: tables only, no version table
+    MIGRATIONS[0].apply(conn)
+    conn.execute(
+        "INSERT INTO habits VALUES ('h1', 'n', 'd', 'c', 'boolean', NULL, "
+        "'2025-01-01', NULL)"
+    )
+    conn.commit()
+    assert current_version(conn) == 0
+
+    migrate(conn)
+
+    assert conn.execute("SELECT id FROM habits").fetchall() == [("h1",)]
+    assert "idx_habit_logs_page" in _index_names(conn)
+
+
+def test_filtered_habit_pages_use_an_index(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "filters.db")
+    migrate(conn)
+    after = (date(2025, 1, 1), "a", uuid4())
+
+    for filters, index in [
+        (HabitFilter(category="Health"), "idx_habits_category"),
+        (HabitFilter(type=HabitType.NUMERIC), "idx_habits_type"),
+        (HabitFilter(parent_id=uuid4()), "idx_habits_parent_page"),
+        (HabitFilter(has_goal=False), "idx_habits_has_goal"),
+    ]:
+        query, params = _select_page(10, after, TEXT_FORMAT, filters)
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+        assert [row[3].split(" (")[0] for row in plan] == [
+            f"SEARCH habits USING INDEX {index}"
+        ]
@@ -0,0 +1,51 @@
+# tests/infra/test_pool.py
+
+import sqlite3
+
+import pytest
+
+from src.infra.pool import ConnectionPool, PoolTimeoutError
+
+
+def _memory_connection() -> sqlite3.Connection:
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+def test_released_connection_is_reused() -> None:
+    pool = ConnectionPool(_memory_connection, size=2, timeout=0.1)
+
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+
+    assert second is first
+    stats = pool.stats()
+    assert stats.misses == 1
+    assert stats.hits == 1
+    assert stats.open == 1
+
+
+def test_exhausted_pool_times_out() -> None:
+    pool = ConnectionPool(_memory_connection, size=1, timeout=0.01)
+    pool.acquire()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    stats = pool.stats()
+    assert stats.waits == 1
+    assert stats.timeouts == 1
+
+
+def test_release_rolls_back_open_transaction() -> None:
+    pool = ConnectionPool(_memory_connection, size=1, timeout=0.1)
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.execute("INSERT INTO t VALUES (1)")
+    assert conn.in_transaction
+
+    pool.release(conn)
+
+    conn = pool.acquire()
+    assert not conn.in_transaction
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
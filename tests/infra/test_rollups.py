@@ -0,0 +1,63 @@
+# tests/infra/test_rollups.py
+
+from datetime import date, timedelta
+from uuid import UUID, uuid4
+
+from src.core.entities.habit import Habit, HabitType
+from src.core.entities.habit_log import HabitLog
+from src.core.entities.log_rollup import LogRollup, RollupBucket
+from src.infra.database import get_db
+from src.infra.repositories.habit_log_repository import SQLiteHabitLogRepository
+from src.infra.repositories.habit_repository import SQLiteHabitRepository
+from src.infra.rollups import rebuild_rollups
+
+
+def _all_rollups(habit_id: UUID) -> list[LogRollup]:
+    logs = SQLiteHabitLogRepository()
+    return [
+        rollup
+        for bucket in RollupBucket
+        for rollup in logs.list_rollups(habit_id, bucket, limit=1_000)
+    ]
+
+
+def test_bucket_start() -> None:
+    day = date(2024, 2, 29)  # a Thursday
+
+    assert RollupBucket.DAY.start_of(day) == day
+    assert RollupBucket.WEEK.start_of(day) == date(2024, 2, 26)
+    assert RollupBucket.MONTH.start_of(day) == date(2024, 2, 1)
+
+
+def test_incremental_rollups_match_a_rebuild() -> None:
+    habit = Habit(
+        id=uuid4(),
+        name="Run",
+        description="",
+        category="Health",
+        type=HabitType.NUMERIC,
+        goal=None,
+        created_at=date(2024, 1, 1),
+        parent_id=None,
+    )
+    SQLiteHabitRepository().create(habit)
+    logs = SQLiteHabitLogRepository()
+    start = date(2024, 1, 25)
+    logs.create_many(
+        [HabitLog(uuid4(), habit.id, start + timedelta(days=i), i) for i in range(20)]
+    )
+    # single inserts into existing buckets, including a new minimum
+    logs.create(HabitLog(uuid4(), habit.id, start, -3.0))
+    logs.create(HabitLog(uuid4(), habit.id, date(2024, 2, 10), 50.0))
+    incremental = _all_rollups(habit.id)
+
+    with get_db() as db:
+        rebuild_rollups(db)
+        db.commit()
+
+    assert _all_rollups(habit.id) == incremental
+    months = [r for r in incremental if r.bucket is RollupBucket.MONTH]
+    assert [(r.start, r.log_count, r.min_value) for r in months] == [
+        (date(2024, 1, 1), 8, -3.0),
+        (date(2024, 2, 1), 14, 7.0),
+    ]
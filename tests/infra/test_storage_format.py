@@ -0,0 +1,137 @@
+# tests/infra/test_storage_format.py
+
+import sqlite3
+from datetime import date
+from uuid import UUID, uuid4
+
+from src.core.entities.habit import Habit, HabitType
+from src.core.entities.habit_log import HabitLog
+from src.core.entities.log_rollup import RollupBucket
+from src.infra.database import DB_PATH, close_db, storage_format
+from src.infra.repositories.change_repository import SQLiteChangeRepository
+from src.infra.repositories.habit_log_repository import SQLiteHabitLogRepository
+from src.infra.repositories.habit_repository import SQLiteHabitRepository
+from src.infra.repositories.habit_stats_repository import (
+    MaterializedHabitStatsRepository,
+    SQLiteHabitStatsRepository,
+)
+from src.infra.storage_format import (
+    COMPACT_FORMAT,
+    TEXT_FORMAT,
+    StorageFormat,
+    convert_storage,
+)
+
+
+def _convert(target: StorageFormat) -> bool:
+    # pooled connections (and the cached format) must not outlive the change
+    close_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        return convert_storage(conn, target)
+    finally:
+        conn.close()
+
+
+def _column_types(table: str, column: str) -> set[str]:
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        rows = conn.execute(f"SELECT DISTINCT typeof({column}) FROM {table}")
+        return {row[0] for row in rows}
+    finally:
+        conn.close()
+
+
+def _index_names() -> set[str]:
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        return {row[0] for row in rows}
+    finally:
+        conn.close()
+
+
+def _habit(parent_id: UUID | None = None) -> Habit:
+    return Habit(
+        id=uuid4(),
+        name="Run",
+        description="",
+        category="Health",
+        type=HabitType.NUMERIC,
+        goal=None,
+        created_at=date(2025, 1, 1),
+        parent_id=parent_id,
+    )
+
+
+def test_round_trip_keeps_data_indexes_and_stats() -> None:
+    parent = _habit()
+    child = _habit(parent.id)
+    habits, logs = SQLiteHabitRepository(), SQLiteHabitLogRepository()
+    habits.create(parent)
+    habits.create(child)
+    logs.create_many(
+        [HabitLog(uuid4(), parent.id, date(2025, 1, day), 2.0) for day in (1, 2, 3)]
+    )
+    indexes = _index_names()
+
+    assert _convert(COMPACT_FORMAT)
+
+    assert storage_format() == COMPACT_FORMAT
+    assert _column_types("habits", "id") == {"blob"}
+    assert _column_types("habit_logs", "date") == {"integer"}
+    assert _index_names() == indexes
+    assert habits.get_by_id(child.id) == child
+    assert [log.date.day for log in logs.list_for_habit(parent.id)] == [1, 2, 3]
+    # closure rows were converted and its triggers re-created
+    grandchild = _habit(child.id)
+    habits.create(grandchild)
+    assert habits.get_subtree(parent.id) == [parent, child, grandchild]
+    # the full-text index was rebuilt for the new rowids, its triggers re-created
+    assert len(habits.search("run", limit=10)) == 3
+
+    # change counters were converted and their triggers re-created
+    changes = SQLiteChangeRepository()
+    before = changes.get_habit_version(parent.id)
+    logs.create(HabitLog(uuid4(), parent.id, date(2025, 1, 4), 2.0))
+    after = changes.get_habit_version(parent.id)
+    assert before is not None
+    assert after is not None
+    assert after.version == before.version + 1
+    computed = SQLiteHabitStatsRepository().get_stats(parent.id)
+    assert computed.current_streak == 4
+    assert MaterializedHabitStatsRepository().get_stats(parent.id) == computed
+    (month,) = logs.list_rollups(parent.id, RollupBucket.MONTH, limit=10)
+    assert (month.start, month.log_count) == (date(2025, 1, 1), 4)
+
+    assert _convert(TEXT_FORMAT)
+
+    assert storage_format() == TEXT_FORMAT
+    assert _column_types("habits", "id") == {"text"}
+    assert len(habits.get_all()) == 3
+    assert habits.get_subtree(parent.id) == [parent, child, grandchild]
+    assert habits.get_by_id(child.id) == child
+    assert SQLiteHabitStatsRepository().get_stats(parent.id) == computed
+
+
+def test_converting_to_current_format_is_a_no_op() -> None:
+    assert not _convert(TEXT_FORMAT)
+
+    assert storage_format() == TEXT_FORMAT
+
+
+def test_foreign_keys_cascade_after_conversion() -> None:
+    parent = _habit()
+    child = _habit(parent.id)
+    habits = SQLiteHabitRepository()
+    habits.create(parent)
+    habits.create(child)
+    SQLiteHabitLogRepository().create(
+        HabitLog(uuid4(), child.id, date(2025, 1, 1), 1.0)
+    )
+    _convert(COMPACT_FORMAT)
+
+    habits.delete(parent.id)
+
+    assert habits.get_all() == []
+    assert SQLiteHabitLogRepository().list_for_habit(child.id) == []
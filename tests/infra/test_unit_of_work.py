@@ -0,0 +1,58 @@
+# tests/infra/test_unit_of_work.py
+
+from datetime import date
+from uuid import uuid4
+
+import pytest
+
+from src.core.entities.habit import Habit, HabitType
+from src.core.entities.habit_log import HabitLog
+from src.infra.database import pool_stats
+from src.infra.unit_of_work import unit_of_work
+
+
+def _habit() -> Habit:
+    return Habit(
+        id=uuid4(),
+        name="Read",
+        description="",
+        category="Learning",
+        type=HabitType.NUMERIC,
+        goal=None,
+        created_at=date(2024, 1, 1),
+        parent_id=None,
+    )
+
+
+def test_repositories_share_one_connection_and_commit_together() -> None:
+    habit = _habit()
+    acquired = pool_stats().hits + pool_stats().misses
+
+    with unit_of_work(write=True) as uow:
+        uow.habits.create(habit)
+        uow.logs.create(HabitLog(uuid4(), habit.id, date(2024, 1, 2), 3.0))
+        assert uow.stats.get_stats(habit.id).total == 3.0
+
+    stats = pool_stats()
+    assert stats.hits + stats.misses == acquired + 1
+
+    with unit_of_work() as uow:
+        assert uow.habits.get_by_id(habit.id) == habit
+        assert uow.stats.get_stats(habit.id).current_streak == 1
+
+
+def test_exception_rolls_back_every_write() -> None:
+    habit = _habit()
+
+    def write_then_fail() -> None:
+        with unit_of_work(write=True) as uow:
+            uow.habits.create(habit)
+            uow.logs.create(HabitLog(uuid4(), habit.id, date(2024, 1, 2), 3.0))
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        write_then_fail()
+
+    with unit_of_work() as uow:
+        assert uow.habits.get_by_id(habit.id) is None
+        assert uow.logs.list_for_habit(habit.id) == []
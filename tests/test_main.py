@@ -0,0 +1,87 @@
+# tests/test_main.py
+
+from typing import Any
+
+import pytest
+
+from src import main as launcher
+from src.infra.config import get_settings
+
+
+def test_main_initializes_the_database_once_before_the_workers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[Any] = []
+    monkeypatch.setattr(launcher, "init_db", lambda: calls.append("init_db"))
+    monkeypatch.setattr(
+        "uvicorn.run",
+        lambda app, **kwargs: calls.append((app, kwargs["workers"])),
+    )
+    monkeypatch.setenv("HABIT_DB_READY", "0")
+    monkeypatch.delenv("HABIT_CACHE_SIZE", raising=False)
+
+    launcher.main(["--workers", "4", "--http", "h11"])
+
+    assert calls == ["init_db", ("src.app:app", 4)]
+    # the workers skip init_db in their startup hook
+    assert get_settings().db_ready
+    # and keep no habit cache that the other workers' writes would not reach
+    assert get_settings().habit_cache_size == 0
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+def test_single_worker_keeps_the_habit_cache(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    runs: list[tuple[str, int]] = []
+    monkeypatch.setattr(launcher, "init_db", lambda: None)
+    monkeypatch.setattr(
+        "uvicorn.run", lambda app, **kwargs: runs.append((app, kwargs["workers"]))
+    )
+    monkeypatch.setenv("HABIT_DB_READY", "0")
+    monkeypatch.delenv("HABIT_CACHE_SIZE", raising=False)
+
+    launcher.main(["--workers", "1"])
+
+    assert runs == [("src.app:app", 1)]
+    assert get_settings().habit_cache_size > 0
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+def test_several_workers_require_a_wal_profile(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("HABIT_DB_PROFILE", "durable")
+    get_settings.cache_clear()
+    try:
+        with pytest.raises(SystemExit):
+            launcher.main(["--workers", "2"])
+    finally:
+        monkeypatch.undo()
+        get_settings.cache_clear()
+
+
+def test_explicit_habit_cache_with_several_workers_is_rejected(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    runs: list[tuple[str, int]] = []
+    monkeypatch.setattr(launcher, "init_db", lambda: None)
+    monkeypatch.setattr(
+        "uvicorn.run", lambda app, **kwargs: runs.append((app, kwargs["workers"]))
+    )
+    monkeypatch.setenv("HABIT_DB_READY", "0")
+    monkeypatch.setenv("HABIT_CACHE_SIZE", "1000")
+    get_settings.cache_clear()
+    try:
+        with pytest.raises(SystemExit):
+            launcher.main(["--workers", "2"])
+        # an explicit 0 is what the launcher would set anyway
+        monkeypatch.setenv("HABIT_CACHE_SIZE", "0")
+        get_settings.cache_clear()
+        launcher.main(["--workers", "2"])
+        assert runs == [("src.app:app", 2)]
+    finally:
+        monkeypatch.undo()
+        get_settings.cache_clear()